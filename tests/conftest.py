@@ -0,0 +1,58 @@
+"""Shared fixtures: small generated TMX files with known problems."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+WORDS = ("the quick brown fox jumps over lazy dog file open save cancel "
+         "page print error warning").split()
+SHORT = ["OK", "Cancel", "Page 1", "12345", "2023-01-05", "info@example.com",
+         "www.example.com", "v1.2.3", "$ 100", "10 kg", "Microsoft Word", "!!!", "ABC-123"]
+
+
+def write_tmx(path: Path, count: int = 600, seed: int = 1, encoding: str = 'utf-8',
+              target_lang: str = 'nb-NO') -> Path:
+    """
+    Write a TMX with count TUs: exact duplicates, auto-translatable
+    segments, inline tags, empty and missing targets. encoding is a
+    Python codec name; 'utf-16' writes a BOM, 'utf-16-le'/'-be' do not.
+    """
+    rng = random.Random(seed)
+    declared = 'UTF-16' if encoding.startswith('utf-16') else encoding.upper()
+    lines = [f'<?xml version="1.0" encoding="{declared}"?>',
+             '<!DOCTYPE tmx SYSTEM "tmx14.dtd">',
+             '<tmx version="1.4">',
+             '  <header creationtool="tests" srclang="en-US" datatype="plaintext" '
+             'segtype="sentence" adminlang="en-US" o-tmf="x"/>',
+             '  <body>']
+    for _ in range(count):
+        if rng.random() < 0.15:
+            source = rng.choice(SHORT)
+            target = source if rng.random() < 0.5 else source + " nb"
+        else:
+            source = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(1, 12)))
+            target = source.upper() + " X"
+        if rng.random() < 0.03:
+            target = ""
+        date = f"2023{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}T120000Z"
+        seg = source.replace('&', '&amp;')
+        if rng.random() < 0.1:
+            seg = f'<bpt i="1">&lt;b&gt;</bpt>{seg}<ept i="1">&lt;/b&gt;</ept>'
+        lines.append(f'    <tu creationdate="{date}" changedate="{date}">')
+        lines.append(f'      <tuv xml:lang="en-US"><seg>{seg}</seg></tuv>')
+        if rng.random() > 0.01:
+            lines.append(f'      <tuv xml:lang="{target_lang}"><seg>{target}</seg></tuv>')
+        lines.append('    </tu>')
+    lines += ['  </body>', '</tmx>', '']
+    path.write_bytes('\n'.join(lines).encode(encoding))
+    return path
+
+
+@pytest.fixture
+def tmx_file(tmp_path):
+    return write_tmx(tmp_path / 'sample.tmx')
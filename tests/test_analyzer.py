@@ -0,0 +1,78 @@
+"""TMXAnalyzer: the parallel path must report what the sequential one does."""
+
+import pytest
+
+from conftest import write_tmx
+from tmx_analyzer import TMXAnalyzer
+
+
+def analyze(path, **kwargs):
+    return TMXAnalyzer().parse_tmx(str(path), **kwargs)
+
+
+def test_jobs_matches_sequential(tmx_file):
+    expected = analyze(tmx_file)
+    assert expected[4] > 0 and expected[0] and expected[1] and expected[2]
+    assert analyze(tmx_file, jobs=3) == expected
+
+
+@pytest.mark.parametrize('encoding', ['utf-16', 'utf-16-le', 'utf-16-be'])
+def test_jobs_utf16(tmp_path, encoding):
+    """UTF-16 files (with or without a BOM) cannot be split at byte offsets."""
+    expected = analyze(write_tmx(tmp_path / 'utf8.tmx'))
+    path = write_tmx(tmp_path / 'utf16.tmx', encoding=encoding)
+    assert analyze(path) == expected
+    assert analyze(path, jobs=2) == expected
+
+
+def edit_tmx(path):
+    """Drop, change, insert and re-date some TUs of a write_tmx() file."""
+    head, _sep, rest = path.read_text(encoding='utf-8').partition('    <tu ')
+    tus = ['    <tu ' + tu for tu in rest.split('    <tu ')]
+    tail = tus[-1][tus[-1].index('  </body>'):]
+    tus[-1] = tus[-1][:tus[-1].index('  </body>')]
+    del tus[10:20]
+    tus[50] = tus[50].replace('<seg>', '<seg>12345 ', 1)
+    tus[60] = tus[60].replace('<seg>', '<seg>Oslo', 2)
+    tus[70] = tus[70].replace('changedate="2023', 'changedate="2024')
+    tus[3:3] = [tus[100], tus[200]]
+    path.write_text(head + ''.join(tus) + tail, encoding='utf-8')
+
+
+def test_incremental_matches_full(tmx_file, capsys):
+    expected = analyze(tmx_file)
+    assert analyze(tmx_file, incremental=True) == expected
+    assert analyze(tmx_file, incremental=True) == expected
+    assert "Analyzed 0 new or changed TUs; reused 600" in capsys.readouterr().out
+
+    edit_tmx(tmx_file)
+    expected = analyze(tmx_file)
+    assert analyze(tmx_file, incremental=True) == expected
+    # Moved and copied TUs keep their records; the three edited ones do not
+    assert "Analyzed 3 new or changed TUs; reused 589" in capsys.readouterr().out
+    assert analyze(tmx_file, incremental=True) == expected
+
+
+def test_incremental_state_tracks_classifier(tmx_file, capsys):
+    class NoCodes(TMXAnalyzer):
+        AUTO_TRANSLATABLE_CATEGORIES = TMXAnalyzer.AUTO_TRANSLATABLE_CATEGORIES - {'numbers_only'}
+
+    analyze(tmx_file, incremental=True)
+    expected = NoCodes().parse_tmx(str(tmx_file))
+    assert expected != analyze(tmx_file)
+    capsys.readouterr()
+    assert NoCodes().parse_tmx(str(tmx_file), incremental=True) == expected
+    assert "is from another language pair or analyzer version" in capsys.readouterr().out
+
+
+def test_incremental_utf16(tmp_path):
+    expected = analyze(write_tmx(tmp_path / 'utf8.tmx'))
+    path = write_tmx(tmp_path / 'utf16.tmx', encoding='utf-16')
+    assert analyze(path, incremental=True) == expected
+    assert not (tmp_path / 'utf16.tmx.state').exists()
+
+
+@pytest.mark.parametrize('kwargs', [{'jobs': 2}, {'use_index': True}])
+def test_incremental_rejects_other_paths(tmx_file, kwargs):
+    with pytest.raises(ValueError):
+        analyze(tmx_file, incremental=True, **kwargs)
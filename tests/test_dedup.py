@@ -0,0 +1,78 @@
+"""Out-of-core dedup (--mem-limit) must write what the in-memory path writes."""
+
+import pytest
+
+import tmx_dedup
+from conftest import write_tmx
+from tmx_dedup import PartitionedDedupStage, find_duplicates
+from tmx_editor import DedupStage, EmptyStage, TMXEditor, _batch_operation
+
+
+@pytest.fixture
+def big_tmx(tmp_path):
+    return write_tmx(tmp_path / 'big.tmx', count=3000)
+
+
+def in_memory(path, out, operations):
+    editor = TMXEditor()
+    editor.load(str(path))
+    editor.remove_exact_duplicates()
+    if 'empty' in operations:
+        editor.remove_empty_segments()
+    editor.save(str(out))
+    return out.read_bytes()
+
+
+@pytest.mark.parametrize('operations', [['dedup'], ['dedup', 'empty']])
+@pytest.mark.parametrize('split', [False, True])
+def test_mem_limit_matches_in_memory(big_tmx, tmp_path, monkeypatch, operations, split):
+    if split:
+        # One partition of 3000 keys, split again on later digest bytes
+        monkeypatch.setattr(tmx_dedup, 'MIN_TU_BYTES', 1 << 30)
+    expected = in_memory(big_tmx, tmp_path / 'memory.tmx', operations)
+    _batch_operation(str(big_tmx), operations, str(tmp_path / 'streamed.tmx'))
+    _batch_operation(str(big_tmx), operations, str(tmp_path / 'disk.tmx'), mem_limit=1)
+    assert (tmp_path / 'streamed.tmx').read_bytes() == expected
+    assert (tmp_path / 'disk.tmx').read_bytes() == expected
+
+
+def test_remove_exact_duplicates_mem_limit(big_tmx, tmp_path):
+    expected = in_memory(big_tmx, tmp_path / 'memory.tmx', ['dedup'])
+    editor = TMXEditor()
+    editor.load(str(big_tmx))
+    result = editor.remove_exact_duplicates(mem_limit=1)
+    assert result['removed_count'] > 0
+    editor.save(str(tmp_path / 'disk.tmx'))
+    assert (tmp_path / 'disk.tmx').read_bytes() == expected
+
+
+def test_find_duplicates_marks_later_copies(tmx_file):
+    editor = TMXEditor()
+    editor.load(str(tmx_file))
+    drop, count = find_duplicates(editor, 1)
+    seen = set()
+    for number, tu in enumerate(editor.iter_tus()):
+        key = editor.get_record(tu).key
+        expected = key is not None and key in seen
+        seen.add(key)
+        assert bool(drop[number >> 3] & (1 << (number & 7))) == expected
+    assert count == number + 1
+
+
+def test_stage_must_come_first(tmx_file, tmp_path):
+    editor = TMXEditor()
+    editor.load(str(tmx_file), streaming=True)
+    stage = PartitionedDedupStage.prepare(editor, 1)
+    with pytest.raises(Exception, match="must be the first stage"):
+        editor.run_pipeline([EmptyStage(), stage], str(tmp_path / 'out.tmx'))
+
+
+def test_stage_checks_tu_count(tmx_file, tmp_path):
+    editor = TMXEditor()
+    editor.load(str(tmx_file), streaming=True)
+    drop, count = find_duplicates(editor, 1)
+    with pytest.raises(Exception, match="Duplicate map covers"):
+        editor.run_pipeline([PartitionedDedupStage(drop, count - 1), DedupStage()],
+                            str(tmp_path / 'short.tmx'))
+    with pytest.raises(Exception, match="Duplicate map covers"):
+        editor.run_pipeline([PartitionedDedupStage(drop, count + 1)], str(tmp_path / 'long.tmx'))
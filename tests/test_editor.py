@@ -0,0 +1,37 @@
+"""Streaming load and batch pipeline must write what the in-memory editor writes."""
+
+import pytest
+
+from tmx_editor import TMXEditor, _batch_operation
+
+RECORD_FIELDS = ('source', 'target', 'key', 'creation_date', 'change_date', 'tagged_segments')
+
+OPERATIONS = {
+    'dedup': TMXEditor.remove_exact_duplicates,
+    'empty': TMXEditor.remove_empty_segments,
+    'strip-tags': TMXEditor.strip_inline_tags,
+}
+
+
+def records(path, **kwargs):
+    editor = TMXEditor()
+    editor.load(str(path), **kwargs)
+    return [tuple(getattr(editor.get_record(tu), name) for name in RECORD_FIELDS)
+            for tu in editor.iter_tus()]
+
+
+def test_streaming_records_match_tree(tmx_file):
+    assert records(tmx_file, streaming=True) == records(tmx_file)
+
+
+@pytest.mark.parametrize('operations', [['dedup'], ['empty'], ['strip-tags'],
+                                        ['dedup', 'empty'], ['dedup', 'empty', 'strip-tags']])
+def test_pipeline_matches_in_memory(tmx_file, tmp_path, operations):
+    editor = TMXEditor()
+    editor.load(str(tmx_file))
+    for op in operations:
+        OPERATIONS[op](editor)
+    expected = open(editor.save(str(tmp_path / 'memory.tmx')), 'rb').read()
+
+    _batch_operation(str(tmx_file), operations, str(tmp_path / 'streamed.tmx'))
+    assert (tmp_path / 'streamed.tmx').read_bytes() == expected
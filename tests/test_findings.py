@@ -0,0 +1,100 @@
+"""Findings files must give back parse_tmx()'s results."""
+
+import io
+import json
+
+import pytest
+
+from tmx_analyzer import TMXAnalyzer
+from tmx_findings import COLUMNAR_MAGIC, ColumnarFindings, write_columnar, write_jsonl
+
+
+@pytest.fixture
+def results(tmx_file):
+    auto, dups, missing, pair, valid = TMXAnalyzer().parse_tmx(str(tmx_file))
+    assert auto and dups and missing
+    return auto, dups, missing, pair, valid, str(tmx_file)
+
+
+def test_jsonl_round_trip(results):
+    f = io.StringIO()
+    write_jsonl(f, *results)
+    records = [json.loads(line) for line in f.getvalue().splitlines()]
+    analysis = records[0]
+    assert analysis['type'] == 'analysis'
+    assert analysis['total_valid_tus'] == results[4]
+    assert (analysis['source_lang'], analysis['target_lang']) == results[3]
+
+    def of_type(kind):
+        return [{name: value for name, value in r.items() if name != 'type'}
+                for r in records if r['type'] == kind]
+
+    assert of_type('auto_translatable') == results[0]
+    assert of_type('duplicate_group') == results[1]
+    assert of_type('missing_target') == results[2]
+
+
+def read_columnar(path):
+    """parse_tmx()-style results rebuilt from a columnar findings file."""
+    with ColumnarFindings(path) as findings:
+        col, text = findings.column, findings.string
+        auto = []
+        for k in range(len(col('auto_tu_number'))):
+            reasons = [name for bit, name in enumerate(findings.categories)
+                       if col('auto_reasons')[k] >> bit & 1]
+            auto.append({
+                'tu_number': col('auto_tu_number')[k],
+                'source_lang': text(col('auto_source_lang')[k]),
+                'target_lang': text(col('auto_target_lang')[k]),
+                'source_text': text(col('auto_source')[k]),
+                'target_text': text(col('auto_target')[k]),
+                'auto_translatable_reasons': reasons,
+                'creation_date': text(col('auto_creation_date')[k]),
+                'change_date': text(col('auto_change_date')[k]),
+                'is_auto_translatable': True,
+            })
+        missing = [{
+            'tu_number': col('missing_tu_number')[k],
+            'issue_type': findings.issue_types[col('missing_issue')[k]],
+            'source_text': text(col('missing_source')[k]),
+            'target_text': text(col('missing_target')[k]),
+            'creation_date': text(col('missing_creation_date')[k]),
+            'change_date': text(col('missing_change_date')[k]),
+        } for k in range(len(col('missing_tu_number')))]
+        dups = []
+        first = col('dup_first')
+        for g in range(len(col('dup_occurrences'))):
+            rows = range(first[g], first[g + 1])
+            dups.append({
+                'source_text': text(col('dup_source')[g]),
+                'target_text': text(col('dup_target')[g]),
+                'occurrences': col('dup_occurrences')[g],
+                'tu_numbers': [col('dup_tu_tu_number')[r] for r in rows],
+                'creation_dates': [text(col('dup_tu_creation_date')[r]) for r in rows],
+                'change_dates': [text(col('dup_tu_change_date')[r]) for r in rows],
+            })
+        return auto, dups, missing, findings.analysis
+
+
+def test_columnar_round_trip(results):
+    path = TMXAnalyzer().save_findings(*results, 'columnar')
+    auto, dups, missing, analysis = read_columnar(path)
+    assert any(len(r['auto_translatable_reasons']) > 1 for r in auto)
+    assert (auto, dups, missing) == results[:3]
+    assert analysis['total_valid_tus'] == results[4]
+
+
+def test_columnar_checks_item_size(results, tmp_path):
+    path = tmp_path / 'findings.bin'
+    with open(path, 'wb') as f:
+        write_columnar(f, *results)
+    data = path.read_bytes()
+    head_end = data.index(b'\n', len(COLUMNAR_MAGIC))
+    header = json.loads(data[len(COLUMNAR_MAGIC):head_end])
+    header['sections'][0][3] = 2
+    head = json.dumps(header).encode('utf-8')
+    # Keep the header line's length, so the section offsets stay valid
+    head += b' ' * (head_end - len(COLUMNAR_MAGIC) - len(head))
+    path.write_bytes(COLUMNAR_MAGIC + head + data[head_end:])
+    with pytest.raises(Exception, match="2-byte items"):
+        ColumnarFindings(str(path))
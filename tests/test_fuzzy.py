@@ -0,0 +1,83 @@
+"""Fuzzy duplicate search: LSH candidates against the exhaustive search."""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from conftest import WORDS
+from tmx_editor import TMXEditor
+from tmx_fuzzy import MinHashLSH
+
+THRESHOLD = 0.85
+
+
+@pytest.fixture
+def fuzzy_tmx(tmp_path):
+    """Sentences, some with a few variants differing in one word or the end."""
+    rng = random.Random(5)
+    sources = []
+    for _ in range(150):
+        base = [rng.choice(WORDS) for _ in range(rng.randint(6, 14))]
+        sources.append(' '.join(base))
+        for _ in range(rng.randint(0, 2)):
+            variant = list(base)
+            variant[rng.randrange(len(variant))] = rng.choice(WORDS)
+            sources.append(' '.join(variant) + rng.choice(['', '.', '!']))
+    rng.shuffle(sources)
+    body = ''.join(f'    <tu><tuv xml:lang="en"><seg>{source}</seg></tuv>'
+                   f'<tuv xml:lang="nb"><seg>{source.upper()}</seg></tuv></tu>\n'
+                   for source in sources)
+    path = tmp_path / 'fuzzy.tmx'
+    path.write_text('<?xml version="1.0" encoding="UTF-8"?>\n<tmx version="1.4">\n'
+                    f'  <header srclang="en"/>\n  <body>\n{body}  </body>\n</tmx>\n',
+                    encoding='utf-8')
+    return path
+
+
+def fuzzy_groups(path, **kwargs):
+    editor = TMXEditor()
+    editor.load(str(path))
+    return [(group['representative_tu'],
+             [(similar['tu_number'], similar['similarity']) for similar in group['similar_tus']])
+            for group in editor.find_fuzzy_duplicates(THRESHOLD, **kwargs)]
+
+
+def test_lsh_matches_exhaustive(fuzzy_tmx):
+    expected = fuzzy_groups(fuzzy_tmx, use_lsh=False)
+    assert len(expected) > 50
+    assert fuzzy_groups(fuzzy_tmx, use_lsh=True) == expected
+
+
+def test_candidates_cover_close_pairs():
+    rng = random.Random(7)
+    pairs = []
+    for _ in range(200):
+        words = [rng.choice(WORDS) for _ in range(10)]
+        text = ' '.join(words)
+        words[rng.randrange(10)] = rng.choice(WORDS)
+        pairs.append((text, ' '.join(words)))
+    texts = sorted({text for pair in pairs for text in pair}, key=len)
+    position = {text: i for i, text in enumerate(texts)}
+
+    candidates = MinHashLSH(THRESHOLD).candidates(texts)
+    for i, others in candidates.items():
+        assert others == sorted(others) and all(j > i for j in others)
+
+    close = [tuple(sorted((position[a], position[b]))) for a, b in pairs
+             if a != b and SequenceMatcher(None, a, b).ratio() >= 0.95]
+    found = sum(j in candidates.get(i, ()) for i, j in close)
+    assert close and found >= 0.95 * len(close)
+
+
+def test_signature_is_deterministic():
+    lsh = MinHashLSH(THRESHOLD)
+    assert lsh.signature("open the file") == MinHashLSH(THRESHOLD).signature("open the file")
+    assert len(lsh.signature("ok")) == lsh.num_perm
+    assert lsh.bands * lsh.rows == lsh.num_perm
+
+
+@pytest.mark.parametrize('use_lsh', [False, True])
+def test_workers_match_serial(fuzzy_tmx, use_lsh):
+    expected = fuzzy_groups(fuzzy_tmx, use_lsh=use_lsh)
+    assert fuzzy_groups(fuzzy_tmx, use_lsh=use_lsh, workers=2) == expected
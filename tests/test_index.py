@@ -0,0 +1,82 @@
+"""Sidecar index: records and findings must match the ones read from the XML."""
+
+import json
+import os
+
+from tmx_analyzer import TMXAnalyzer
+from tmx_editor import TMXEditor
+from tmx_index import INDEX_MAGIC, TMXIndex, index_path, iter_tu_spans
+
+RECORD_FIELDS = ('source', 'target', 'key', 'creation_date', 'change_date', 'tagged_segments')
+
+
+def records(path, **kwargs):
+    editor = TMXEditor()
+    editor.load(str(path), **kwargs)
+    return [tuple(getattr(editor.get_record(tu), name) for name in RECORD_FIELDS)
+            for tu in editor.iter_tus()]
+
+
+def test_records_match_xml(tmx_file):
+    expected = records(tmx_file)
+    assert records(tmx_file, use_index=True) == expected  # builds the index
+    assert TMXIndex.load(str(tmx_file)) is not None
+    assert records(tmx_file, use_index=True) == expected  # reads it
+
+
+def test_dedup_output_matches(tmx_file, tmp_path):
+    outputs = []
+    for use_index in (False, True, True):
+        editor = TMXEditor()
+        editor.load(str(tmx_file), use_index=use_index)
+        editor.remove_exact_duplicates()
+        outputs.append(editor.save(str(tmp_path / f'out{len(outputs)}.tmx')))
+    assert len({open(path, 'rb').read() for path in outputs}) == 1
+
+
+def test_analyzer_index_matches_stream(tmx_file):
+    expected = TMXAnalyzer().parse_tmx(str(tmx_file))
+    assert TMXAnalyzer().parse_tmx(str(tmx_file), use_index=True) == expected
+    assert TMXAnalyzer().parse_tmx(str(tmx_file), use_index=True) == expected
+
+
+def test_stale_index_is_ignored(tmx_file):
+    records(tmx_file, use_index=True)
+    st = os.stat(tmx_file)
+    data = tmx_file.read_bytes()
+    # Same size and mtime, other content: only the digest tells
+    tmx_file.write_bytes(data.replace(b'changedate="2023', b'changedate="2024', 1))
+    os.utime(tmx_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert TMXIndex.load(str(tmx_file)) is None
+    assert TMXIndex.load(str(tmx_file), verify_digest=False) is not None
+    tmx_file.write_bytes(data + b'\n')
+    assert TMXIndex.load(str(tmx_file), verify_digest=False) is None
+
+
+def test_item_size_is_checked(tmx_file):
+    records(tmx_file, use_index=True)
+    path = index_path(str(tmx_file))
+    with open(path, 'rb') as f:
+        magic = f.readline()
+        header = json.loads(f.readline())
+        data = f.read()
+    assert magic == INDEX_MAGIC
+    for section in header['sections']:
+        if section[0] == 'tu_start':
+            section[3] = 4
+    with open(path, 'wb') as f:
+        f.write(magic + json.dumps(header).encode('utf-8') + b'\n' + data)
+    assert TMXIndex.load(str(tmx_file)) is None
+
+
+def test_tu_spans_skip_comments_and_cdata():
+    data = (b'<body><!-- <tu>not one</tu> --><tu a="1"><tuv><seg>x</seg></tuv></tu>'
+            b'<tu b="2"/><![CDATA[<tu>]]><tu>\n<tuv/></tu ></body>')
+    spans = list(iter_tu_spans(data))
+    assert [data[start:end] for start, end in spans] == [
+        b'<tu a="1"><tuv><seg>x</seg></tuv></tu>', b'<tu b="2"/>', b'<tu>\n<tuv/></tu >']
+
+
+def test_streaming_ignores_index(tmx_file):
+    assert records(tmx_file, streaming=True, use_index=True) == records(tmx_file)
+    assert not os.path.exists(index_path(str(tmx_file)))
@@ -0,0 +1,53 @@
+"""Duplicate keys and KeyTable, including digest collisions."""
+
+import pytest
+
+import tmx_keys
+from tmx_keys import DIGEST_SIZE, KeyTable, digest, make_key, normalize
+
+
+def test_make_key_normalizes():
+    assert normalize("  Open\tthe  FILE \n") == "open the file"
+    assert make_key("Open  file", "Åpne FIL") == make_key("open file ", " åpne fil")
+    assert len(digest(make_key("a", "b"))) == DIGEST_SIZE
+
+
+def test_table_by_digest():
+    table = KeyTable()
+    assert table.add("a|||b", 1)
+    assert not table.add("a|||b", 2)
+    assert table["a|||b"] == 1 and table.get("c|||d") is None
+    assert table.setdefault("c|||d", 3) == 3 and table.setdefault("c|||d", 4) == 3
+    table["a|||b"] = 5
+    assert "a|||b" in table and len(table) == 2
+    del table["a|||b"]
+    assert "a|||b" not in table and list(table.values()) == [3]
+
+
+@pytest.fixture
+def colliding(monkeypatch):
+    """Every key has the same digest."""
+    monkeypatch.setattr(tmx_keys, 'digest', lambda text: b'\0' * DIGEST_SIZE)
+
+
+def test_key_of_resolves_collisions(colliding):
+    table = KeyTable(key_of=lambda value: value)
+    assert table.add("a|||b", "a|||b")
+    assert table.add("c|||d", "c|||d")
+    assert table.setdefault("e|||f", "e|||f") == "e|||f"
+    assert len(table) == 3
+    assert [table[key] for key in ("a|||b", "c|||d", "e|||f")] == ["a|||b", "c|||d", "e|||f"]
+    assert not table.add("c|||d", "c|||d")
+
+    del table["c|||d"]
+    assert "c|||d" not in table and "e|||f" in table
+    del table["a|||b"]
+    # The digest slot is free again; the key stored under its text is still found
+    assert "e|||f" in table and table.get("a|||b") is None
+    assert table.add("a|||b", "a|||b") and len(table) == 2
+
+
+def test_without_key_of_digest_decides(colliding):
+    table = KeyTable()
+    table.add("a|||b", 1)
+    assert "c|||d" in table and len(table) == 1
@@ -0,0 +1,62 @@
+"""--merge with --jobs or --mem-limit must write what the in-memory merge writes."""
+
+import pytest
+
+import tmx_merge
+from conftest import write_tmx
+from tmx_editor import _batch_merge
+from tmx_merge import external_merge, parse_size
+
+STRATEGIES = ['skip', 'replace', 'keep_both']
+
+
+@pytest.fixture
+def merge_dir(tmp_path):
+    """Three files sharing sources, some with other targets."""
+    directory = tmp_path / 'in'
+    directory.mkdir()
+    for k in range(3):
+        write_tmx(directory / f'part{k}.tmx', count=1500, seed=k + 1)
+    return directory
+
+
+def merged(merge_dir, tmp_path, strategy, **kwargs):
+    out = tmp_path / f"merged_{strategy}_{'_'.join(map(str, kwargs.values()))}.tmx"
+    _batch_merge(str(merge_dir), str(out), strategy, **kwargs)
+    return out.read_bytes()
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_jobs_matches_in_memory(merge_dir, tmp_path, strategy):
+    expected = merged(merge_dir, tmp_path, strategy)
+    assert merged(merge_dir, tmp_path, strategy, jobs=2) == expected
+
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_mem_limit_matches_in_memory(merge_dir, tmp_path, monkeypatch, strategy):
+    # 4,500 keyed TUs in runs of 1,024, merged two at a time
+    monkeypatch.setattr(tmx_merge, 'MAX_FAN_IN', 2)
+    expected = merged(merge_dir, tmp_path, strategy)
+    assert merged(merge_dir, tmp_path, strategy, mem_limit=1) == expected
+
+
+def test_external_merge_totals(merge_dir, tmp_path):
+    paths = sorted(str(path) for path in merge_dir.iterdir())
+    result = external_merge(paths, str(tmp_path / 'out.tmx'), 'replace', mem_limit=1,
+                            progress=lambda message: None)
+    assert result['added'] > 0 and result['skipped'] > 0 and result['replaced'] > 0
+    assert result['total_after'] == (tmp_path / 'out.tmx').read_text(encoding='utf-8').count('<tu ')
+    with pytest.raises(Exception):
+        external_merge(paths[:1], str(tmp_path / 'one.tmx'))
+
+
+@pytest.mark.parametrize('text, size', [('65536', 65536), ('512M', 512 << 20),
+                                        ('2gb', 2 << 30), ('1.5K', 1536)])
+def test_parse_size(text, size):
+    assert parse_size(text) == size
+
+
+@pytest.mark.parametrize('text', ['', 'lots', '0', '-1M'])
+def test_parse_size_rejects(text):
+    with pytest.raises(Exception, match="Invalid size"):
+        parse_size(text)
@@ -26,13 +26,222 @@ Categories identified:
 """
 
 import xml.etree.ElementTree as ET
+import argparse
+import functools
+import hashlib
+import json
+import itertools
+import mmap
 import re
 import os
+import shutil
+import struct
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import sys
 
+from tmx_findings import write_columnar, write_jsonl
+from tmx_index import TMXIndex, iter_tu_spans, tuv_lang
+import tmx_keys
+from tmx_keys import DIGEST_SIZE, KeyTable, digest, make_key
+
+# Per-TU input to TMXAnalyzer._analyze_tu(): ([(lang, seg text or None), ...],
+# creation date, change date, precomputed duplicate key or None)
+TUEntry = Tuple[List[Tuple[str, Optional[str]]], str, str, Optional[str]]
+
+# Incremental analysis state (FILE.tmx.state): a magic line, a JSON header
+# line, then one STATE_RECORD per TU in file order - the TU's fingerprint,
+# its duplicate key digest (zeros unless a valid, not auto-translatable
+# TU), its auto-translatable reasons as bits (header 'reasons'), 1 for a
+# valid TU, and otherwise its issue type (index into header 'issue_types').
+# Little-endian on every machine.
+STATE_SUFFIX = '.state'
+STATE_MAGIC = b'TMXSTATE 2\n'
+STATE_RECORD = struct.Struct('<16s16sIBB2x')
+# A TU reuses the record of an equal TU up to this many positions away
+# from it in the previous run's file
+STATE_WINDOW = 4096
+
+
+class PairGroup:
+    """TUs sharing one normalized source+target pair; texts are the first TU's."""
+    __slots__ = ('source_text', 'target_text', 'tu_numbers', 'creation_dates', 'change_dates')
+
+    def __init__(self, source_text: str, target_text: str):
+        self.source_text = source_text
+        self.target_text = target_text
+        self.tu_numbers: List[int] = []
+        self.creation_dates: List[str] = []
+        self.change_dates: List[str] = []
+
+
+def _group_key(group: PairGroup) -> str:
+    return make_key(group.source_text, group.target_text)
+
+
+class DuplicateGroups:
+    """
+    Exact duplicate grouping, accumulated one TU at a time: only a
+    PairGroup per distinct pair is kept, not the TUs themselves.
+    """
+
+    def __init__(self):
+        # Held as digests; a group's texts give back its key to check matches
+        self.groups = KeyTable(_group_key)
+
+    def add(self, tu_number: int, source_text: str, target_text: str,
+            creation_date: str, change_date: str, pair_key: Optional[str] = None):
+        """Count one TU; pair_key is its precomputed key, if known."""
+        if pair_key is None:
+            pair_key = make_key(source_text, target_text)
+        group = self.groups.setdefault(pair_key, PairGroup(source_text, target_text))
+        group.tu_numbers.append(tu_number)
+        group.creation_dates.append(creation_date)
+        group.change_dates.append(change_date)
+
+    def merge(self, other: 'DuplicateGroups'):
+        """Add the groups of TUs that follow this one's in the file."""
+        for other_group in other.groups.values():
+            pair_key = _group_key(other_group)
+            group = self.groups.get(pair_key)
+            if group is None:
+                self.groups[pair_key] = other_group
+            else:
+                group.tu_numbers.extend(other_group.tu_numbers)
+                group.creation_dates.extend(other_group.creation_dates)
+                group.change_dates.extend(other_group.change_dates)
+
+    def results(self) -> List[Dict]:
+        """Groups with more than one TU, most occurrences first."""
+        duplicate_groups = []
+        for group in self.groups.values():
+            if len(group.tu_numbers) > 1:  # Only groups with actual duplicates
+                duplicate_groups.append({
+                    'source_text': group.source_text,  # Use original casing
+                    'target_text': group.target_text,  # Use original casing
+                    'occurrences': len(group.tu_numbers),
+                    'tu_numbers': group.tu_numbers,
+                    'creation_dates': group.creation_dates,
+                    'change_dates': group.change_dates
+                })
+
+        # Sort by number of occurrences (descending)
+        duplicate_groups.sort(key=lambda x: x['occurrences'], reverse=True)
+        return duplicate_groups
+
+
+class AnalysisParts:
+    """What parse_tmx() collects over a run of TUs."""
+    __slots__ = ('auto_translatable', 'duplicate_groups', 'missing_target',
+                 'tu_count', 'valid_count', 'cache_stats')
+
+    def __init__(self):
+        self.auto_translatable: List[Dict] = []
+        self.duplicate_groups = DuplicateGroups()
+        self.missing_target: List[Dict] = []
+        self.tu_count = 0
+        self.valid_count = 0
+        self.cache_stats = [0, 0, 0]  # classification cache hits, misses, uncached
+
+    def merge(self, other: 'AnalysisParts'):
+        """Add the findings of the TUs that follow this run in the file."""
+        self.auto_translatable.extend(other.auto_translatable)
+        self.duplicate_groups.merge(other.duplicate_groups)
+        self.missing_target.extend(other.missing_target)
+        self.tu_count += other.tu_count
+        self.valid_count += other.valid_count
+        self.cache_stats = [a + b for a, b in zip(self.cache_stats, other.cache_stats)]
+
+
+class ContentClassifier:
+    """
+    Classifies a stripped segment with a set of anchored patterns, giving
+    every category whose pattern matches, in pattern order.
+
+    Most segments match nothing, so they are screened first: each default
+    pattern can only start and end with certain characters (a date ends
+    with a digit, an email with a letter, ...), which rules out most
+    patterns from the first and last character alone. The remaining
+    candidates are tried in one alternation regex with a named group per
+    pattern; only when that matches are the candidates after the first
+    hit tried one by one, as categories can overlap.
+    """
+
+    # Characters a default pattern can start and end with; patterns not
+    # listed here are always tried
+    EDGES = {
+        'numbers_only': (r'[\d.,\-+()%]', r'[\d.,\-+()%]'),
+        'mixed_alphanumeric_codes': (r'[A-Z0-9\-_]', r'[A-Z0-9\-_]'),
+        'dates': (r'\w', r'\d'),
+        'email': (r'[a-zA-Z0-9._%+-]', r'[a-zA-Z]'),
+        'url': (r'[hw]', r'\S'),
+        'simple_punctuation': (r'[^\w\s]', r'[^\w\s]'),
+        'version_numbers': (r'[v\d]', r'[a-zA-Z\d]'),
+        'currency': (r'[$£€¥\d.,]', r'[$£€¥\d.,]'),
+        'measurements': (r'\d', r'[a-zA-Z%]'),
+    }
+
+    def __init__(self, patterns: Dict[str, 're.Pattern']):
+        self.patterns = list(patterns.items())
+        self._edges = []
+        for name, _pattern in self.patterns:
+            edges = self.EDGES.get(name)
+            self._edges.append((re.compile(edges[0]), re.compile(edges[1])) if edges else None)
+        # Bit k set: pattern k can start / end with the character
+        self._first_masks: Dict[str, int] = {}
+        self._last_masks: Dict[str, int] = {}
+        self._gates: Dict[int, 're.Pattern'] = {}
+
+    def _mask(self, char: str, side: int) -> int:
+        mask = 0
+        for k, edges in enumerate(self._edges):
+            if edges is None or edges[side].match(char):
+                mask |= 1 << k
+        (self._last_masks if side else self._first_masks)[char] = mask
+        return mask
+
+    def _gate(self, mask: int) -> 're.Pattern':
+        """Alternation of the patterns in mask, group c<k> for pattern k."""
+        gate = self._gates[mask] = re.compile('|'.join(
+            f'(?P<c{k}>{pattern.pattern})'
+            for k, (_name, pattern) in enumerate(self.patterns) if mask >> k & 1))
+        return gate
+
+    def classify(self, text: str) -> List[str]:
+        clean_text = text.strip()
+        if not clean_text:
+            return ['empty']
+
+        first, last = clean_text[0], clean_text[-1]
+        mask = self._first_masks.get(first)
+        if mask is None:
+            mask = self._mask(first, 0)
+        last_mask = self._last_masks.get(last)
+        if last_mask is None:
+            last_mask = self._mask(last, 1)
+        mask &= last_mask
+        if not mask:
+            return ['regular_text']
+
+        gate = self._gates.get(mask)
+        if gate is None:
+            gate = self._gate(mask)
+        match = gate.match(clean_text)
+        if match is None:
+            return ['regular_text']
+
+        first_hit = int(match.lastgroup[1:])
+        categories = [self.patterns[first_hit][0]]
+        for k in range(first_hit + 1, len(self.patterns)):
+            if mask >> k & 1:
+                name, pattern = self.patterns[k]
+                if pattern.match(clean_text):
+                    categories.append(name)
+        return categories
+
 
 class TMXAnalyzer:
     # Human-readable labels for missing/empty target issue types
@@ -51,6 +260,14 @@ class TMXAnalyzer:
         'simple_punctuation', 'version_numbers', 'currency', 'measurements'
     }
 
+    PROPER_NAME = re.compile(r'^[A-Z][a-z]*(\s+[A-Z][a-z]*)*$')
+
+    # Classification cache: entries kept, and the longest source cached.
+    # Repeated segments are short UI strings, numbers and the like; long
+    # segments rarely repeat and would only cost hashing and evictions.
+    CACHE_SIZE = 1 << 16
+    CACHE_MAX_CHARS = 64
+
     def __init__(self):
         # Regex patterns for different auto-translatable content types
         self.patterns = {
@@ -64,6 +281,9 @@ class TMXAnalyzer:
             'currency': re.compile(r'^\s*([$£€¥]\s*[\d\s\.,]+|[\d\s\.,]+\s*[$£€¥])\s*$'),
             'measurements': re.compile(r'^\s*\d+(\.\d+)?\s*(mm|cm|m|km|in|ft|kg|g|lb|oz|°C|°F|%)\s*$'),
         }
+        self.classifier = ContentClassifier(self.patterns)
+        self._cached_reasons = functools.lru_cache(maxsize=self.CACHE_SIZE)(self._auto_reasons)
+        self.cache_stats: Optional[List[int]] = None
     
     def detect_language_pair(self, root) -> Tuple[str, str]:
         """
@@ -77,11 +297,12 @@ class TMXAnalyzer:
 
         # Collect all languages seen in TUVs (sample first 20 TUs)
         tuvs = root.findall('.//tuv')
+        return self._pick_language_pair(header_src_lang, [tuv_lang(tuv) for tuv in tuvs[:20]])
+
+    def _pick_language_pair(self, header_src_lang: Optional[str], tuv_langs: List[str]) -> Tuple[str, str]:
+        """Language pair from the header srclang and a sample of TUV languages."""
         languages = set()
-        for tuv in tuvs[:20]:
-            lang = (tuv.get('{http://www.w3.org/XML/1998/namespace}lang') or
-                    tuv.get('xml:lang') or
-                    tuv.get('lang'))
+        for lang in tuv_langs:
             if lang:
                 languages.add(lang.lower())
 
@@ -116,7 +337,7 @@ class TMXAnalyzer:
         
         if source_clean.lower() == target_clean.lower():
             # Check if it looks like a proper name (starts with capital letters)
-            if re.match(r'^[A-Z][a-z]*(\s+[A-Z][a-z]*)*$', source_clean):
+            if self.PROPER_NAME.match(source_clean):
                 return True
         return False
     
@@ -124,238 +345,519 @@ class TMXAnalyzer:
         """
         Classify text content into auto-translatable categories
         """
-        categories = []
-        
-        # Clean text for analysis
-        clean_text = text.strip()
-        
-        if not clean_text:
-            return ['empty']
-        
-        # Check each pattern
-        for category, pattern in self.patterns.items():
-            if pattern.match(clean_text):
-                categories.append(category)
-        
-        return categories if categories else ['regular_text']
+        return self.classifier.classify(text)
+
+    def _auto_reasons(self, source_text: str, target_text: str) -> Tuple[str, ...]:
+        """Why a source/target pair is auto-translatable (empty if it is not)."""
+        reasons = [cat for cat in self.classify_content(source_text)
+                   if cat in self.AUTO_TRANSLATABLE_CATEGORIES]
+        if self.is_proper_name_match(source_text, target_text):
+            reasons.append('proper_name_match')
+        return tuple(reasons)
     
-    def parse_tmx(self, tmx_file_path: str) -> Tuple[List[Dict], List[Dict], List[Dict], Tuple[str, str], int]:
+    def parse_tmx(self, tmx_file_path: str, use_index: bool = False, jobs: int = 1,
+                  incremental: bool = False) -> Tuple[List[Dict], List[Dict], List[Dict], Tuple[str, str], int]:
         """
         Parse TMX file and extract translation units with analysis
         Returns: (auto_translatable_results, duplicate_results, missing_target_results, (source_lang, target_lang), total_valid_tus)
+
+        The XML is streamed one <tu> at a time, so memory use depends on
+        the findings, not on the file size. With jobs > 1 the TUs are
+        analyzed in that many worker processes (see _parallel_analysis).
+        With use_index=True the TUs are read from the FILE.tmx.idx sidecar
+        index instead (building it first if it is missing or stale).
+        With incremental=True only TUs that changed since the last
+        incremental run are analyzed (see _incremental_analysis).
         """
-        try:
+        if incremental and (use_index or jobs > 1):
+            raise ValueError("Incremental analysis cannot be combined with use_index or jobs > 1")
+        
+        parts = None
+        if use_index:
+            source_lang, target_lang, tu_entries = self._index_entries(tmx_file_path)
+        else:
             print(f"Parsing TMX file: {tmx_file_path}")
-            tree = ET.parse(tmx_file_path)
-            root = tree.getroot()
-        except ET.ParseError as e:
-            raise Exception(f"Error parsing TMX file: {e}")
-        except FileNotFoundError:
-            raise Exception(f"TMX file not found: {tmx_file_path}")
+            source_lang, target_lang, tu_entries = self._stream_entries(tmx_file_path)
+            if jobs > 1 and not _byte_scannable(_xml_encoding(tmx_file_path)):
+                print("UTF-16/32 files cannot be split at byte offsets; analyzing in one process")
+                jobs = 1
+            if jobs > 1:
+                tu_entries = None  # only the language pair was needed
+                print(f"Analyzing translation units in {jobs} processes...")
+                parts = self._parallel_analysis(tmx_file_path, source_lang, target_lang, jobs)
+            elif incremental and not _byte_scannable(_xml_encoding(tmx_file_path)):
+                print("UTF-16/32 files cannot be analyzed incrementally; analyzing all TUs")
+            elif incremental:
+                tu_entries = None
+                print("Analyzing new and changed translation units...")
+                parts = self._incremental_analysis(tmx_file_path, source_lang, target_lang)
         
-        # Detect language pair
-        source_lang, target_lang = self.detect_language_pair(root)
+        if parts is None:
+            print("Analyzing translation units...")
+            parts = self._analyze_entries(tu_entries, source_lang, target_lang)
         
-        auto_translatable_results = []
-        all_tus = []
-        missing_target_results = []
-        tu_count = 0
+        self.cache_stats = parts.cache_stats
+        print(f"Analysis complete. Processed {parts.tu_count} TUs total.")
+        duplicate_results = parts.duplicate_groups.results()
         
-        print("Analyzing translation units...")
+        print(f"Found {len(parts.auto_translatable)} auto-translatable TUs")
+        print(f"Found {len(duplicate_results)} exact duplicate TU pairs")
+        print(f"Found {len(parts.missing_target)} missing/empty target issues")
         
-        # Find all translation units
-        for tu in root.findall('.//tu'):
-            tu_count += 1
-            
-            if tu_count % 10000 == 0:
-                print(f"Processed {tu_count} TUs...")
-            
-            # Extract source and target segments
-            tuvs = tu.findall('tuv')
-            if len(tuvs) < 2:
-                # Missing target TUV entirely
-                missing_target_results.append({
-                    'tu_number': tu_count,
-                    'issue_type': 'missing_target_tuv',
-                    'source_text': '',
-                    'target_text': '',
-                    'creation_date': tu.get('creationdate', ''),
-                    'change_date': tu.get('changedate', '')
-                })
-                continue
-            
-            # Get source and target TUVs (flexible order based on language detection)
-            source_tuv = None
-            target_tuv = None
-            
-            for tuv in tuvs:
-                tuv_lang = (tuv.get('{http://www.w3.org/XML/1998/namespace}lang') or 
-                           tuv.get('xml:lang') or 
-                           tuv.get('lang') or '').lower()
-                
-                if tuv_lang == source_lang or (source_tuv is None and target_tuv is None):
-                    source_tuv = tuv
-                elif tuv_lang == target_lang or target_tuv is None:
-                    target_tuv = tuv
-            
-            # Fallback: use first two TUVs if language detection failed
-            if source_tuv is None:
-                source_tuv = tuvs[0]
-            if target_tuv is None:
-                target_tuv = tuvs[1] if len(tuvs) > 1 else tuvs[0]
-            
-            source_seg = source_tuv.find('seg')
-            target_seg = target_tuv.find('seg')
+        return parts.auto_translatable, duplicate_results, parts.missing_target, (source_lang, target_lang), parts.valid_count
+
+    def _analyze_entries(self, tu_entries: Iterable[TUEntry], source_lang: str, target_lang: str,
+                         first_number: int = 1, progress: bool = True) -> AnalysisParts:
+        """Analyze TU entries numbered from first_number."""
+        parts = AnalysisParts()
+        tu_number = first_number - 1
+        cache_before = self._cached_reasons.cache_info()
+        
+        for tuvs, creation_date, change_date, dedup_key in tu_entries:
+            tu_number += 1
+            parts.tu_count += 1
             
-            # Check for missing segments
-            if source_seg is None:
-                missing_target_results.append({
-                    'tu_number': tu_count,
-                    'issue_type': 'missing_source_seg',
-                    'source_text': '',
-                    'target_text': ''.join(target_seg.itertext()).strip() if target_seg is not None else '',
-                    'creation_date': tu.get('creationdate', ''),
-                    'change_date': tu.get('changedate', '')
-                })
-                continue
+            if progress and parts.tu_count % 10000 == 0:
+                print(f"Processed {parts.tu_count} TUs...")
+
+            issue, tu_data = self._analyze_tu(tu_number, tuvs, creation_date, change_date,
+                                              source_lang, target_lang)
+            self._add_finding(parts, issue, tu_data, dedup_key)
+        
+        cache_after = self._cached_reasons.cache_info()
+        hits = cache_after.hits - cache_before.hits
+        misses = cache_after.misses - cache_before.misses
+        parts.cache_stats = [hits, misses, parts.valid_count - hits - misses]
+        return parts
+
+    @staticmethod
+    def _add_finding(parts: AnalysisParts, issue: Optional[Dict], tu_data: Optional[Dict],
+                     dedup_key: Optional[str] = None) -> None:
+        """Add one analyzed TU (see _analyze_tu) to parts."""
+        if issue is not None:
+            parts.missing_target.append(issue)
+            return
+        parts.valid_count += 1
+        
+        # Auto-translatable TUs are findings; the rest are grouped to
+        # find exact duplicates (same source AND target)
+        if tu_data['is_auto_translatable']:
+            parts.auto_translatable.append(tu_data)
+        else:
+            parts.duplicate_groups.add(tu_data['tu_number'], tu_data['source_text'],
+                                       tu_data['target_text'], tu_data['creation_date'],
+                                       tu_data['change_date'], dedup_key)
+
+    def _incremental_analysis(self, tmx_file_path: str, source_lang: str,
+                              target_lang: str) -> AnalysisParts:
+        """
+        Analyze the TUs against the FILE.tmx.state file of the previous
+        incremental run, which holds a small record per TU: its
+        fingerprint - a BLAKE2b hash of the TU's bytes, so any edit to
+        its dates, attributes or segments changes it - and its outcome
+        (issue type, auto-translatable reasons or duplicate key digest).
+
+        The old records are read alongside the file, and a TU whose
+        fingerprint is among the records within STATE_WINDOW positions
+        reuses that outcome; only the others are parsed and classified.
+        The new state file is written as the TUs go by. The TUs that are
+        reported - issues, auto-translatable TUs and duplicate group
+        members - are then parsed again for their texts and dates, in
+        file order, so the result is the same as a full run.
+        """
+        encoding = _xml_encoding(tmx_file_path)
+        state_path = tmx_file_path + STATE_SUFFIX
+        reason_names = self._reason_names()
+        issue_types = list(self.ISSUE_TYPE_NAMES)
+        header = {
+            'language_pair': [source_lang, target_lang],
+            'classifier': self._classifier_fingerprint(),
+            'reasons': reason_names,
+            'issue_types': issue_types,
+        }
+        no_key = bytes(DIGEST_SIZE)
+        
+        tu_count = valid_count = analyzed = classified = 0
+        flagged = []     # (TU index, start, end, reasons) of the TUs to report
+        first_tus = {}   # duplicate key digest -> flagged entry of its first TU
+        grouped = set()  # digests of keys seen more than once
+        cache_before = self._cached_reasons.cache_info()
+        
+        old_records = self._load_state(state_path, header)
+        # Old and new records by fingerprint, oldest dropped first: the
+        # next STATE_WINDOW old records and about as many behind
+        window = OrderedDict((record[0], record)
+                             for record in itertools.islice(old_records, STATE_WINDOW))
+        
+        tmp_path = state_path + '.part'
+        with open(tmx_file_path, 'rb') as f, open(tmp_path, 'wb') as out, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            out.write(STATE_MAGIC + json.dumps(header).encode('utf-8') + b'\n')
+            for index, (start, end) in enumerate(iter_tu_spans(data)):
+                tu_count += 1
+                old_record = next(old_records, None)
+                if old_record is not None:
+                    window[old_record[0]] = old_record
+                    window.move_to_end(old_record[0])
+                    if len(window) > 2 * STATE_WINDOW:
+                        window.popitem(last=False)
+                fingerprint = hashlib.blake2b(data[start:end], digest_size=DIGEST_SIZE).digest()
+                record = window.get(fingerprint)
+                if record is None:
+                    analyzed += 1
+                    tuvs, creation_date, change_date, _key = self._tu_entry(
+                        self._parse_tu(data[start:end], encoding))
+                    issue, tu_data = self._analyze_tu(index + 1, tuvs, creation_date, change_date,
+                                                      source_lang, target_lang)
+                    if issue is not None:
+                        record = (fingerprint, no_key, 0, 0, issue_types.index(issue['issue_type']))
+                    else:
+                        classified += 1
+                        reasons = 0
+                        for reason in tu_data['auto_translatable_reasons']:
+                            reasons |= 1 << reason_names.index(reason)
+                        key = no_key if reasons else digest(make_key(tu_data['source_text'],
+                                                                     tu_data['target_text']))
+                        record = (fingerprint, key, reasons, 1, 0)
+                    window[fingerprint] = record  # for repeats of the TU
+                    if len(window) > 2 * STATE_WINDOW:
+                        window.popitem(last=False)
+                out.write(STATE_RECORD.pack(*record))
                 
-            if target_seg is None:
-                source_text = ''.join(source_seg.itertext()).strip()
-                missing_target_results.append({
-                    'tu_number': tu_count,
-                    'issue_type': 'missing_target_seg',
-                    'source_text': source_text,
-                    'target_text': '',
-                    'creation_date': tu.get('creationdate', ''),
-                    'change_date': tu.get('changedate', '')
-                })
-                continue
+                _fingerprint, key, reasons, valid, _issue = record
+                if not valid:
+                    flagged.append((index, start, end, []))
+                    continue
+                valid_count += 1
+                if reasons:
+                    flagged.append((index, start, end,
+                                    [name for k, name in enumerate(reason_names) if reasons >> k & 1]))
+                    continue
+                entry = (index, start, end, [])
+                first = first_tus.setdefault(key, entry)
+                if first is not entry:
+                    if key not in grouped:
+                        grouped.add(key)
+                        flagged.append(first)
+                    flagged.append(entry)
+            old_records.close()
             
-            source_text = ''.join(source_seg.itertext()).strip()
-            target_text = ''.join(target_seg.itertext()).strip()
+            cache_after = self._cached_reasons.cache_info()
+            hits = cache_after.hits - cache_before.hits
+            misses = cache_after.misses - cache_before.misses
+            print(f"Analyzed {analyzed:,} new or changed TUs; reused {tu_count - analyzed:,}")
             
-            # Check for empty content
-            if not source_text and not target_text:
-                missing_target_results.append({
-                    'tu_number': tu_count,
-                    'issue_type': 'both_empty',
-                    'source_text': source_text,
-                    'target_text': target_text,
-                    'creation_date': tu.get('creationdate', ''),
-                    'change_date': tu.get('changedate', '')
-                })
-                continue
-            elif not source_text:
-                missing_target_results.append({
-                    'tu_number': tu_count,
-                    'issue_type': 'empty_source',
-                    'source_text': source_text,
-                    'target_text': target_text,
-                    'creation_date': tu.get('creationdate', ''),
-                    'change_date': tu.get('changedate', '')
-                })
-                continue
-            elif not target_text:
-                missing_target_results.append({
-                    'tu_number': tu_count,
-                    'issue_type': 'empty_target',
-                    'source_text': source_text,
-                    'target_text': target_text,
-                    'creation_date': tu.get('creationdate', ''),
-                    'change_date': tu.get('changedate', '')
-                })
+            # The first TU of a group is flagged when its second turns up
+            flagged.sort(key=lambda entry: entry[0])
+            parts = AnalysisParts()
+            for index, start, end, reasons in flagged:
+                tuvs, creation_date, change_date, _key = self._tu_entry(
+                    self._parse_tu(data[start:end], encoding))
+                issue, tu_data = self._analyze_tu(index + 1, tuvs, creation_date, change_date,
+                                                  source_lang, target_lang, reasons)
+                self._add_finding(parts, issue, tu_data)
+        
+        os.replace(tmp_path, state_path)
+        parts.tu_count = tu_count
+        parts.valid_count = valid_count
+        parts.cache_stats = [hits, misses, classified - hits - misses]
+        return parts
+
+    def _reason_names(self) -> List[str]:
+        """Auto-translatable reasons in the order _auto_reasons() gives them."""
+        return ([name for name in self.patterns if name in self.AUTO_TRANSLATABLE_CATEGORIES]
+                + ['proper_name_match'])
+
+    def _classifier_fingerprint(self) -> str:
+        """
+        Hash of what decides a TU's outcome: the patterns, categories and
+        proper-name rule, and the code of this module and of tmx_keys.
+        """
+        config = json.dumps([
+            [[name, pattern.pattern, pattern.flags] for name, pattern in self.patterns.items()],
+            sorted(self.AUTO_TRANSLATABLE_CATEGORIES),
+            self.PROPER_NAME.pattern,
+            self.CACHE_MAX_CHARS,
+            list(self.ISSUE_TYPE_NAMES),
+        ])
+        h = hashlib.blake2b(config.encode('utf-8'), digest_size=16)
+        for module_path in (__file__, tmx_keys.__file__):
+            h.update(Path(module_path).read_bytes())
+        return h.hexdigest()
+
+    @staticmethod
+    def _load_state(state_path: str, header: Dict) -> Iterator[Tuple]:
+        """
+        Records of a state file, read as needed (none if it is missing,
+        unreadable, or was written with another header).
+        """
+        try:
+            f = open(state_path, 'rb')
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            print(f"Ignoring unreadable state file {state_path}: {e}")
+            return
+        with f:
+            try:
+                usable = (f.read(len(STATE_MAGIC)) == STATE_MAGIC
+                          and json.loads(f.readline()) == header)
+            except ValueError:
+                usable = False
+            if not usable:
+                print(f"State file {state_path} is from another language pair or analyzer version; "
+                      f"analyzing all TUs")
+                return
+            if (os.fstat(f.fileno()).st_size - f.tell()) % STATE_RECORD.size:
+                print(f"Ignoring truncated state file {state_path}")
+                return
+            while True:
+                chunk = f.read(STATE_RECORD.size << 12)
+                if not chunk:
+                    break
+                yield from STATE_RECORD.iter_unpack(chunk)
+
+    @staticmethod
+    def _parse_tu(raw: bytes, encoding: str) -> ET.Element:
+        """Parse the bytes of one <tu> element."""
+        try:
+            return ET.fromstring(raw if encoding in ('utf-8', 'utf8') else raw.decode(encoding))
+        except ET.ParseError as e:
+            raise Exception(f"Error parsing TMX file: {e}")
+
+    def _parallel_analysis(self, tmx_file_path: str, source_lang: str, target_lang: str,
+                           jobs: int) -> AnalysisParts:
+        """
+        Analyze the TUs in jobs worker processes. The file is cut at <tu>
+        boundaries into runs of similar byte size, a few per worker, and
+        the runs' findings are merged in file order, so the result is the
+        same as a single pass.
+        """
+        encoding = _xml_encoding(tmx_file_path)
+        if not _byte_scannable(encoding):
+            raise Exception(f"--jobs is not supported for {encoding} files")
+
+        tasks = [(tmx_file_path, encoding, start, end, first_number, source_lang, target_lang)
+                 for start, end, first_number in _tu_ranges(tmx_file_path, 4 * jobs)]
+
+        parts = AnalysisParts()
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for shard in pool.map(_analyze_shard, tasks):
+                parts.merge(shard)
+                print(f"Processed {parts.tu_count} TUs...")
+        return parts
+
+    @staticmethod
+    def _tu_entry(tu) -> TUEntry:
+        """TU entry for a <tu> element."""
+        tuvs = []
+        for tuv in tu.findall('tuv'):
+            seg = tuv.find('seg')
+            tuvs.append((tuv_lang(tuv), ''.join(seg.itertext()).strip() if seg is not None else None))
+        return tuvs, tu.get('creationdate', ''), tu.get('changedate', ''), None
+
+    def _stream_entries(self, tmx_file_path: str) -> Tuple[str, str, Iterator[TUEntry]]:
+        """
+        Language pair and TU entries, read with iterparse. The pair is
+        picked from the header and the first 20 TUVs (like
+        detect_language_pair), so the first TUs are held back until then.
+        """
+        header = {}
+        entries = self._iterparse_entries(tmx_file_path, header)
+
+        sample = []
+        tuv_langs = []
+        for entry in entries:
+            sample.append(entry)
+            tuv_langs.extend(lang for lang, _text in entry[0])
+            if len(tuv_langs) >= 20:
+                break
+
+        source_lang, target_lang = self._pick_language_pair(
+            header.get('srclang', '').lower() or None, tuv_langs[:20])
+        return source_lang, target_lang, itertools.chain(sample, entries)
+
+    def _iterparse_entries(self, tmx_file_path: str, header: Dict) -> Iterator[TUEntry]:
+        """
+        TU entries in document order; each <tu> is cleared and dropped once
+        read. header is filled with the <header> attributes on the way.
+        """
+        try:
+            with open(tmx_file_path, 'rb') as f:
+                yield from self._event_entries(ET.iterparse(f, events=('start', 'end')), header)
+        except ET.ParseError as e:
+            raise Exception(f"Error parsing TMX file: {e}")
+        except FileNotFoundError:
+            raise Exception(f"TMX file not found: {tmx_file_path}")
+
+    def _shard_entries(self, tmx_file_path: str, encoding: str,
+                       start: int, end: int) -> Iterator[TUEntry]:
+        """TU entries of the <tu> elements between byte offsets start and end."""
+        def events():
+            parser = ET.XMLPullParser(events=('start', 'end'))
+            parser.feed(f"<?xml version='1.0' encoding='{encoding}'?><tus>".encode('ascii'))
+            with open(tmx_file_path, 'rb') as f:
+                f.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = f.read(min(1 << 20, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    parser.feed(chunk)
+                    yield from parser.read_events()
+            parser.feed(b'</tus>')
+            yield from parser.read_events()
+            parser.close()
+
+        try:
+            yield from self._event_entries(events(), {})
+        except ET.ParseError as e:
+            raise Exception(f"Error parsing TMX file: {e}")
+
+    def _event_entries(self, events: Iterable[Tuple[str, ET.Element]], header: Dict) -> Iterator[TUEntry]:
+        """TU entries from ('start'/'end', element) parse events."""
+        parents = []
+        for event, elem in events:
+            if event == 'start':
+                if elem.tag == 'header' and not header:
+                    header.update(elem.attrib)
+                parents.append(elem)
                 continue
-            
-            # Get languages from TUVs
-            tuv_source_lang = (source_tuv.get('{http://www.w3.org/XML/1998/namespace}lang') or 
-                              source_tuv.get('xml:lang') or 
-                              source_tuv.get('lang') or source_lang)
-            tuv_target_lang = (target_tuv.get('{http://www.w3.org/XML/1998/namespace}lang') or 
-                              target_tuv.get('xml:lang') or 
-                              target_tuv.get('lang') or target_lang)
-            
-            # Classify source content
-            source_categories = self.classify_content(source_text)
-            
-            # Check for proper name matches
-            is_proper_name = self.is_proper_name_match(source_text, target_text)
-            
-            auto_translatable_reasons = [
-                cat for cat in source_categories
-                if cat in self.AUTO_TRANSLATABLE_CATEGORIES
-            ]
-            
-            if is_proper_name:
-                auto_translatable_reasons.append('proper_name_match')
-            
-            # Store TU data
-            tu_data = {
-                'tu_number': tu_count,
-                'source_lang': tuv_source_lang,
-                'target_lang': tuv_target_lang,
+            parents.pop()
+            if elem.tag == 'tu':
+                yield self._tu_entry(elem)
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+
+    def _index_entries(self, tmx_file_path: str) -> Tuple[str, str, Iterator[TUEntry]]:
+        """Language pair and TU entries from the sidecar index (built if needed)."""
+        if not os.path.isfile(tmx_file_path):
+            raise Exception(f"TMX file not found: {tmx_file_path}")
+
+        index = TMXIndex.load(tmx_file_path)
+        if index is None:
+            print(f"Building index for: {tmx_file_path}")
+            from tmx_editor import TMXEditor
+            editor = TMXEditor()
+            editor.load(tmx_file_path, use_index=True)
+            index = editor.index
+            del editor
+        else:
+            print(f"Reading index: {tmx_file_path}.idx")
+
+        source_lang, target_lang = self._pick_language_pair(
+            index.header_srclang.lower() or None, index.tuv_langs(20))
+
+        # Stored keys follow the editor's source/target choice, which only
+        # matches ours for the same language pair
+        use_keys = (source_lang, target_lang) == (index.source_lang, index.target_lang)
+
+        def entries() -> Iterator[TUEntry]:
+            for i in range(len(index)):
+                yield (index.tuvs(i), index.creation_date(i), index.change_date(i),
+                       index.key(i) if use_keys else None)
+
+        return source_lang, target_lang, entries()
+
+    def _analyze_tu(self, tu_number: int, tuvs: List[Tuple[str, Optional[str]]],
+                    creation_date: str, change_date: str,
+                    source_lang: str, target_lang: str,
+                    reasons: Optional[List[str]] = None) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Analyze one TU given its TUVs as (lang, seg text or None); reasons
+        are its auto-translatable reasons if already known.
+        Returns (missing/empty issue, None) or (None, tu_data).
+        """
+        def issue(issue_type: str, source_text: str, target_text: str) -> Dict:
+            return {
+                'tu_number': tu_number,
+                'issue_type': issue_type,
                 'source_text': source_text,
                 'target_text': target_text,
-                'auto_translatable_reasons': auto_translatable_reasons,
-                'creation_date': tu.get('creationdate', ''),
-                'change_date': tu.get('changedate', ''),
-                'is_auto_translatable': bool(auto_translatable_reasons)
+                'creation_date': creation_date,
+                'change_date': change_date
             }
+
+        if len(tuvs) < 2:
+            # Missing target TUV entirely
+            return issue('missing_target_tuv', '', ''), None
+        
+        # Get source and target TUVs (flexible order based on language detection)
+        source_tuv = None
+        target_tuv = None
+        
+        for tuv in tuvs:
+            lang = tuv[0].lower()
             
-            all_tus.append(tu_data)
-            
-            # Add to auto-translatable results if applicable
-            if auto_translatable_reasons:
-                auto_translatable_results.append(tu_data)
+            if lang == source_lang or (source_tuv is None and target_tuv is None):
+                source_tuv = tuv
+            elif lang == target_lang or target_tuv is None:
+                target_tuv = tuv
         
-        print(f"Analysis complete. Processed {tu_count} TUs total.")
-        print("Finding duplicate content...")
+        # Fallback: use first two TUVs if language detection failed
+        if source_tuv is None:
+            source_tuv = tuvs[0]
+        if target_tuv is None:
+            target_tuv = tuvs[1] if len(tuvs) > 1 else tuvs[0]
         
-        # Find exact duplicates (same source AND target) among non-auto-translatable TUs
-        duplicate_results = self.find_exact_duplicates(all_tus)
+        source_text = source_tuv[1]
+        target_text = target_tuv[1]
         
-        print(f"Found {len(auto_translatable_results)} auto-translatable TUs")
-        print(f"Found {len(duplicate_results)} exact duplicate TU pairs")
-        print(f"Found {len(missing_target_results)} missing/empty target issues")
+        # Check for missing segments
+        if source_text is None:
+            return issue('missing_source_seg', '', target_text or ''), None
+        if target_text is None:
+            return issue('missing_target_seg', source_text, ''), None
+        
+        # Check for empty content
+        if not source_text and not target_text:
+            return issue('both_empty', source_text, target_text), None
+        elif not source_text:
+            return issue('empty_source', source_text, target_text), None
+        elif not target_text:
+            return issue('empty_target', source_text, target_text), None
+        
+        # Get languages from TUVs
+        tuv_source_lang = source_tuv[0] or source_lang
+        tuv_target_lang = target_tuv[0] or target_lang
+        
+        # Classify source content and check for proper name matches;
+        # short segments repeat a lot, so their results are cached
+        if reasons is not None:
+            auto_translatable_reasons = list(reasons)
+        elif len(source_text) <= self.CACHE_MAX_CHARS:
+            auto_translatable_reasons = list(self._cached_reasons(source_text, target_text))
+        else:
+            auto_translatable_reasons = list(self._auto_reasons(source_text, target_text))
         
-        return auto_translatable_results, duplicate_results, missing_target_results, (source_lang, target_lang), len(all_tus)
+        # Store TU data
+        tu_data = {
+            'tu_number': tu_number,
+            'source_lang': tuv_source_lang,
+            'target_lang': tuv_target_lang,
+            'source_text': source_text,
+            'target_text': target_text,
+            'auto_translatable_reasons': auto_translatable_reasons,
+            'creation_date': creation_date,
+            'change_date': change_date,
+            'is_auto_translatable': bool(auto_translatable_reasons)
+        }
+        return None, tu_data
     
     def find_exact_duplicates(self, all_tus: List[Dict]) -> List[Dict]:
         """
         Find exact duplicate TUs (same source AND target) that are not auto-translatable
+        (parse_tmx() does the same grouping while it reads the TUs)
         """
-        # Group TUs by normalized source+target combination
-        pair_groups = defaultdict(list)
-        
+        duplicate_groups = DuplicateGroups()
         for tu in all_tus:
             if tu['is_auto_translatable']:
                 continue  # Skip auto-translatable TUs
-            
-            # Normalize both source and target text for comparison
-            normalized_source = ' '.join(tu['source_text'].lower().split())
-            normalized_target = ' '.join(tu['target_text'].lower().split())
-            pair_key = f"{normalized_source}|||{normalized_target}"
-            pair_groups[pair_key].append(tu)
-        
-        # Find groups with exact duplicates (MORE THAN 1 occurrence)
-        duplicate_groups = []
-        for pair_key, tus in pair_groups.items():
-            if len(tus) > 1:  # Only groups with actual duplicates
-                # Create duplicate group info
-                duplicate_info = {
-                    'source_text': tus[0]['source_text'],  # Use original casing
-                    'target_text': tus[0]['target_text'],  # Use original casing
-                    'occurrences': len(tus),
-                    'tu_numbers': [tu['tu_number'] for tu in tus],
-                    'creation_dates': [tu['creation_date'] for tu in tus],
-                    'change_dates': [tu['change_date'] for tu in tus]
-                }
-                
-                duplicate_groups.append(duplicate_info)
-        
-        # Sort by number of occurrences (descending)
-        duplicate_groups.sort(key=lambda x: x['occurrences'], reverse=True)
-        
-        return duplicate_groups
+            duplicate_groups.add(tu['tu_number'], tu['source_text'], tu['target_text'],
+                                 tu['creation_date'], tu['change_date'], tu.get('dedup_key'))
+        return duplicate_groups.results()
     
     def generate_report(self, auto_translatable_results: List[Dict], duplicate_results: List[Dict], 
                        missing_target_results: List[Dict], language_pair: Tuple[str, str], 
@@ -363,6 +865,17 @@ class TMXAnalyzer:
         """
         Generate a detailed report of auto-translatable content, duplicates, and missing targets
         """
+        return "".join(self.iter_report(auto_translatable_results, duplicate_results,
+                                        missing_target_results, language_pair,
+                                        total_valid_tus, tmx_file_path))
+
+    def iter_report(self, auto_translatable_results: List[Dict], duplicate_results: List[Dict],
+                    missing_target_results: List[Dict], language_pair: Tuple[str, str],
+                    total_valid_tus: int, tmx_file_path: str) -> Iterator[str]:
+        """
+        The report of generate_report(), a section at a time: the chunks
+        joined give the full text, and only one section is held at once.
+        """
         source_lang, target_lang = language_pair
         tmx_filename = Path(tmx_file_path).stem
         
@@ -452,6 +965,9 @@ class TMXAnalyzer:
         else:
             report_lines.append("No exact duplicate content found.")
         
+        yield "\n".join(report_lines)
+        report_lines = [""]  # each later chunk starts with the line break before it
+        
         # Detailed missing/empty targets findings
         if missing_target_results:
             report_lines.extend([
@@ -461,10 +977,12 @@ class TMXAnalyzer:
                 "-" * 65
             ])
             
-            # Pre-group by issue type (avoids repeated full-list scans)
+            # Pre-group the listed examples by issue type (avoids repeated full-list scans)
             missing_by_type = defaultdict(list)
             for r in missing_target_results:
-                missing_by_type[r['issue_type']].append(r)
+                examples = missing_by_type[r['issue_type']]
+                if len(examples) < 15:
+                    examples.append(r)
             
             issue_type_names = self.ISSUE_TYPE_NAMES
             
@@ -476,7 +994,7 @@ class TMXAnalyzer:
                 
                 issue_results = missing_by_type[issue_type]
                 
-                for i, result in enumerate(issue_results[:15], 1):  # Show first 15 examples
+                for i, result in enumerate(issue_results, 1):  # Show first 15 examples
                     report_lines.append(f"{i:2d}. TU #{result['tu_number']}")
                     if result['source_text']:
                         report_lines.append(f"    Source: \"{result['source_text']}\"")
@@ -489,8 +1007,11 @@ class TMXAnalyzer:
                         report_lines.append(f"    Target: [EMPTY/MISSING]")
                     report_lines.append("")
                 
-                if len(issue_results) > 15:
-                    report_lines.append(f"    ... and {len(issue_results) - 15:,} more TUs with this issue\n")
+                if count > 15:
+                    report_lines.append(f"    ... and {count - 15:,} more TUs with this issue\n")
+                
+                yield "\n".join(report_lines)
+                report_lines = [""]
         
         # Detailed auto-translatable findings
         if auto_translatable_results:
@@ -501,11 +1022,13 @@ class TMXAnalyzer:
                 "-" * 60
             ])
             
-            # Pre-group by category (avoids repeated full-list scans)
+            # Pre-group the listed examples by category (avoids repeated full-list scans)
             auto_by_category = defaultdict(list)
             for r in auto_translatable_results:
                 for cat in r['auto_translatable_reasons']:
-                    auto_by_category[cat].append(r)
+                    examples = auto_by_category[cat]
+                    if len(examples) < 10:
+                        examples.append(r)
             
             # Group results by category for detailed listing
             if category_counts:
@@ -516,7 +1039,7 @@ class TMXAnalyzer:
                     
                     category_results = auto_by_category[category]
                     
-                    for i, result in enumerate(category_results[:10], 1):  # Show first 10 examples
+                    for i, result in enumerate(category_results, 1):  # Show first 10 examples
                         report_lines.append(f"{i:2d}. TU #{result['tu_number']}")
                         report_lines.append(f"    Source: {result['source_text']}")
                         report_lines.append(f"    Target: {result['target_text']}")
@@ -525,8 +1048,11 @@ class TMXAnalyzer:
                             report_lines.append(f"    Also: {', '.join(other_reasons)}")
                         report_lines.append("")
                     
-                    if len(category_results) > 10:
-                        report_lines.append(f"    ... and {len(category_results) - 10:,} more TUs in this category\n")
+                    if count > 10:
+                        report_lines.append(f"    ... and {count - 10:,} more TUs in this category\n")
+                    
+                    yield "\n".join(report_lines)
+                    report_lines = [""]
         
         # Detailed exact duplicate findings
         if duplicate_results:
@@ -550,6 +1076,9 @@ class TMXAnalyzer:
             
             if len(duplicate_results) > 25:
                 report_lines.append(f"\n... and {len(duplicate_results) - 25:,} more exact duplicate pairs")
+            
+            yield "\n".join(report_lines)
+            report_lines = [""]
         
         # Add insights and space savings analysis
         if duplicate_results:
@@ -568,34 +1097,198 @@ class TMXAnalyzer:
                 "Recommendation: Import into Trados Studio for automatic deduplication."
             ])
         
-        return "\n".join(report_lines)
+        # Classification cache effectiveness (from the last parse_tmx run)
+        if self.cache_stats is not None:
+            hits, misses, uncached = self.cache_stats
+            lookups = hits + misses
+            hit_rate = (hits / lookups) * 100 if lookups else 0
+            report_lines.extend([
+                "",
+                "CLASSIFICATION CACHE:",
+                "-" * 25,
+                f"Cache hits: {hits:,}",
+                f"Cache misses: {misses:,}",
+                f"Hit rate: {hit_rate:.1f}%",
+                f"Long segments (not cached): {uncached:,}"
+            ])
+        
+        yield "\n".join(report_lines)
     
-    def save_report(self, report_text: str, tmx_file_path: str) -> str:
+    def save_report(self, report_text, tmx_file_path: str) -> str:
+        """
+        Save report to file in same directory as TMX with descriptive name.
+        report_text is the report string, or its chunks from iter_report(),
+        which are written as they are generated.
+        """
+        if isinstance(report_text, str):
+            report_text = (report_text,)
+        
+        f, report_path = self._open_output(tmx_file_path, 'report', '.txt', 'w')
+        with f:
+            for chunk in report_text:
+                f.write(chunk)
+        return report_path
+
+    def save_findings(self, auto_translatable_results: List[Dict], duplicate_results: List[Dict],
+                      missing_target_results: List[Dict], language_pair: Tuple[str, str],
+                      total_valid_tus: int, tmx_file_path: str, output_format: str) -> str:
         """
-        Save report to file in same directory as TMX with descriptive name
+        Save the findings in a machine-readable format next to the TMX:
+        'jsonl' (one JSON record per finding) or 'columnar' (see tmx_findings)
+        """
+        findings = (auto_translatable_results, duplicate_results, missing_target_results,
+                    language_pair, total_valid_tus, tmx_file_path)
+        if output_format == 'jsonl':
+            f, path = self._open_output(tmx_file_path, 'findings', '.jsonl', 'w')
+            with f:
+                write_jsonl(f, *findings)
+        elif output_format == 'columnar':
+            f, path = self._open_output(tmx_file_path, 'findings', '.bin', 'wb')
+            with f:
+                write_columnar(f, *findings, categories=self._reason_names())
+        else:
+            raise Exception(f"Unknown output format: {output_format}")
+        return path
+
+    @staticmethod
+    def _open_output(tmx_file_path: str, kind: str, extension: str, mode: str):
+        """
+        Open a new FILE_analysis_KIND_TIMESTAMP output file in the TMX's
+        directory. Returns (file, path).
         """
         tmx_path = Path(tmx_file_path)
-        tmx_directory = tmx_path.parent
-        tmx_filename = tmx_path.stem
         
-        # Create report filename
+        # Create output filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_filename = f"{tmx_filename}_analysis_report_{timestamp}.txt"
-        report_path = tmx_directory / report_filename
+        output_filename = f"{tmx_path.stem}_analysis_{kind}_{timestamp}{extension}"
+        output_path = tmx_path.parent / output_filename
+        encoding = None if 'b' in mode else 'utf-8'
         
         try:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(report_text)
-            return str(report_path)
+            f = open(output_path, mode, encoding=encoding)
         except Exception as e:
             # Fallback to current directory if TMX directory is not writable
-            fallback_path = Path.cwd() / report_filename
-            with open(fallback_path, 'w', encoding='utf-8') as f:
-                f.write(report_text)
-            return str(fallback_path)
+            # (checked before writing, as report chunks can only be read once)
+            output_path = Path.cwd() / output_filename
+            f = open(output_path, mode, encoding=encoding)
+        return f, str(output_path)
+
+
+def page_report(lines: Iterable[str], page_size: Optional[int] = None) -> None:
+    """
+    Print report lines a screen at a time, reading them as it goes.
+    Output that is not a terminal is printed without pausing.
+    """
+    if page_size is None:
+        if not sys.stdout.isatty():
+            page_size = 0
+        else:
+            page_size = max(1, shutil.get_terminal_size().lines - 1)
+    
+    for count, line in enumerate(lines, 1):
+        print(line.rstrip('\n'))
+        if page_size and count % page_size == 0:
+            try:
+                response = input("-- More -- (Enter: next page, q: quit) ").lower().strip()
+            except EOFError:
+                return
+            if response == 'q':
+                return
+
+
+# Byte order marks and the bytes of "<?" in encodings that are not
+# ASCII-compatible (UTF-32 first: its LE mark starts with UTF-16's)
+_WIDE_ENCODINGS = (
+    (b'\xff\xfe\x00\x00', 'utf-32-le'), (b'\x00\x00\xfe\xff', 'utf-32-be'),
+    (b'\xff\xfe', 'utf-16-le'), (b'\xfe\xff', 'utf-16-be'),
+    (b'<\x00\x00\x00', 'utf-32-le'), (b'\x00\x00\x00<', 'utf-32-be'),
+    (b'<\x00?\x00', 'utf-16-le'), (b'\x00<\x00?', 'utf-16-be'),
+)
+
+
+def _xml_encoding(tmx_file_path: str) -> str:
+    """
+    Encoding of the file: UTF-16/32 from a byte order mark or NUL-padded
+    "<?", otherwise the one named in the XML declaration (default UTF-8).
+    """
+    with open(tmx_file_path, 'rb') as f:
+        head = f.read(4096)
+    for prefix, encoding in _WIDE_ENCODINGS:
+        if head.startswith(prefix):
+            return encoding
+    match = re.search(r'encoding=["\']([^"\']+)["\']', head.decode('latin-1'))
+    return match.group(1).lower() if match else 'utf-8'
+
+
+def _byte_scannable(encoding: str) -> bool:
+    """True if <tu> boundaries can be found in the raw bytes (ASCII-compatible encoding)."""
+    return not encoding.replace('-', '').replace('_', '').startswith(('utf16', 'utf32', 'ucs'))
+
+
+def _tu_ranges(tmx_file_path: str, count: int) -> List[Tuple[int, int, int]]:
+    """
+    Cut the file's TUs into up to count runs of similar byte size:
+    (start offset, end offset, number of the run's first TU).
+    """
+    ranges = []
+    with open(tmx_file_path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return ranges  # empty file
+        with data:
+            step = max(1, len(data) // count)
+            next_cut = 0
+            number = 0
+            for start, end in iter_tu_spans(data):
+                number += 1
+                if start >= next_cut:
+                    ranges.append([start, end, number])
+                    next_cut = start + step
+                ranges[-1][1] = end
+    return [tuple(r) for r in ranges]
+
+
+_worker_analyzer: Optional[TMXAnalyzer] = None
+
+
+def _analyze_shard(task: Tuple) -> AnalysisParts:
+    """Worker: analyze the TUs of one byte range (see _parallel_analysis)."""
+    global _worker_analyzer
+    tmx_file_path, encoding, start, end, first_number, source_lang, target_lang = task
+    # One analyzer per process, so its classification cache carries over
+    # from one range to the next
+    if _worker_analyzer is None:
+        _worker_analyzer = TMXAnalyzer()
+    analyzer = _worker_analyzer
+    entries = analyzer._shard_entries(tmx_file_path, encoding, start, end)
+    return analyzer._analyze_entries(entries, source_lang, target_lang, first_number, progress=False)
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="TMX Auto-Translatable Content Analyzer")
+    parser.add_argument('file', nargs='?', default=None,
+                        help='TMX file to analyze (prompted for if omitted)')
+    parser.add_argument('--index', action='store_true',
+                        help='Read TUs from (or create) the FILE.tmx.idx sidecar index')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes analyzing the TUs (default: 1)')
+    parser.add_argument('--format', choices=('text', 'jsonl', 'columnar'), default='text',
+                        help='Output: text report (default), JSONL with one record per '
+                             'finding, or memory-mappable binary columns')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only analyze TUs changed since the last incremental run '
+                             '(state kept in FILE.tmx.state)')
+    args = parser.parse_args()
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.jobs > 1 and args.index:
+        parser.error("--jobs reads the XML and cannot be combined with --index.")
+    if args.incremental and (args.index or args.jobs > 1):
+        parser.error("--incremental cannot be combined with --index or --jobs.")
+
     print("=" * 60)
     print("TMX Auto-Translatable Content Analyzer")
     print("=" * 60)
@@ -607,8 +1300,8 @@ def main():
         analyzer = TMXAnalyzer()
         
         # Get TMX file path from command line or prompt
-        if len(sys.argv) > 1:
-            tmx_file_path = sys.argv[1]
+        if args.file:
+            tmx_file_path = args.file
         else:
             tmx_file_path = input("Enter path to TMX file: ").strip().strip('"').strip("'")
         
@@ -624,35 +1317,45 @@ def main():
         print("Starting analysis...")
         
         # Parse TMX and analyze content
-        results = analyzer.parse_tmx(tmx_file_path)
+        results = analyzer.parse_tmx(tmx_file_path, use_index=args.index, jobs=args.jobs,
+                                     incremental=args.incremental)
         auto_translatable_results, duplicate_results, missing_target_results, language_pair, total_valid_tus = results
         
-        # Generate report
-        print("Generating report...")
-        report = analyzer.generate_report(
-            auto_translatable_results, 
-            duplicate_results, 
-            missing_target_results, 
-            language_pair,
-            total_valid_tus,
-            tmx_file_path
-        )
-        
-        # Save report
-        report_path = analyzer.save_report(report, tmx_file_path)
+        if args.format != 'text':
+            # Machine-readable findings instead of the text report
+            print(f"Writing {args.format} findings...")
+            report_path = analyzer.save_findings(*results, tmx_file_path, args.format)
+        else:
+            # Generate report
+            print("Generating report...")
+            report = analyzer.iter_report(
+                auto_translatable_results, 
+                duplicate_results, 
+                missing_target_results, 
+                language_pair,
+                total_valid_tus,
+                tmx_file_path
+            )
+            
+            # Save report
+            report_path = analyzer.save_report(report, tmx_file_path)
         
         print(f"\n✅ Analysis complete!")
-        print(f"📄 Report saved to: {report_path}")
+        print(f"📄 {'Report' if args.format == 'text' else 'Findings'} saved to: {report_path}")
         print(f"\n📊 Summary:")
         print(f"   • Auto-translatable TUs: {len(auto_translatable_results):,}")
         print(f"   • Exact duplicate pairs: {len(duplicate_results):,}")
         print(f"   • Missing/empty targets: {len(missing_target_results):,}")
         
+        if args.format != 'text':
+            return
+        
         # Show report in console
         response = input("\nWould you like to display the report in the console? (y/n): ").lower().strip()
         if response == 'y' or response == 'yes':
             print("\n" + "=" * 80)
-            print(report)
+            with open(report_path, encoding='utf-8') as f:
+                page_report(f)
         
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
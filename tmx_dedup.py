@@ -0,0 +1,148 @@
+"""
+TMX Editor - Out-of-core exact duplicate removal
+
+Removes exact duplicates, with the same result as DedupStage, from files
+whose duplicate keys do not fit in memory:
+
+1. The TUs are streamed once and numbered. Every keyed TU becomes a
+   fixed-size record - key digest, TU number - appended to one of N
+   partition files picked by the digest, so equal keys always share a
+   partition and every partition is in file order.
+2. Each partition is read back on its own against a set of the digests
+   seen so far; a record whose digest was already seen is a later copy
+   and its number is marked in a one-bit-per-TU drop map. A partition
+   holding more keys than mem_limit allows is split again on other
+   digest bytes first.
+3. The file is streamed again through the normal pipeline, where
+   PartitionedDedupStage drops the marked TUs - the first occurrence is
+   kept and the output order is unchanged.
+
+Memory use is one partition's digest set (bounded by mem_limit) and
+the drop map.
+
+Uses only Python standard library.
+"""
+
+import math
+import os
+import tempfile
+from typing import Dict, Iterator, Tuple
+
+from tmx_editor import TMXEditor, DedupStage, TURecord
+from tmx_keys import digest
+
+
+RECORD_SIZE = 24       # key digest (16) + TU number (8, big-endian)
+KEY_COST = 96          # approximate bytes per digest held in a set
+MIN_TU_BYTES = 128     # smallest plausible <tu>, to size the partitions from the file size
+MAX_PARTITIONS = 256   # partition files open at once
+MAX_DEPTH = 4          # digest bytes 0-15 pick the partition, 4 at a time
+READ_BLOCK = 1 << 16   # bytes read per partition at a time
+
+
+class PartitionedDedupStage(DedupStage):
+    """
+    DedupStage that drops the TUs marked by find_duplicates().
+    TUs are matched by position, so it must be the first stage of the
+    pipeline and see every TU of the file - exactly tu_count of them.
+    """
+
+    first_only = True
+
+    def __init__(self, drop: bytearray, tu_count: int):
+        super().__init__()
+        self.drop = drop
+        self.tu_count = tu_count
+
+    @classmethod
+    def prepare(cls, editor: TMXEditor, mem_limit: int,
+                temp_dir: str = None) -> 'PartitionedDedupStage':
+        return cls(*find_duplicates(editor, mem_limit, temp_dir))
+
+    def process(self, record: TURecord) -> bool:
+        number = self.total_before
+        if number >= self.tu_count:
+            raise Exception(f"Duplicate map covers {self.tu_count:,} TUs, but the file has more "
+                            f"(was it changed since the duplicates were found?)")
+        self.total_before += 1
+        if self.drop[number >> 3] & (1 << (number & 7)):
+            return self._drop(record)
+        return True
+
+    def result(self) -> Dict:
+        if self.total_before != self.tu_count:
+            raise Exception(f"Duplicate map covers {self.tu_count:,} TUs, but only "
+                            f"{self.total_before:,} were seen")
+        return super().result()
+
+
+def find_duplicates(editor: TMXEditor, mem_limit: int,
+                    temp_dir: str = None) -> Tuple[bytearray, int]:
+    """
+    Bit map over the editor's TUs in file order, where a set bit marks a
+    TU whose key already occurred earlier in the file, and the TU count.
+    """
+    max_keys = max(1024, mem_limit // KEY_COST)
+    size = os.path.getsize(editor.file_path)
+    partitions = min(MAX_PARTITIONS, max(1, math.ceil(size / MIN_TU_BYTES / max_keys)))
+
+    with tempfile.TemporaryDirectory(prefix='tmx_dedup_', dir=temp_dir) as tmp:
+        paths = [os.path.join(tmp, f"part{i:04d}") for i in range(partitions)]
+        files = [open(path, 'wb') for path in paths]
+        number = 0
+        try:
+            for tu in editor.iter_tus():
+                record = editor.get_record(tu)
+                if record.key is not None:
+                    key_digest = digest(record.key)
+                    part = int.from_bytes(key_digest[:4], 'big') % partitions
+                    files[part].write(key_digest + number.to_bytes(8, 'big'))
+                number += 1
+        finally:
+            for f in files:
+                f.close()
+
+        drop = bytearray((number + 7) >> 3)
+        for path in paths:
+            _dedup_partition(path, drop, max_keys, 1)
+    return drop, number
+
+
+def _dedup_partition(path: str, drop: bytearray, max_keys: int, depth: int) -> None:
+    count = os.path.getsize(path) // RECORD_SIZE
+    if count > max_keys and depth < MAX_DEPTH:
+        # Too many keys for one set: split on the next 4 digest bytes
+        fan_out = min(MAX_PARTITIONS, math.ceil(count / max_keys))
+        offset = 4 * depth
+        sub_paths = [f"{path}.{i}" for i in range(fan_out)]
+        files = [open(sub, 'wb') for sub in sub_paths]
+        try:
+            for record in _read_records(path):
+                files[int.from_bytes(record[offset:offset + 4], 'big') % fan_out].write(record)
+        finally:
+            for f in files:
+                f.close()
+        os.remove(path)
+        for sub in sub_paths:
+            _dedup_partition(sub, drop, max_keys, depth + 1)
+        return
+
+    seen = set()
+    for record in _read_records(path):
+        key_digest = record[:16]
+        if key_digest in seen:
+            number = int.from_bytes(record[16:], 'big')
+            drop[number >> 3] |= 1 << (number & 7)
+        else:
+            seen.add(key_digest)
+    os.remove(path)
+
+
+def _read_records(path: str) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(READ_BLOCK // RECORD_SIZE * RECORD_SIZE)
+            if not block:
+                break
+            for k in range(0, len(block), RECORD_SIZE):
+                yield block[k:k + RECORD_SIZE]
@@ -31,26 +31,400 @@ import xml.etree.ElementTree as ET
 import re
 import os
 import csv
+import contextlib
 import copy
 import io
 import sys
 import argparse
 import glob as globmod
+import itertools
 from datetime import datetime
-from collections import defaultdict
-from difflib import SequenceMatcher
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from typing import Optional, Tuple, List, Dict, Iterable, Iterator, Callable, Union
+
+from tmx_fuzzy import MinHashLSH, iter_fuzzy_matches, parallel_fuzzy_matches
+from tmx_index import TMXIndex, OffsetTreeParser, tuv_lang
+from tmx_keys import KeyTable, make_key, normalize, digest
+
+
+class TMXWriter:
+    """
+    Incremental TMX serializer.
+
+    Writes the XML declaration, DOCTYPE and everything up to and including
+    the opening <body> tag when created, then one <tu> per write_tu() call,
+    and the closing tags on close(). The output is byte-for-byte what
+    ElementTree.write() produces for the equivalent tree.
+
+    The skeleton is a copy of the document with an empty <body>; text and
+    tail whitespace of the skeleton elements is preserved as-is.
+    """
+
+    _BODY_MARK = 'tmx-writer-body'
+
+    def __init__(self, output_path: str, skeleton: ET.Element, body: ET.Element,
+                 encoding: str = 'utf-8', doctype: Optional[str] = None):
+        ET.register_namespace('xml', 'http://www.w3.org/XML/1998/namespace')
+        self.output_path = output_path
+        self.skeleton = skeleton
+        self.body = body
+        self.tu_count = 0
+
+        self._file = open(output_path, 'w', encoding=encoding,
+                          errors='xmlcharrefreplace', newline='\n')
+        self._file.write(f"<?xml version='1.0' encoding='{encoding}'?>")
+        if doctype:
+            self._file.write('\n' + doctype)
+        self._file.write('\n')
+        self._file.write(self._split_skeleton()[0])
+
+    def _split_skeleton(self) -> Tuple[str, str]:
+        """Serialize the skeleton and split it where the TUs belong."""
+        mark = ET.Comment(self._BODY_MARK)
+        self.body.append(mark)
+        try:
+            text = ET.tostring(self.skeleton, encoding='unicode',
+                               short_empty_elements=False)
+        finally:
+            self.body.remove(mark)
+        head, tail = text.split(f'<!--{self._BODY_MARK}-->', 1)
+        return head, tail
+
+    def write_tu(self, tu: ET.Element) -> None:
+        """Serialize one <tu> element (including its tail whitespace)."""
+        self._file.write(ET.tostring(tu, encoding='unicode',
+                                     short_empty_elements=False))
+        self.tu_count += 1
+
+    def close(self) -> None:
+        """Write the closing tags and close the file."""
+        if self._file.closed:
+            return
+        self._file.write(self._split_skeleton()[1])
+        self._file.close()
+
+    def abort(self) -> None:
+        """Close and delete a partially written output file."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.output_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+# ══════════════════════════════════════════════════
+# Single-pass TU pipeline
+# ══════════════════════════════════════════════════
+
+class TURecord:
+    """Extracted text and metadata for one <tu> element."""
+    __slots__ = ('tu', 'source', 'target', 'key', 'creation_date', 'change_date',
+                 'tagged_segments', 'modified')
+
+    def __init__(self, tu: ET.Element, source: Optional[str], target: Optional[str],
+                 key: Optional[str] = None, creation_date: str = '',
+                 change_date: str = '', tagged_segments: int = 0):
+        self.tu = tu
+        self.source = source  # None if the TU structure is invalid
+        self.target = target
+        self.key = key  # normalized "source|||target", None if invalid
+        self.creation_date = creation_date
+        self.change_date = change_date
+        self.tagged_segments = tagged_segments  # <seg>s containing inline tags
+        self.modified = False  # set by stages that rewrite the TU
+
+    @property
+    def has_tags(self) -> bool:
+        return self.tagged_segments > 0
+
+    make_key = staticmethod(make_key)  # duplicate key, see tmx_keys
+
+
+class TUChanges:
+    """
+    Which TUs an editing operation removed, changed or added, so views
+    of the body can be updated without rescanning it.
+
+    removed: positions (among the body's <tu>s) before the operation.
+    changed, added: (position, tu) after the operation; added TUs are
+    always at the end of the body.
+    """
+    __slots__ = ('removed', 'changed', 'added')
+
+    def __init__(self):
+        self.removed: List[int] = []
+        self.changed: List[Tuple[int, ET.Element]] = []
+        self.added: List[Tuple[int, ET.Element]] = []
+
+
+class MergeIndex:
+    """
+    Lookup of the body's TUs for merge_from(), kept between merges so
+    that merging many files does not rescan the growing body each time.
+
+    Texts are held as 16-byte BLAKE2b digests: pair_counts counts the
+    TUs per "source|||target" key, sources maps a normalized source to
+    the last TU in the body that has it.
+    """
+    __slots__ = ('pair_counts', 'sources', 'tu_count')
+
+    def __init__(self):
+        self.pair_counts: Dict[bytes, int] = {}
+        self.sources: Dict[bytes, ET.Element] = {}
+        self.tu_count = 0  # all <tu>s in the body, keyed or not
+
+    @staticmethod
+    def digests(record: TURecord) -> Tuple[bytes, bytes]:
+        """(pair digest, source digest) of a record that has a key."""
+        return digest(record.key), digest(normalize(record.source))
+
+    def add(self, tu: ET.Element, pair: bytes, source: bytes) -> None:
+        self.pair_counts[pair] = self.pair_counts.get(pair, 0) + 1
+        self.sources[source] = tu
+
+    def discard(self, pair: bytes) -> None:
+        """Forget one TU with this pair (its source is re-pointed by the caller)."""
+        count = self.pair_counts[pair] - 1
+        if count:
+            self.pair_counts[pair] = count
+        else:
+            del self.pair_counts[pair]
+
+
+def _serialize_tu(tu: ET.Element) -> bytes:
+    """A <tu> and its tail as UTF-8, for passing between processes."""
+    # tostring() writes a literal CR in text as is, and a parser would
+    # read it back as LF; a character reference keeps it
+    return ET.tostring(tu, encoding='utf-8').replace(b'\r', b'&#13;')
+
+
+def _parse_tus(tus: List[Union[ET.Element, bytes]]) -> List[ET.Element]:
+    """Elements for a list of TUs, parsing the serialized ones in one go."""
+    chunks = [tu for tu in tus if isinstance(tu, bytes)]
+    if not chunks:
+        return tus
+    parsed = iter(ET.fromstring(b'<tus>' + b''.join(chunks) + b'</tus>'))
+    return [next(parsed) if isinstance(tu, bytes) else tu for tu in tus]
+
+
+class PipelineStage:
+    """
+    One step of a TUPipeline: a filter or transform over TU records.
+    process() sees every record that survived the earlier stages and
+    returns False to drop it from the stream.
+    """
+
+    # Stages that must see every TU of the input (e.g. to match TUs by
+    # position) set this; TUPipeline only accepts them as its first stage
+    first_only = False
+
+    def process(self, record: TURecord) -> bool:
+        return True
+
+    def result(self) -> Dict:
+        return {}
+
+    @property
+    def modified(self) -> bool:
+        return False
+
+
+def _record_key(record: TURecord) -> str:
+    return record.key
+
+
+class DedupStage(PipelineStage):
+    """
+    Drop exact duplicate TUs, keeping only the first occurrence.
+    Comparison: normalized(source) + normalized(target), case-insensitive.
+
+    Keys are held as digests. With verify, each first occurrence's record
+    is kept so digest matches are checked against its key; use it when
+    the records are in memory anyway (tree mode).
+    """
+
+    def __init__(self, verify: bool = False):
+        self.verify = verify
+        self.seen_keys = KeyTable(_record_key if verify else None)
+        self.total_before = 0
+        self.removed = 0
+        self.examples = []
+
+    def process(self, record: TURecord) -> bool:
+        self.total_before += 1
+        key = record.key
+        if key is None:
+            return True
+
+        if not self.seen_keys.add(key, record if self.verify else None):
+            return self._drop(record)
+        return True
+
+    def _drop(self, record: TURecord) -> bool:
+        """Count a duplicate (keeping the first few as examples) and drop it."""
+        self.removed += 1
+        if len(self.examples) < 10:
+            self.examples.append({
+                'source': record.source[:80],
+                'target': record.target[:80]
+            })
+        return False
+
+    def result(self) -> Dict:
+        return {
+            'removed_count': self.removed,
+            'unique_count': self.total_before - self.removed,
+            'total_before': self.total_before,
+            'examples': self.examples
+        }
+
+    @property
+    def modified(self) -> bool:
+        return self.removed > 0
+
+
+class EmptyStage(PipelineStage):
+    """Drop TUs where source or target is empty/missing."""
+
+    def __init__(self):
+        self.total_before = 0
+        self.by_type = defaultdict(int)
+
+    def process(self, record: TURecord) -> bool:
+        self.total_before += 1
+
+        # _get_tu_texts only returns None for TUs with fewer than two TUVs
+        if record.source is None:
+            self.by_type['missing_tuv'] += 1
+            return False
+
+        if not record.source and not record.target:
+            self.by_type['both_empty'] += 1
+        elif not record.source:
+            self.by_type['empty_source'] += 1
+        elif not record.target:
+            self.by_type['empty_target'] += 1
+        else:
+            return True
+        return False
+
+    def result(self) -> Dict:
+        removed = sum(self.by_type.values())
+        return {
+            'removed_count': removed,
+            'remaining_count': self.total_before - removed,
+            'total_before': self.total_before,
+            'by_type': dict(self.by_type)
+        }
+
+    @property
+    def modified(self) -> bool:
+        return bool(self.by_type)
+
+
+class StripTagsStage(PipelineStage):
+    """Remove inline formatting tags from every <seg>, keeping the text."""
+
+    def __init__(self):
+        self.segments_modified = 0
+        self.tags_removed = 0
+
+    def process(self, record: TURecord) -> bool:
+        if not record.has_tags:
+            return True
+        for seg in record.tu.iter('seg'):
+            tag_count = self.strip_seg(seg)
+            if tag_count:
+                self.segments_modified += 1
+                self.tags_removed += tag_count
+        # Plain text is unchanged, so the record's source/target stay valid
+        record.tagged_segments = 0
+        record.modified = True
+        return True
+
+    @staticmethod
+    def strip_seg(seg: ET.Element) -> int:
+        """Flatten one <seg> to plain text. Returns the number of tags removed."""
+        children = list(seg)
+        if not children:
+            return 0
+
+        # Collect full text content (including text inside tags)
+        full_text = ''.join(seg.itertext())
+
+        # Count tags being removed
+        tag_count = sum(1 for _ in seg.iter() if _ is not seg)
+
+        # Preserve seg's own attributes
+        attribs = dict(seg.attrib)
+
+        # Clear and rebuild with plain text
+        seg.clear()
+        seg.attrib.update(attribs)
+        seg.text = full_text
+
+        return tag_count
+
+    def result(self) -> Dict:
+        return {
+            'segments_modified': self.segments_modified,
+            'tags_removed': self.tags_removed
+        }
+
+    @property
+    def modified(self) -> bool:
+        return self.segments_modified > 0
+
+
+class TUPipeline:
+    """Chains stages so that a single pass over the TU stream applies all of them."""
+
+    def __init__(self, stages: List[PipelineStage]):
+        self.stages = list(stages)
+        for stage in self.stages[1:]:
+            if stage.first_only:
+                raise Exception(f"{type(stage).__name__} must be the first stage of a pipeline")
+
+    def accept(self, record: TURecord) -> bool:
+        """Run record through every stage; False if any stage dropped it."""
+        for stage in self.stages:
+            if not stage.process(record):
+                return False
+        return True
+
+    def results(self) -> List[Dict]:
+        return [stage.result() for stage in self.stages]
+
+    @property
+    def modified(self) -> bool:
+        return any(stage.modified for stage in self.stages)
 
 
 class TMXEditor:
     """
     Parses, analyzes, edits, and writes TMX files.
-    Retains the full ElementTree for in-place modification.
+    Retains the full ElementTree for in-place modification, or, in
+    streaming mode, reads the body one <tu> at a time with iterparse.
     """
 
     INLINE_TAGS = {'bpt', 'ept', 'it', 'ph', 'hi', 'ut', 'sub'}
 
+    # Above this many unique sources, fuzzy search uses MinHash/LSH candidates
+    FUZZY_LSH_MIN_SEGMENTS = 5000
+
     def __init__(self):
         self.tree: Optional[ET.ElementTree] = None
         self.root: Optional[ET.Element] = None
@@ -59,17 +433,232 @@ class TMXEditor:
         self.target_lang: str = ""
         self.encoding: str = "utf-8"
         self.original_doctype: Optional[str] = None
+        self.streaming: bool = False
+        self._records: Dict[ET.Element, TURecord] = {}
+        self.last_changes: Optional[TUChanges] = None  # tree mode only
+        self.index: Optional[TMXIndex] = None  # sidecar index, if used
+        self._merge_index: Optional[MergeIndex] = None  # built by merge_from
+        self._skeleton: Optional[ET.Element] = None
+        self._skeleton_body: Optional[ET.Element] = None
 
     # ──────────────────────────────────────────────
     # Loading and parsing
     # ──────────────────────────────────────────────
 
-    def load(self, file_path: str) -> None:
-        """Load a TMX file, preserving encoding and DOCTYPE."""
+    def load(self, file_path: str, streaming: bool = False, use_index: bool = False) -> None:
+        """
+        Load a TMX file, preserving encoding and DOCTYPE.
+
+        With streaming=True only the header and the first TUs are read;
+        the body is consumed later through iter_tus(), one <tu> at a time,
+        so memory use does not grow with the file size.
+
+        With use_index=True (tree mode) TU records come from the sidecar
+        index instead of being extracted from the XML; a missing or stale
+        index is rebuilt while parsing.
+        """
+        index = None
+        if use_index and not streaming:
+            index = TMXIndex.load(file_path)
+            if index is None:
+                # No valid sidecar yet: build one while parsing
+                for _ in self.load_incremental(file_path, use_index=True):
+                    pass
+                print(f"Loaded: {Path(file_path).name} (index built)")
+                print(f"  TUs: {len(self._records):,}")
+                print(f"  Languages: {self.source_lang} -> {self.target_lang}")
+                return
+
+        self._begin_load(file_path, streaming)
+
+        if streaming:
+            self.tree = None
+            self.root = None
+            header, sample_tuvs = self._scan_head()
+            self.source_lang, self.target_lang = self._detect_language_pair(header, sample_tuvs)
+            print(f"Loaded: {Path(file_path).name} (streaming)")
+            print(f"  Languages: {self.source_lang} -> {self.target_lang}")
+            return
+
+        # Parse the tree
+        try:
+            self.tree = ET.parse(file_path)
+            self.root = self.tree.getroot()
+        except ET.ParseError as e:
+            raise Exception(f"Error parsing TMX file: {e}")
+
+        if index is not None:
+            # Records come from the index; only the elements are new
+            self.index = index
+            self.source_lang, self.target_lang = index.source_lang, index.target_lang
+            picks = {}
+            for i, tu in enumerate(self.root.iter('tu')):
+                record = self._record_from_index(index, i, picks)
+                record.tu = tu
+                self._records[tu] = record
+        else:
+            # Detect language pair
+            self.source_lang, self.target_lang = self._detect_language_pair()
+
+        tu_count = len(self.root.findall('.//tu'))
+        print(f"Loaded: {Path(file_path).name}")
+        print(f"  TUs: {tu_count:,}")
+        print(f"  Languages: {self.source_lang} -> {self.target_lang}")
+
+    # TUVs sampled for language detection (about 20 TUs)
+    LANG_SAMPLE_TUVS = 40
+
+    def load_incremental(self, file_path: str, use_index: bool = False,
+                         on_index: Optional[Callable[[List[TURecord]], None]] = None
+                         ) -> Iterator[Tuple[ET.Element, float]]:
+        """
+        Load a TMX file into a tree like load(), yielding each <tu> as
+        soon as it has been parsed together with the fraction of the
+        file read so far. The tree is only set once the generator is
+        exhausted; the language pair is set before the first TU is
+        yielded.
+
+        With use_index=True a valid sidecar index supplies every TU's
+        record up front - passed to on_index(records) before parsing
+        starts - and the parsed elements are bound to those records.
+        Without a valid index one is built during the parse and saved.
+        """
+        self._begin_load(file_path, False)
+        self.tree = None
+        self.root = None
+        size = os.path.getsize(file_path) or 1
+
+        records = None
+        if use_index:
+            index = TMXIndex.load(file_path)
+            if index is not None:
+                self.index = index
+                self.source_lang, self.target_lang = index.source_lang, index.target_lang
+                picks = {}
+                records = [self._record_from_index(index, i, picks) for i in range(len(index))]
+                if on_index is not None:
+                    on_index(records)
+
+        building = use_index and records is None
+        if building:
+            parser = OffsetTreeParser(file_path)
+            new_index = TMXIndex()
+        else:
+            parser = None
+
+        header = None
+
+        def parsed_tus() -> Iterator[Tuple[ET.Element, int, int, float]]:
+            # (tu, start, end, progress); offsets only when building an index
+            nonlocal header
+            if parser is not None:
+                for tu, start, end in parser:
+                    header = parser.header
+                    yield tu, start, end, parser.bytes_read / size
+                self.root = parser.root
+                return
+            root = None
+            with open(file_path, 'rb') as f:
+                for _event, elem in ET.iterparse(f):
+                    if elem.tag == 'tu':
+                        yield elem, 0, 0, f.tell() / size
+                    elif elem.tag == 'header' and header is None:
+                        header = elem
+                    root = elem  # the last element to end is the root
+            self.root = root
+
+        # TUs are held back until enough TUVs are seen to detect the languages
+        pending = []
+        sample = []
+        detected = records is not None
+
+        def emit(tu, start, end, position):
+            if records is not None:
+                record = records[position]
+                record.tu = tu
+                self._records[tu] = record
+            elif building:
+                record = self.get_record(tu)
+                new_index.add(tu, start, end, record.key, record.tagged_segments)
+
+        try:
+            position = 0
+            for tu, start, end, progress in parsed_tus():
+                if not detected:
+                    pending.append((tu, start, end))
+                    sample.extend(tu.findall('tuv'))
+                    if len(sample) < self.LANG_SAMPLE_TUVS:
+                        continue
+                    self.source_lang, self.target_lang = self._detect_language_pair(header, sample)
+                    detected = True
+                    for item in pending:
+                        emit(*item, position)
+                        position += 1
+                        yield item[0], progress
+                    pending = []
+                    continue
+                emit(tu, start, end, position)
+                position += 1
+                yield tu, min(progress, 1.0)
+        except ET.ParseError as e:
+            raise Exception(f"Error parsing TMX file: {e}")
+
+        self.tree = ET.ElementTree(self.root)
+        if not detected:
+            # Fewer TUVs than the sample size: detect from what there is
+            self.source_lang, self.target_lang = self._detect_language_pair()
+            for item in pending:
+                emit(*item, position)
+                position += 1
+                yield item[0], 1.0
+
+        if building:
+            header = self.root.find('.//header')  # also when it follows the body
+            new_index.source_lang, new_index.target_lang = self.source_lang, self.target_lang
+            new_index.header_srclang = header.get('srclang', '') if header is not None else ''
+            self.index = new_index
+            try:
+                new_index.save(file_path, parser.digest)
+            except OSError:
+                pass  # read-only location: keep the index in memory only
+
+    def _record_from_index(self, index: TMXIndex, i: int,
+                           picks: Optional[Dict[Tuple[str, ...], Optional[Tuple[int, int]]]] = None
+                           ) -> TURecord:
+        """
+        TURecord for TU i of a sidecar index (not yet bound to an element).
+        picks memoizes _pick_tuvs() per TUV language layout across calls.
+        """
+        first, stop = index.tuv_first[i], index.tuv_first[i + 1]
+        strings = index.tuv_strings
+        langs = tuple(strings[2 * first:2 * stop:2])
+        if picks is None:
+            picks = {}
+        if langs not in picks:
+            picks[langs] = self._pick_tuvs([lang.lower() for lang in langs])
+        picked = picks[langs]
+
+        if picked is None:
+            source_text = target_text = None
+        else:
+            s, t = first + picked[0], first + picked[1]
+            has_seg = index.HAS_SEG
+            source_text = strings[2 * s + 1] if index.tuv_flags[s] & has_seg else ""
+            target_text = strings[2 * t + 1] if index.tuv_flags[t] & has_seg else ""
+        return TURecord(None, source_text, target_text, index.key(i),
+                        index.creation_date(i), index.change_date(i), index.tagged[i])
+
+    def _begin_load(self, file_path: str, streaming: bool) -> None:
+        """Reset per-file state and read encoding and DOCTYPE from the prolog."""
         if not os.path.isfile(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
         self.file_path = file_path
+        self.streaming = streaming
+        self._records = {}
+        self.last_changes = None
+        self.index = None
+        self._merge_index = None
 
         # Read raw header to capture encoding and DOCTYPE
         with open(file_path, 'rb') as f:
@@ -93,30 +682,20 @@ class TMXEditor:
         # Register namespace so xml:lang serializes correctly
         ET.register_namespace('xml', 'http://www.w3.org/XML/1998/namespace')
 
-        # Parse the tree
-        try:
-            self.tree = ET.parse(file_path)
-            self.root = self.tree.getroot()
-        except ET.ParseError as e:
-            raise Exception(f"Error parsing TMX file: {e}")
-
-        # Detect language pair
-        self.source_lang, self.target_lang = self._detect_language_pair()
-
-        tu_count = len(self.root.findall('.//tu'))
-        print(f"Loaded: {Path(file_path).name}")
-        print(f"  TUs: {tu_count:,}")
-        print(f"  Languages: {self.source_lang} -> {self.target_lang}")
-
-    def _detect_language_pair(self) -> Tuple[str, str]:
-        """Detect source and target languages from TMX header and TUVs."""
+    def _detect_language_pair(self, header: Optional[ET.Element] = None,
+                              tuvs: Optional[List[ET.Element]] = None) -> Tuple[str, str]:
+        """
+        Detect source and target languages from TMX header and TUVs.
+        Uses the loaded tree unless a header and TUV sample are given.
+        """
         header_src_lang = None
-        header = self.root.find('.//header')
+        if tuvs is None:
+            header = self.root.find('.//header')
+            tuvs = self.root.findall('.//tuv')
         if header is not None:
             header_src_lang = header.get('srclang', '').lower() or None
 
         # Collect languages from TUVs (sample first 20 TUs)
-        tuvs = self.root.findall('.//tuv')
         languages = set()
         for tuv in tuvs[:40]:  # 40 TUVs ~ 20 TUs
             lang = (tuv.get('{http://www.w3.org/XML/1998/namespace}lang') or
@@ -139,8 +718,144 @@ class TMXEditor:
 
         return source_lang, target_lang
 
+    def _scan_head(self) -> Tuple[Optional[ET.Element], List[ET.Element]]:
+        """
+        Streaming mode: read the document up to the first 20 TUs.
+        Builds the skeleton used by TMXWriter and returns
+        (header, sample_tuvs) for language detection.
+        """
+        root = None
+        body = None
+        sample_tuvs = []
+        sampled_tus = 0
+
+        with open(self.file_path, 'rb') as f:
+            try:
+                for event, elem in ET.iterparse(f, events=('start', 'end')):
+                    if event == 'start':
+                        if root is None:
+                            root = elem
+                        elif elem.tag == 'body' and body is None:
+                            body = elem
+                    elif elem.tag == 'tu' and body is not None:
+                        sample_tuvs.extend(copy.deepcopy(tuv) for tuv in elem.findall('tuv'))
+                        sampled_tus += 1
+                        if sampled_tus >= 20:
+                            break
+            except ET.ParseError as e:
+                raise Exception(f"Error parsing TMX file: {e}")
+
+        if body is None:
+            raise Exception("No <body> element found in TMX file")
+
+        self._skeleton = self._make_skeleton(root, body)
+        self._skeleton_body = self._skeleton.find('.//body')
+        return self._skeleton.find('.//header'), sample_tuvs
+
+    @staticmethod
+    def _make_skeleton(elem: ET.Element, body: ET.Element) -> ET.Element:
+        """Copy elem and its descendants, leaving out the children of body."""
+        shell = elem.makeelement(elem.tag, dict(elem.attrib))
+        shell.text = elem.text
+        shell.tail = elem.tail
+        if elem is not body:
+            for child in elem:
+                shell.append(TMXEditor._make_skeleton(child, body))
+        return shell
+
+    def _require_tree(self) -> None:
+        """Raise if the file was loaded in streaming mode (no tree in memory)."""
+        if self.streaming:
+            raise Exception("This operation needs the full tree; "
+                            "the file was loaded in streaming mode")
+
+    def iter_tus(self) -> Iterator[ET.Element]:
+        """
+        Yield every <tu> element in document order.
+
+        In streaming mode the file is re-read with iterparse and each <tu>
+        is cleared and dropped as soon as the consumer asks for the next one,
+        so callers must finish with an element before advancing.
+        """
+        if not self.streaming:
+            yield from self._get_body().findall('tu')
+            return
+
+        with open(self.file_path, 'rb') as f:
+            body = None
+            pending = None  # last completed TU, held until its tail is known
+
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == 'body' and body is None:
+                        body = elem
+                    elif elem.tag == 'tu' and pending is not None:
+                        yield pending
+                        pending.clear()
+                        body.remove(pending)
+                        pending = None
+                elif elem.tag == 'tu' and body is not None:
+                    pending = elem
+                elif elem is body:
+                    if pending is not None:
+                        yield pending
+                        pending.clear()
+                        body.remove(pending)
+                        pending = None
+
+            if body is not None and self._skeleton_body is not None:
+                self._skeleton_body.tail = body.tail
+
+    def open_writer(self, output_path: str) -> TMXWriter:
+        """Open a TMXWriter with this file's header, encoding and DOCTYPE."""
+        if self.streaming:
+            skeleton, body = self._skeleton, self._skeleton_body
+        else:
+            body = self._get_body()
+            skeleton = self._make_skeleton(self.root, body)
+            body = skeleton.find('.//body')
+        return TMXWriter(output_path, skeleton, body,
+                         encoding=self.encoding, doctype=self.original_doctype)
+
+    def _sweep_tus(self, keep: Callable[[ET.Element], bool],
+                   output_path: Optional[str] = None) -> int:
+        """
+        Run keep(tu) over every TU and drop the ones it rejects.
+        Tree mode removes them from the body (recording their positions
+        in last_changes); streaming mode writes the kept TUs to
+        output_path as they are read.
+        Returns the number of TUs seen.
+        """
+        total = 0
+
+        if not self.streaming:
+            body = self._get_body()
+            changes = self.last_changes = TUChanges()
+            self._merge_index = None
+            to_remove = []
+            for pos, tu in enumerate(body.findall('tu')):
+                total += 1
+                if not keep(tu):
+                    to_remove.append(tu)
+                    changes.removed.append(pos)
+            for tu in to_remove:
+                body.remove(tu)
+            self._forget_records(to_remove)
+            return total
+
+        if not output_path:
+            raise Exception("An output path is required in streaming mode")
+
+        with self.open_writer(output_path) as writer:
+            for tu in self.iter_tus():
+                total += 1
+                if keep(tu):
+                    writer.write_tu(tu)
+        return total
+
     def _get_body(self) -> ET.Element:
         """Get the <body> element from the TMX tree."""
+        self._require_tree()
         body = self.root.find('body')
         if body is None:
             body = self.root.find('.//body')
@@ -160,34 +875,107 @@ class TMXEditor:
         Returns (None, None) if the TU structure is invalid.
         """
         tuvs = tu.findall('tuv')
-        if len(tuvs) < 2:
+        picked = self._pick_tuvs([tuv_lang(tuv).lower() for tuv in tuvs])
+        if picked is None:
             return None, None
 
-        source_tuv = None
-        target_tuv = None
+        source_seg = tuvs[picked[0]].find('seg')
+        target_seg = tuvs[picked[1]].find('seg')
+
+        source_text = self._get_seg_text(source_seg)
+        target_text = self._get_seg_text(target_seg)
+
+        return source_text, target_text
 
-        for tuv in tuvs:
-            tuv_lang = (tuv.get('{http://www.w3.org/XML/1998/namespace}lang') or
-                        tuv.get('xml:lang') or
-                        tuv.get('lang') or '').lower()
+    def _pick_tuvs(self, langs: List[str]) -> Optional[Tuple[int, int]]:
+        """
+        Indexes of the source and target TUV given each TUV's (lowercased)
+        language, or None if the TU has fewer than two TUVs.
+        """
+        if len(langs) < 2:
+            return None
 
-            if tuv_lang == self.source_lang or (source_tuv is None and target_tuv is None):
-                source_tuv = tuv
-            elif tuv_lang == self.target_lang or target_tuv is None:
-                target_tuv = tuv
+        source = None
+        target = None
 
-        if source_tuv is None:
-            source_tuv = tuvs[0]
-        if target_tuv is None:
-            target_tuv = tuvs[1] if len(tuvs) > 1 else tuvs[0]
+        for k, lang in enumerate(langs):
+            if lang == self.source_lang or (source is None and target is None):
+                source = k
+            elif lang == self.target_lang or target is None:
+                target = k
 
-        source_seg = source_tuv.find('seg')
-        target_seg = target_tuv.find('seg')
+        if source is None:
+            source = 0
+        if target is None:
+            target = 1
 
-        source_text = self._get_seg_text(source_seg)
-        target_text = self._get_seg_text(target_seg)
+        return source, target
 
-        return source_text, target_text
+    def _make_record(self, tu: ET.Element) -> TURecord:
+        """Extract a TU's texts, dedup key, dates and tag count into a TURecord."""
+        source_text, target_text = self._get_tu_texts(tu)
+
+        key = None
+        if source_text is not None:
+            key = TURecord.make_key(source_text, target_text)
+
+        tagged_segments = 0
+        for seg in tu.iter('seg'):
+            if len(seg):
+                tagged_segments += 1
+
+        return TURecord(tu, source_text, target_text, key,
+                        tu.get('creationdate', ''), tu.get('changedate', ''),
+                        tagged_segments)
+
+    def get_record(self, tu: ET.Element) -> TURecord:
+        """
+        TURecord for a TU element, cached by element identity in tree mode
+        so repeated operations do not re-extract text. Operations that
+        change or remove TUs keep the cache in step (see _forget_records).
+        """
+        if self.streaming:
+            return self._make_record(tu)
+        record = self._records.get(tu)
+        if record is None:
+            record = self._records[tu] = self._make_record(tu)
+        return record
+
+    def _forget_records(self, tus: Optional[List[ET.Element]] = None) -> None:
+        """Drop cached records for the given TUs, or the whole cache."""
+        if tus is None:
+            self._records.clear()
+            return
+        for tu in tus:
+            self._records.pop(tu, None)
+
+    def run_pipeline(self, stages: List[PipelineStage],
+                     output_path: Optional[str] = None) -> List[Dict]:
+        """
+        Push every TU through the given stages in a single pass.
+        Tree mode applies the result in place; streaming mode writes the
+        surviving TUs to output_path as they are read.
+        Returns each stage's result dict, in stage order.
+        """
+        pipeline = TUPipeline(stages)
+        changed = []
+        kept = 0
+
+        def keep(tu: ET.Element) -> bool:
+            nonlocal kept
+            record = self.get_record(tu)
+            if not pipeline.accept(record):
+                return False
+            if record.modified:
+                record.modified = False
+                changed.append((kept, tu))
+            kept += 1
+            return True
+
+        self._sweep_tus(keep, output_path)
+        if not self.streaming:
+            self.last_changes.changed = changed
+        return pipeline.results()
 
     # ──────────────────────────────────────────────
     # TMX writing
@@ -197,29 +985,26 @@ class TMXEditor:
         """
         Write the current tree to a TMX file.
         Preserves DOCTYPE and encoding from the original file.
+
+        The tree is serialized straight into the output file, so no
+        in-memory copy of the document is made while saving.
         """
+        self._require_tree()
         ET.register_namespace('xml', 'http://www.w3.org/XML/1998/namespace')
 
-        buffer = io.BytesIO()
-        self.tree.write(
-            buffer,
-            encoding=self.encoding,
-            xml_declaration=True,
-            short_empty_elements=False
-        )
-        raw = buffer.getvalue()
-
-        # Inject DOCTYPE if the original had one
-        if self.original_doctype:
-            decoded = raw.decode(self.encoding)
-            insert_pos = decoded.find('?>')
-            if insert_pos != -1:
-                insert_pos += 2
-                decoded = decoded[:insert_pos] + '\n' + self.original_doctype + decoded[insert_pos:]
-                raw = decoded.encode(self.encoding)
-
-        with open(output_path, 'wb') as f:
-            f.write(raw)
+        # Same prolog and encoding ElementTree.write() would produce,
+        # plus the DOCTYPE it discards
+        f = open(output_path, 'w', encoding=self.encoding,
+                 errors='xmlcharrefreplace', newline='\n')
+        try:
+            with f:
+                f.write(f"<?xml version='1.0' encoding='{self.encoding}'?>\n")
+                if self.original_doctype:
+                    f.write(self.original_doctype + '\n')
+                self.tree.write(f, encoding='unicode', short_empty_elements=False)
+        except BaseException:
+            os.remove(output_path)
+            raise
 
         return output_path
 
@@ -234,56 +1019,40 @@ class TMXEditor:
     # Operation 1: Remove exact duplicates
     # ──────────────────────────────────────────────
 
-    def remove_exact_duplicates(self) -> Dict:
+    def remove_exact_duplicates(self, output_path: Optional[str] = None,
+                                mem_limit: Optional[int] = None) -> Dict:
         """
         Remove exact duplicate TUs, keeping only the first occurrence.
         Comparison: normalized(source) + normalized(target), case-insensitive.
+        In streaming mode the kept TUs are written to output_path.
+        With mem_limit (bytes) the keys are deduplicated on disk in hash
+        partitions instead of one in-memory set (see tmx_dedup.py).
         """
-        body = self._get_body()
-        all_tus = list(body.findall('tu'))
-        total_before = len(all_tus)
-
-        seen_keys = set()
-        to_remove = []
-        duplicate_examples = []
-
-        for tu in all_tus:
-            source_text, target_text = self._get_tu_texts(tu)
-            if source_text is None:
-                continue
-
-            norm_source = ' '.join(source_text.lower().split())
-            norm_target = ' '.join(target_text.lower().split())
-            key = f"{norm_source}|||{norm_target}"
-
-            if key in seen_keys:
-                to_remove.append(tu)
-                if len(duplicate_examples) < 10:
-                    duplicate_examples.append({
-                        'source': source_text[:80],
-                        'target': target_text[:80]
-                    })
-            else:
-                seen_keys.add(key)
-
-        for tu in to_remove:
-            body.remove(tu)
-
-        return {
-            'removed_count': len(to_remove),
-            'unique_count': total_before - len(to_remove),
-            'total_before': total_before,
-            'examples': duplicate_examples
-        }
+        if mem_limit:
+            from tmx_dedup import PartitionedDedupStage
+            stage = PartitionedDedupStage.prepare(self, mem_limit)
+        else:
+            stage = DedupStage(verify=not self.streaming)
+        return self.run_pipeline([stage], output_path)[0]
 
     # ──────────────────────────────────────────────
     # Operation 2: Fuzzy duplicate detection
     # ──────────────────────────────────────────────
 
-    def find_fuzzy_duplicates(self, threshold: float = 0.85) -> List[Dict]:
+    def find_fuzzy_duplicates(self, threshold: float = 0.85,
+                              use_lsh: Optional[bool] = None,
+                              workers: int = 1) -> List[Dict]:
         """
         Find TUs with similar source text using SequenceMatcher.
         Returns groups of similar TUs for user review.
+
+        use_lsh: limit SequenceMatcher to candidate pairs from a MinHash/LSH
+        index (see tmx_fuzzy). None = automatic, on above
+        FUZZY_LSH_MIN_SEGMENTS unique sources. Candidate search may miss a
+        few borderline pairs; every reported pair still meets threshold.
+
+        workers: verify pairs in this many processes. The groups are
+        identical to a serial run.
         """
         body = self._get_body()
         all_tus = list(body.findall('tu'))
@@ -291,9 +1060,9 @@ class TMXEditor:
         # Extract text data, skip invalid TUs
         tu_data = []
         for i, tu in enumerate(all_tus):
-            src, tgt = self._get_tu_texts(tu)
-            if src:
-                tu_data.append((i + 1, tu, src, tgt or ""))
+            record = self.get_record(tu)
+            if record.source:
+                tu_data.append((i + 1, tu, record.source, record.target or ""))
 
         # Deduplicate by exact source match (only keep unique sources)
         seen_exact = {}
@@ -305,12 +1074,30 @@ class TMXEditor:
                 unique_tus.append(item)
 
         n = len(unique_tus)
-        if n > 50000:
+        if use_lsh is None:
+            use_lsh = n > self.FUZZY_LSH_MIN_SEGMENTS
+
+        if n > 50000 and not use_lsh:
             print(f"  Warning: {n:,} unique TUs. Fuzzy matching may take a long time.")
             print(f"  Consider using a higher threshold to speed things up.")
 
         # Sort by source text length for length-ratio pruning
         unique_tus.sort(key=lambda x: len(x[2]))
+        lowered = [item[2].lower() for item in unique_tus]
+
+        candidates = None
+        if use_lsh:
+            print(f"  Building MinHash/LSH candidate index for {n:,} segments...")
+            candidates = MinHashLSH(threshold).candidates(lowered)
+            total_pairs = sum(len(js) for js in candidates.values())
+            print(f"  {total_pairs:,} candidate pairs to verify.")
+
+        # Parallel mode verifies all pairs up front; the greedy grouping
+        # below then replays those hits in the same order as a serial run
+        hits = None
+        if workers > 1 and n > 1:
+            print(f"  Verifying pairs in {workers} worker processes...")
+            hits = parallel_fuzzy_matches(lowered, threshold, workers, candidates)
 
         matched = [False] * n
         groups = []
@@ -325,33 +1112,25 @@ class TMXEditor:
                 print(f"  Processed {i + 1:,}/{n:,} segments...")
 
             group_similar = []
-            len_i = len(unique_tus[i][2])
 
-            for j in range(i + 1, n):
+            if hits is not None:
+                found = hits.get(i, ())
+            else:
+                others = candidates.get(i, ()) if candidates is not None else range(i + 1, n)
+                found = iter_fuzzy_matches(lowered, i, others, threshold, matched)
+
+            for j, ratio in found:
                 if matched[j]:
                     continue
 
-                len_j = len(unique_tus[j][2])
-
-                # Length-ratio pruning
-                if len_i > 0 and len_j > len_i / threshold:
-                    break  # All subsequent are even longer
-
-                ratio = SequenceMatcher(
-                    None,
-                    unique_tus[i][2].lower(),
-                    unique_tus[j][2].lower()
-                ).ratio()
-
-                if ratio >= threshold:
-                    matched[j] = True
-                    group_similar.append({
-                        'tu_number': unique_tus[j][0],
-                        'tu_element': unique_tus[j][1],
-                        'source': unique_tus[j][2],
-                        'target': unique_tus[j][3],
-                        'similarity': round(ratio * 100, 1)
-                    })
+                matched[j] = True
+                group_similar.append({
+                    'tu_number': unique_tus[j][0],
+                    'tu_element': unique_tus[j][1],
+                    'source': unique_tus[j][2],
+                    'target': unique_tus[j][3],
+                    'similarity': round(ratio * 100, 1)
+                })
 
             if group_similar:
                 groups.append({
@@ -366,103 +1145,50 @@ class TMXEditor:
     def remove_fuzzy_duplicates(self, groups: List[Dict]) -> Dict:
         """Remove fuzzy duplicates identified by find_fuzzy_duplicates()."""
         body = self._get_body()
-        removed = 0
+        changes = self.last_changes = TUChanges()
+        self._merge_index = None
 
+        doomed = set()
         for group in groups:
             for similar in group['similar_tus']:
                 tu_elem = similar.get('tu_element')
                 if tu_elem is not None:
-                    try:
-                        body.remove(tu_elem)
-                        removed += 1
-                    except ValueError:
-                        pass  # Already removed
-
-        return {'removed_count': removed}
-
-    # ──────────────────────────────────────────────
-    # Operation 3: Remove empty/missing segments
-    # ──────────────────────────────────────────────
-
-    def remove_empty_segments(self) -> Dict:
-        """Remove TUs where source or target is empty/missing."""
-        body = self._get_body()
-        all_tus = list(body.findall('tu'))
-        total_before = len(all_tus)
+                    doomed.add(tu_elem)
 
+        # Positions first (one pass), so removals can be reported to views
         to_remove = []
-        by_type = defaultdict(int)
-
-        for tu in all_tus:
-            tuvs = tu.findall('tuv')
-
-            if len(tuvs) < 2:
+        for pos, tu in enumerate(body.findall('tu')):
+            if tu in doomed:
                 to_remove.append(tu)
-                by_type['missing_tuv'] += 1
-                continue
-
-            source_text, target_text = self._get_tu_texts(tu)
-
-            if source_text is None:
-                to_remove.append(tu)
-                by_type['invalid_structure'] += 1
-                continue
-
-            if not source_text and not target_text:
-                to_remove.append(tu)
-                by_type['both_empty'] += 1
-            elif not source_text:
-                to_remove.append(tu)
-                by_type['empty_source'] += 1
-            elif not target_text:
-                to_remove.append(tu)
-                by_type['empty_target'] += 1
+                changes.removed.append(pos)
 
         for tu in to_remove:
             body.remove(tu)
+        self._forget_records(doomed)
 
-        return {
-            'removed_count': len(to_remove),
-            'remaining_count': total_before - len(to_remove),
-            'total_before': total_before,
-            'by_type': dict(by_type)
-        }
+        return {'removed_count': len(to_remove)}
 
     # ──────────────────────────────────────────────
-    # Operation 4: Strip inline formatting tags
+    # Operation 3: Remove empty/missing segments
     # ──────────────────────────────────────────────
 
-    def strip_inline_tags(self) -> Dict:
-        """Remove inline formatting tags from all <seg> elements, keeping text."""
-        segments_modified = 0
-        tags_removed = 0
-
-        for seg in self.root.iter('seg'):
-            children = list(seg)
-            if not children:
-                continue
-
-            # Collect full text content (including text inside tags)
-            full_text = ''.join(seg.itertext())
-
-            # Count tags being removed
-            tag_count = sum(1 for _ in seg.iter() if _ is not seg)
-
-            # Preserve seg's own attributes
-            attribs = dict(seg.attrib)
-
-            # Clear and rebuild with plain text
-            seg.clear()
-            seg.attrib.update(attribs)
-            seg.text = full_text
+    def remove_empty_segments(self, output_path: Optional[str] = None) -> Dict:
+        """
+        Remove TUs where source or target is empty/missing.
+        In streaming mode the kept TUs are written to output_path.
+        """
+        return self.run_pipeline([EmptyStage()], output_path)[0]
 
-            segments_modified += 1
-            tags_removed += tag_count
+    # ──────────────────────────────────────────────
+    # Operation 4: Strip inline formatting tags
+    # ──────────────────────────────────────────────
 
-        return {
-            'segments_modified': segments_modified,
-            'tags_removed': tags_removed
-        }
+    def strip_inline_tags(self, output_path: Optional[str] = None) -> Dict:
+        """
+        Remove inline formatting tags from all <seg> elements, keeping text.
+        In streaming mode the stripped TUs are written to output_path.
+        """
+        return self.run_pipeline([StripTagsStage()], output_path)[0]
 
     # ──────────────────────────────────────────────
     # Operation 5: Filter and export
@@ -493,7 +1219,8 @@ class TMXEditor:
         tgt_re = re.compile(target_pattern, re.IGNORECASE) if target_pattern else None
 
         for tu in body.findall('tu'):
-            source_text, target_text = self._get_tu_texts(tu)
+            record = self.get_record(tu)
+            source_text, target_text = record.source, record.target
             if source_text is None:
                 continue
 
@@ -505,7 +1232,7 @@ class TMXEditor:
                 match = False
 
             if date_from or date_to:
-                creation_date = tu.get('creationdate', '')
+                creation_date = record.creation_date
                 # TMX dates are typically YYYYMMDDTHHMMSSZ
                 date_part = creation_date[:8] if creation_date else ''
                 if date_from and date_part < date_from:
@@ -522,43 +1249,16 @@ class TMXEditor:
         return matching
 
     def export_filtered(self, tu_elements: List[ET.Element], output_path: str) -> str:
-        """Create a new TMX file containing only the specified TUs."""
-        # Deep-copy the tree
-        new_tree = copy.deepcopy(self.tree)
-        new_root = new_tree.getroot()
-
-        # Find body and clear it
-        body = new_root.find('body')
-        if body is None:
-            body = new_root.find('.//body')
-
-        # Remove all existing TUs
-        for tu in list(body.findall('tu')):
-            body.remove(tu)
-
-        # Map original TU elements to their copies
-        # Since we deep-copied, we need to re-add from original elements (deep-copy them)
-        for tu in tu_elements:
-            body.append(copy.deepcopy(tu))
-
-        # Write using a temporary editor-like approach
-        ET.register_namespace('xml', 'http://www.w3.org/XML/1998/namespace')
-
-        buf = io.BytesIO()
-        new_tree.write(buf, encoding=self.encoding, xml_declaration=True,
-                       short_empty_elements=False)
-        raw = buf.getvalue()
-
-        if self.original_doctype:
-            decoded = raw.decode(self.encoding)
-            insert_pos = decoded.find('?>')
-            if insert_pos != -1:
-                insert_pos += 2
-                decoded = decoded[:insert_pos] + '\n' + self.original_doctype + decoded[insert_pos:]
-                raw = decoded.encode(self.encoding)
+        """
+        Create a new TMX file containing only the specified TUs.
+        The header and the selected TUs are written straight to the file,
+        so the cost grows with the selection rather than the whole tree.
+        """
+        self._require_tree()
 
-        with open(output_path, 'wb') as f:
-            f.write(raw)
+        with self.open_writer(output_path) as writer:
+            for tu in tu_elements:
+                writer.write_tu(tu)
 
         return output_path
 
@@ -566,10 +1266,14 @@ class TMXEditor:
     # Operation 6: CSV export
     # ──────────────────────────────────────────────
 
-    def export_to_csv(self, output_path: str, include_metadata: bool = True) -> str:
-        """Export all TUs to a CSV file (UTF-8 with BOM for Excel)."""
-        body = self._get_body()
-
+    def export_to_csv(self, output_path: str, include_metadata: bool = True,
+                      stages: Optional[List[PipelineStage]] = None) -> str:
+        """
+        Export all TUs to a CSV file (UTF-8 with BOM for Excel).
+        If stages are given, each TU is passed through them first and only
+        the surviving TUs are exported (see run_pipeline).
+        """
+        pipeline = TUPipeline(stages or [])
         headers = ['TU_Number', 'Source_Language', 'Source_Text',
                    'Target_Language', 'Target_Text']
         if include_metadata:
@@ -579,19 +1283,22 @@ class TMXEditor:
             writer = csv.writer(f)
             writer.writerow(headers)
 
-            for i, tu in enumerate(body.findall('tu'), 1):
-                source_text, target_text = self._get_tu_texts(tu)
-                if source_text is None:
-                    source_text = ""
-                if target_text is None:
-                    target_text = ""
+            i = 0
+            for tu in self.iter_tus():
+                record = self.get_record(tu)
+                if not pipeline.accept(record):
+                    continue
+                i += 1
+
+                source_text = record.source or ""
+                target_text = record.target or ""
 
                 row = [i, self.source_lang, source_text,
                        self.target_lang, target_text]
 
                 if include_metadata:
-                    row.append(tu.get('creationdate', ''))
-                    row.append(tu.get('changedate', ''))
+                    row.append(record.creation_date)
+                    row.append(record.change_date)
 
                 writer.writerow(row)
 
@@ -616,102 +1323,146 @@ class TMXEditor:
         other_editor = TMXEditor()
         other_editor.load(other_path)
 
+        # other_editor is discarded afterwards, so its TUs are moved, not copied
+        return self.merge_entries(other_editor.iter_merge_entries(), duplicate_strategy)
+
+    def iter_merge_entries(self) -> Iterator[Tuple[bytes, bytes, ET.Element]]:
+        """
+        This file's TUs as merge_entries() input: (pair digest, source
+        digest, tu) for every TU with a key, in body order.
+        """
+        for tu in self._get_body().findall('tu'):
+            record = self._make_record(tu)
+            if record.key is not None:
+                yield MergeIndex.digests(record) + (tu,)
+
+    def merge_entries(self, entries: Iterable[Tuple[bytes, bytes, Union[ET.Element, bytes]]],
+                      duplicate_strategy: str = 'skip') -> Dict:
+        """
+        Merge TUs given as (pair digest, source digest, tu) in file order,
+        as produced by iter_merge_entries(); tu is an element, appended as
+        it is, or a serialized one (see _serialize_tu).
+        Decisions are made on the digests alone, so only the TUs that end
+        up in the body are parsed.
+        See merge_from() for the strategies and the result.
+        """
         body = self._get_body()
-        other_body = other_editor._get_body()
 
-        # Build lookup of existing source+target pairs
-        existing_pairs = set()
-        existing_sources = {}  # normalized_source -> tu_element
+        # Lookup of the existing TUs; it is brought up to date at the end,
+        # so during the merge it shows the body as it was before, plus
+        # the entries this merge took as new pairs and replacements
+        index = self._get_merge_index()
+        start_count = index.tu_count
+        new_pairs = set()
+        new_sources = {}  # source digest -> number of an entry taken by this merge
+        taken = {}        # entry number -> entry, in file order
+        doomed = {}       # replaced body TU -> its pair digest
 
-        for tu in body.findall('tu'):
-            src, tgt = self._get_tu_texts(tu)
-            if src is None:
-                continue
-            norm_src = ' '.join(src.lower().split())
-            norm_tgt = ' '.join((tgt or "").lower().split())
-            existing_pairs.add(f"{norm_src}|||{norm_tgt}")
-            existing_sources[norm_src] = tu
+        changes = self.last_changes = TUChanges()
 
         added = 0
         skipped = 0
         replaced = 0
 
-        for tu in other_body.findall('tu'):
-            src, tgt = other_editor._get_tu_texts(tu)
-            if src is None:
-                continue
-
-            norm_src = ' '.join(src.lower().split())
-            norm_tgt = ' '.join((tgt or "").lower().split())
-            pair_key = f"{norm_src}|||{norm_tgt}"
+        for number, entry in enumerate(entries):
+            pair_key, src_key, _tu = entry
 
             # Exact same source+target already exists
-            if pair_key in existing_pairs:
+            if pair_key in index.pair_counts or pair_key in new_pairs:
                 skipped += 1
                 continue
 
-            # Same source, different target
-            if norm_src in existing_sources:
+            # Same source, different target: taken earlier in this merge,
+            # or already in the body
+            old_number = new_sources.get(src_key)
+            old_tu = index.sources.get(src_key) if old_number is None else None
+
+            if old_number is not None or old_tu is not None:
                 if duplicate_strategy == 'skip':
                     skipped += 1
                     continue
                 elif duplicate_strategy == 'replace':
-                    old_tu = existing_sources[norm_src]
-                    body.remove(old_tu)
-                    body.append(copy.deepcopy(tu))
-                    existing_sources[norm_src] = tu
+                    if old_number is not None:
+                        del taken[old_number]
+                    else:
+                        doomed[old_tu] = MergeIndex.digests(self.get_record(old_tu))[0]
+                    taken[number] = entry
+                    new_sources[src_key] = number
                     replaced += 1
                 elif duplicate_strategy == 'keep_both':
-                    body.append(copy.deepcopy(tu))
+                    taken[number] = entry
                     added += 1
             else:
-                body.append(copy.deepcopy(tu))
-                existing_pairs.add(pair_key)
-                existing_sources[norm_src] = tu
+                taken[number] = entry
+                new_pairs.add(pair_key)
+                new_sources[src_key] = number
                 added += 1
 
+        if doomed:
+            # Drop the replaced TUs in one pass over the body
+            changes.removed = [pos for pos, tu in enumerate(body.findall('tu')) if tu in doomed]
+            body[:] = [child for child in body if child not in doomed]
+            self._forget_records(list(doomed))
+
+        new_tus = _parse_tus([tu for _, _, tu in taken.values()])
+        body.extend(new_tus)
+
+        # Bring the lookup up to date for the next merge
+        for pair_key in doomed.values():
+            index.discard(pair_key)
+        for tu, (pair_key, src_key, _) in zip(new_tus, taken.values()):
+            index.add(tu, pair_key, src_key)
+        first = start_count - len(changes.removed)
+        index.tu_count = first + len(new_tus)
+
+        changes.added = [(first + k, tu) for k, tu in enumerate(new_tus)]
+
         return {
             'added': added,
             'skipped': skipped,
             'replaced': replaced,
-            'total_after': len(body.findall('tu'))
+            'total_after': index.tu_count
         }
 
+    def _get_merge_index(self) -> MergeIndex:
+        """The body's MergeIndex, built on the first merge after a load or edit."""
+        index = self._merge_index
+        if index is None:
+            index = self._merge_index = MergeIndex()
+            for tu in self._get_body().findall('tu'):
+                index.tu_count += 1
+                record = self.get_record(tu)
+                if record.key is not None:
+                    index.add(tu, *MergeIndex.digests(record))
+        return index
+
     # ──────────────────────────────────────────────
     # Statistics
     # ──────────────────────────────────────────────
 
     def get_statistics(self) -> Dict:
         """Get current statistics about the loaded TMX."""
-        body = self._get_body()
-        all_tus = body.findall('tu')
-        total = len(all_tus)
-
+        total = 0
         empty_count = 0
         tagged_segments = 0
 
-        for tu in all_tus:
-            src, tgt = self._get_tu_texts(tu)
-            if not src or not tgt:
+        # Count exact duplicates (without removing); records are cached
+        # in tree mode, so digest matches can be checked against them
+        seen = KeyTable(None if self.streaming else _record_key)
+        duplicate_count = 0
+
+        for tu in self.iter_tus():
+            total += 1
+            record = self.get_record(tu)
+            if not record.source or not record.target:
                 empty_count += 1
 
-            # Check for inline tags
-            for seg in tu.iter('seg'):
-                if list(seg):
-                    tagged_segments += 1
+            tagged_segments += record.tagged_segments
 
-        # Count exact duplicates (without removing)
-        seen = set()
-        duplicate_count = 0
-        for tu in all_tus:
-            src, tgt = self._get_tu_texts(tu)
-            if src is None:
+            if record.key is None:
                 continue
-            key = f"{' '.join(src.lower().split())}|||{' '.join((tgt or '').lower().split())}"
-            if key in seen:
+            if not seen.add(record.key, None if self.streaming else record):
                 duplicate_count += 1
-            else:
-                seen.add(key)
 
         return {
             'total_tus': total,
@@ -936,9 +1687,41 @@ def _find_tmx_files(directory: str) -> List[str]:
     return files
 
 
+def _read_merge_entries(path: str) -> List[Tuple[bytes, bytes, bytes]]:
+    """Worker: parse one TMX file into merge_entries() input, TUs serialized."""
+    editor = TMXEditor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        editor.load(path)
+    return [(pair_key, src_key, _serialize_tu(tu))
+            for pair_key, src_key, tu in editor.iter_merge_entries()]
+
+
+def _parallel_merge_entries(paths: List[str], workers: int
+                            ) -> Iterator[List[Tuple[bytes, bytes, bytes]]]:
+    """
+    Yield each file's merge entries in order, parsed in a process pool.
+    At most two files per worker are in flight, so parsed files do not
+    pile up while the merge catches up.
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        queued = iter(paths)
+        pending = deque(pool.submit(_read_merge_entries, path)
+                        for path in itertools.islice(queued, 2 * workers))
+        while pending:
+            entries = pending.popleft().result()
+            path = next(queued, None)
+            if path is not None:
+                pending.append(pool.submit(_read_merge_entries, path))
+            yield entries
+
+
 def _batch_merge(directory: str, output: str = None,
-                 duplicate_strategy: str = 'skip') -> None:
-    """Merge all TMX files in a directory into one."""
+                 duplicate_strategy: str = 'skip', jobs: int = 1,
+                 mem_limit: Optional[int] = None) -> None:
+    """
+    Merge all TMX files in a directory into one.
+    With mem_limit (bytes) the merge runs on disk (see tmx_merge.py).
+    """
     tmx_files = _find_tmx_files(directory)
 
     if not tmx_files:
@@ -953,6 +1736,20 @@ def _batch_merge(directory: str, output: str = None,
         print("Need at least 2 TMX files to merge.")
         sys.exit(1)
 
+    # Generate output path
+    if not output:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(directory, f"merged_{timestamp}.tmx")
+
+    if mem_limit:
+        from tmx_merge import external_merge
+        print(f"\nMerging on disk (memory limit {mem_limit / (1 << 20):,.0f} MB)...")
+        result = external_merge(tmx_files, output, duplicate_strategy, mem_limit=mem_limit)
+        _print_merge_summary(len(tmx_files), result['added'], result['skipped'],
+                             result['replaced'], result['total_after'],
+                             duplicate_strategy, output)
+        return
+
     # Load the first file as base
     editor = TMXEditor()
     print(f"\nLoading base file: {Path(tmx_files[0]).name}")
@@ -962,10 +1759,15 @@ def _batch_merge(directory: str, output: str = None,
     total_skipped = 0
     total_replaced = 0
 
-    # Merge remaining files one by one
+    # Merge remaining files one by one (with jobs > 1, parsed ahead in
+    # worker processes but still applied in file order)
+    parsed = _parallel_merge_entries(tmx_files[1:], jobs) if jobs > 1 else None
     for tmx_path in tmx_files[1:]:
         print(f"\nMerging: {Path(tmx_path).name}...")
-        result = editor.merge_from(tmx_path, duplicate_strategy=duplicate_strategy)
+        if parsed is None:
+            result = editor.merge_from(tmx_path, duplicate_strategy=duplicate_strategy)
+        else:
+            result = editor.merge_entries(next(parsed), duplicate_strategy)
         total_added += result['added']
         total_skipped += result['skipped']
         total_replaced += result['replaced']
@@ -974,84 +1776,122 @@ def _batch_merge(directory: str, output: str = None,
             print(f", {result['replaced']:,} replaced", end="")
         print()
 
-    # Generate output path
-    if not output:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output = os.path.join(directory, f"merged_{timestamp}.tmx")
-
     editor.save(output)
 
     final_stats = editor.get_statistics()
+    _print_merge_summary(len(tmx_files), total_added, total_skipped, total_replaced,
+                         final_stats['total_tus'], duplicate_strategy, output)
+
+
+def _print_merge_summary(files: int, added: int, skipped: int, replaced: int,
+                         total: int, duplicate_strategy: str, output: str) -> None:
     print(f"\n{'=' * 60}")
     print(f"Merge complete!")
-    print(f"  Files merged:    {len(tmx_files)}")
-    print(f"  TUs added:       {total_added:,}")
-    print(f"  TUs skipped:     {total_skipped:,}")
-    if total_replaced:
-        print(f"  TUs replaced:    {total_replaced:,}")
-    print(f"  Total TUs:       {final_stats['total_tus']:,}")
+    print(f"  Files merged:    {files}")
+    print(f"  TUs added:       {added:,}")
+    print(f"  TUs skipped:     {skipped:,}")
+    if replaced:
+        print(f"  TUs replaced:    {replaced:,}")
+    print(f"  Total TUs:       {total:,}")
     print(f"  Strategy:        {duplicate_strategy}")
     print(f"  Output:          {output}")
 
 
-def _batch_operation(file_path: str, operations: List[str], output: str = None) -> None:
-    """Run one or more operations non-interactively on a TMX file."""
+def _batch_fuzzy(file_path: str, threshold: float = 0.85, jobs: int = 1,
+                 output: str = None) -> None:
+    """Find and remove fuzzy duplicates non-interactively."""
     editor = TMXEditor()
     editor.load(file_path)
 
-    modifications = False
-
-    for op in operations:
-        if op == 'dedup':
-            print("\nRemoving exact duplicates...")
-            result = editor.remove_exact_duplicates()
-            print(f"  Removed {result['removed_count']:,} duplicates "
-                  f"({result['total_before']:,} -> {result['unique_count']:,} TUs)")
-            if result['removed_count'] > 0:
-                modifications = True
-
-        elif op == 'empty':
-            print("\nRemoving empty/missing segments...")
-            result = editor.remove_empty_segments()
-            print(f"  Removed {result['removed_count']:,} empty segments "
-                  f"({result['total_before']:,} -> {result['remaining_count']:,} TUs)")
-            if result['removed_count'] > 0:
-                modifications = True
-
-        elif op == 'strip-tags':
-            print("\nStripping inline formatting tags...")
-            result = editor.strip_inline_tags()
-            print(f"  Modified {result['segments_modified']:,} segments, "
-                  f"removed {result['tags_removed']:,} tags")
-            if result['segments_modified'] > 0:
-                modifications = True
-
-        elif op == 'csv':
-            csv_path = output or editor._generate_output_path('_export').replace('.tmx', '.csv')
-            print(f"\nExporting to CSV...")
-            editor.export_to_csv(csv_path)
-            print(f"  Exported to: {csv_path}")
-            return  # CSV doesn't need TMX save
-
-    if modifications:
-        if not output:
-            suffix_parts = []
-            if 'dedup' in operations:
-                suffix_parts.append('deduped')
-            if 'empty' in operations:
-                suffix_parts.append('cleaned')
-            if 'strip-tags' in operations:
-                suffix_parts.append('stripped')
-            suffix = '_' + '_'.join(suffix_parts) if suffix_parts else '_edited'
-            output = editor._generate_output_path(suffix)
-
-        editor.save(output)
+    print(f"\nFinding fuzzy duplicates (threshold: {threshold*100:.0f}%)...")
+    groups = editor.find_fuzzy_duplicates(threshold=threshold, workers=jobs)
+
+    if not groups:
+        print("\nNo fuzzy duplicates found.")
+        return
+
+    total_similar = sum(len(g['similar_tus']) for g in groups)
+    print(f"  Found {len(groups):,} groups with {total_similar:,} fuzzy duplicates.")
+
+    result = editor.remove_fuzzy_duplicates(groups)
+    print(f"  Removed {result['removed_count']:,} fuzzy duplicates.")
+
+    if not output:
+        output = editor._generate_output_path('_fuzzy')
+    editor.save(output)
+    print(f"\nSaved to: {output}")
+
+
+def _batch_operation(file_path: str, operations: List[str], output: str = None,
+                     mem_limit: Optional[int] = None) -> None:
+    """
+    Run one or more operations non-interactively on a TMX file.
+    The chained operations run as one streaming pipeline: the input is
+    read once and the output written once, whatever the file size.
+    With mem_limit (bytes) duplicates are first found on disk, which
+    reads the input one more time (see tmx_dedup.py).
+    """
+    editor = TMXEditor()
+    editor.load(file_path, streaming=True)
+
+    stage_types = {'dedup': DedupStage, 'empty': EmptyStage, 'strip-tags': StripTagsStage}
+    stage_ops = [op for op in operations if op in stage_types]
+    stages = []
+    for op in stage_ops:
+        if op == 'dedup' and mem_limit:
+            from tmx_dedup import PartitionedDedupStage
+            print(f"\nFinding duplicates on disk (memory limit {mem_limit / (1 << 20):,.0f} MB)...")
+            stages.append(PartitionedDedupStage.prepare(editor, mem_limit))
+        else:
+            stages.append(stage_types[op]())
+
+    def report(results: List[Dict]) -> None:
+        for op, result in zip(stage_ops, results):
+            if op == 'dedup':
+                print("\nRemoving exact duplicates...")
+                print(f"  Removed {result['removed_count']:,} duplicates "
+                      f"({result['total_before']:,} -> {result['unique_count']:,} TUs)")
+            elif op == 'empty':
+                print("\nRemoving empty/missing segments...")
+                print(f"  Removed {result['removed_count']:,} empty segments "
+                      f"({result['total_before']:,} -> {result['remaining_count']:,} TUs)")
+            elif op == 'strip-tags':
+                print("\nStripping inline formatting tags...")
+                print(f"  Modified {result['segments_modified']:,} segments, "
+                      f"removed {result['tags_removed']:,} tags")
+
+    if 'csv' in operations:
+        csv_path = output or editor._generate_output_path('_export').replace('.tmx', '.csv')
+        editor.export_to_csv(csv_path, stages=stages)
+        report([stage.result() for stage in stages])
+        print(f"\nExporting to CSV...")
+        print(f"  Exported to: {csv_path}")
+        return  # CSV doesn't need TMX save
+
+    if not output:
+        suffix_parts = []
+        if 'dedup' in operations:
+            suffix_parts.append('deduped')
+        if 'empty' in operations:
+            suffix_parts.append('cleaned')
+        if 'strip-tags' in operations:
+            suffix_parts.append('stripped')
+        suffix = '_' + '_'.join(suffix_parts) if suffix_parts else '_edited'
+        output = editor._generate_output_path(suffix)
+
+    # Write next to the final output; only keep it if something changed
+    partial_path = output + '.part'
+    report(editor.run_pipeline(stages, partial_path))
+
+    if any(stage.modified for stage in stages):
+        os.replace(partial_path, output)
         print(f"\nSaved to: {output}")
     else:
+        os.remove(partial_path)
         print("\nNo modifications needed.")
 
 
-def _interactive_mode(file_path: str = None) -> None:
+def _interactive_mode(file_path: str = None, use_index: bool = False) -> None:
     """Run the interactive menu."""
     print("=" * 60)
     print("TMX Editor - Translation Memory Editing Tool")
@@ -1068,7 +1908,7 @@ def _interactive_mode(file_path: str = None) -> None:
         sys.exit(1)
 
     try:
-        editor.load(file_path)
+        editor.load(file_path, use_index=use_index)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -1153,14 +1993,20 @@ Examples:
   %(prog)s                              Interactive mode
   %(prog)s file.tmx                     Interactive mode with file
   %(prog)s --gui file.tmx               Retro TUI (Norton Commander style)
+  %(prog)s --gui --index file.tmx       TUI, reopening via a sidecar index
+  %(prog)s --gui --browse big.tmx       Read-only TUI, TUs parsed on demand
   %(prog)s --merge                      Merge all TMX files in current directory
   %(prog)s --merge /path/to/tmx/files   Merge all TMX files in specified directory
   %(prog)s --merge --strategy replace   Merge, incoming overwrites existing
+  %(prog)s --merge --jobs 8 /path       Merge, parsing files in 8 processes
+  %(prog)s --merge --mem-limit 1G /path Merge on disk, for inputs larger than RAM
   %(prog)s --dedup file.tmx             Remove exact duplicates
   %(prog)s --clean file.tmx             Remove duplicates + empty segments
+  %(prog)s --dedup --mem-limit 1G f.tmx Remove duplicates on disk, for huge files
   %(prog)s --strip-tags file.tmx        Strip inline formatting tags
   %(prog)s --csv file.tmx               Export to CSV
   %(prog)s --dedup --strip-tags f.tmx   Chain multiple operations
+  %(prog)s --fuzzy --jobs 8 file.tmx    Remove fuzzy duplicates using 8 processes
   %(prog)s --dedup file.tmx -o out.tmx  Specify output file
 """
     )
@@ -1181,6 +2027,8 @@ Examples:
                      help='Strip inline formatting tags (non-interactive)')
     ops.add_argument('--csv', action='store_true',
                      help='Export to CSV (non-interactive)')
+    ops.add_argument('--fuzzy', action='store_true',
+                     help='Remove fuzzy duplicates (non-interactive)')
     ops.add_argument('--gui', action='store_true',
                      help='Launch retro TUI (Norton Commander / Turbo Pascal style)')
 
@@ -1190,16 +2038,41 @@ Examples:
     parser.add_argument('--strategy', choices=['skip', 'replace', 'keep_both'],
                         default='skip',
                         help='Duplicate strategy for merge (default: skip)')
+    parser.add_argument('--threshold', type=float, default=85,
+                        help='Similarity threshold for --fuzzy, 0-100 (default: 85)')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Worker processes for --fuzzy and --merge (default: 1)')
+    parser.add_argument('--mem-limit', default=None, metavar='SIZE',
+                        help='With --merge, --dedup or --clean: work on disk, holding at '
+                             'most SIZE (e.g. 512M, 2G) of keys in memory, for inputs '
+                             'that do not fit in memory')
+    parser.add_argument('--index', action='store_true',
+                        help='Use (or create) a FILE.tmx.idx sidecar index for '
+                             'fast reopening in interactive and --gui modes')
+    parser.add_argument('--browse', action='store_true',
+                        help='With --gui: open read-only via a memory map, parsing '
+                             'only the TUs on screen (for very large files)')
 
     args = parser.parse_args()
 
     # Determine which mode to run
     has_batch_op = args.merge or args.dedup or args.clean or args.strip_tags or args.csv
 
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+
+    mem_limit = None
+    if args.mem_limit:
+        from tmx_merge import parse_size
+        try:
+            mem_limit = parse_size(args.mem_limit)
+        except Exception as e:
+            parser.error(f"--mem-limit: {e}")
+
     if args.gui:
         # Retro TUI mode
         from tmx_tui import run_tui
-        run_tui(file_path=args.file)
+        run_tui(file_path=args.file, use_index=args.index, browse=args.browse)
 
     elif args.merge:
         # Merge mode: directory of TMX files
@@ -1209,7 +2082,22 @@ Examples:
         if not os.path.isdir(directory):
             print(f"Error: Not a directory: {directory}")
             sys.exit(1)
-        _batch_merge(directory, output=args.output, duplicate_strategy=args.strategy)
+        _batch_merge(directory, output=args.output, duplicate_strategy=args.strategy,
+                     jobs=args.jobs, mem_limit=mem_limit)
+
+    elif args.fuzzy:
+        # Fuzzy duplicate removal needs the full tree, so it runs on its own
+        if not args.file:
+            parser.error("A TMX file is required for this operation.")
+        if has_batch_op:
+            parser.error("--fuzzy cannot be combined with other batch operations.")
+        if not 0 < args.threshold <= 100:
+            parser.error("--threshold must be between 0 and 100.")
+        if not os.path.isfile(args.file):
+            print(f"Error: File not found: {args.file}")
+            sys.exit(1)
+        _batch_fuzzy(args.file, threshold=args.threshold / 100.0, jobs=args.jobs,
+                     output=args.output)
 
     elif has_batch_op:
         # Non-interactive batch operation on a single file
@@ -1230,11 +2118,11 @@ Examples:
         if args.csv:
             operations.append('csv')
 
-        _batch_operation(args.file, operations, output=args.output)
+        _batch_operation(args.file, operations, output=args.output, mem_limit=mem_limit)
 
     else:
         # Interactive mode
-        _interactive_mode(file_path=args.file)
+        _interactive_mode(file_path=args.file, use_index=args.index)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+"""
+TMX Editor - Machine-readable analyzer findings
+
+TMXAnalyzer's findings in two formats for other tools:
+
+- JSONL: one JSON object per line - an "analysis" record with the file,
+  language pair and totals, then one record per auto-translatable TU,
+  duplicate group and missing/empty target, tagged with its "type" and
+  carrying the same fields as parse_tmx()'s result dicts.
+- Columnar: the same findings as fixed-width integer columns and one
+  string table, to be memory-mapped and scanned without parsing
+  (ColumnarFindings).
+
+Columnar layout: a magic line, one JSON header line padded with spaces
+to an 8-byte boundary, then the sections listed in the header as
+[name, typecode, count, itemsize, offset] - arrays in native byte
+order, each starting on an 8-byte boundary. A reader whose C types for
+the typecodes have other sizes rejects the file. Strings are ids into the string table:
+string k is the UTF-8 bytes strings[string_offsets[k]:string_offsets[k + 1]],
+and equal strings share an id. The integer columns, one entry per row:
+
+  auto_*     tu_number, reasons (bit k set: header 'categories'[k];
+             a TU's reasons are in the order of the categories),
+             source, target, source_lang, target_lang, creation_date,
+             change_date
+  missing_*  tu_number, issue (index into header 'issue_types'),
+             source, target, creation_date, change_date
+  dup_*      occurrences, source, target, and first - group g's TUs are
+             rows dup_first[g]:dup_first[g + 1] of the dup_tu_* columns
+             (dup_first has one more entry than there are groups)
+  dup_tu_*   tu_number, creation_date, change_date
+
+Uses only Python standard library.
+"""
+
+import json
+import mmap
+import sys
+from array import array
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Sequence, TextIO, Tuple
+
+
+COLUMNAR_MAGIC = b'TMXFINDINGS 1\n'
+ALIGN = 8
+
+
+def _analysis(auto_translatable_results: List[Dict], duplicate_results: List[Dict],
+              missing_target_results: List[Dict], language_pair: Tuple[str, str],
+              total_valid_tus: int, tmx_file_path: str) -> Dict:
+    """What a findings file says about the run as a whole."""
+    return {
+        'tmx_file': Path(tmx_file_path).name,
+        'source_lang': language_pair[0],
+        'target_lang': language_pair[1],
+        'total_valid_tus': total_valid_tus,
+        'auto_translatable': len(auto_translatable_results),
+        'duplicate_groups': len(duplicate_results),
+        'missing_target': len(missing_target_results),
+    }
+
+
+# ══════════════════════════════════════════════════
+# JSONL
+# ══════════════════════════════════════════════════
+
+def write_jsonl(f: TextIO, auto_translatable_results: List[Dict], duplicate_results: List[Dict],
+                missing_target_results: List[Dict], language_pair: Tuple[str, str],
+                total_valid_tus: int, tmx_file_path: str) -> None:
+    """Write the findings to f, one JSON record per line."""
+    def record(kind: str, fields: Dict) -> None:
+        f.write(json.dumps({'type': kind, **fields}, ensure_ascii=False))
+        f.write('\n')
+
+    record('analysis', _analysis(auto_translatable_results, duplicate_results,
+                                 missing_target_results, language_pair,
+                                 total_valid_tus, tmx_file_path))
+    for result in auto_translatable_results:
+        record('auto_translatable', result)
+    for dup in duplicate_results:
+        record('duplicate_group', dup)
+    for result in missing_target_results:
+        record('missing_target', result)
+
+
+# ══════════════════════════════════════════════════
+# Columnar
+# ══════════════════════════════════════════════════
+
+class _StringTable:
+    """Interned strings, numbered in order of first use."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.blob = bytearray()
+        self.offsets = array('Q', [0])
+
+    def id(self, text: str) -> int:
+        k = self.ids.get(text)
+        if k is None:
+            k = self.ids[text] = len(self.offsets) - 1
+            self.blob += text.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return k
+
+
+def write_columnar(f: BinaryIO, auto_translatable_results: List[Dict], duplicate_results: List[Dict],
+                   missing_target_results: List[Dict], language_pair: Tuple[str, str],
+                   total_valid_tus: int, tmx_file_path: str,
+                   categories: Sequence[str] = ()) -> None:
+    """
+    Write the findings to f in the columnar layout. categories is the
+    order reasons are listed in (other reasons are numbered after them,
+    in order of first use); the reasons column keeps only that order.
+    """
+    strings = _StringTable()
+    sid = strings.id
+    columns: Dict[str, array] = {}
+
+    def column(name: str, typecode: str = 'I') -> array:
+        col = columns[name] = array(typecode)
+        return col
+
+    categories: Dict[str, int] = {name: bit for bit, name in enumerate(categories)}
+    cols = [column('auto_' + name) for name in
+            ('tu_number', 'reasons', 'source', 'target', 'source_lang', 'target_lang',
+             'creation_date', 'change_date')]
+    for r in auto_translatable_results:
+        reasons = 0
+        for reason in r['auto_translatable_reasons']:
+            bit = categories.setdefault(reason, len(categories))
+            if bit >= 32:
+                raise Exception("Too many auto-translatable categories for the reasons column")
+            reasons |= 1 << bit
+        for col, value in zip(cols, (r['tu_number'], reasons, sid(r['source_text']),
+                                     sid(r['target_text']), sid(r['source_lang']),
+                                     sid(r['target_lang']), sid(r['creation_date']),
+                                     sid(r['change_date']))):
+            col.append(value)
+
+    issue_types: Dict[str, int] = {}
+    cols = [column('missing_' + name) for name in
+            ('tu_number', 'issue', 'source', 'target', 'creation_date', 'change_date')]
+    for r in missing_target_results:
+        issue = issue_types.setdefault(r['issue_type'], len(issue_types))
+        for col, value in zip(cols, (r['tu_number'], issue, sid(r['source_text']),
+                                     sid(r['target_text']), sid(r['creation_date']),
+                                     sid(r['change_date']))):
+            col.append(value)
+
+    occurrences, source, target = (column('dup_' + name) for name in ('occurrences', 'source', 'target'))
+    first = column('dup_first')
+    tu_number, creation_date, change_date = (column('dup_tu_' + name) for name in
+                                             ('tu_number', 'creation_date', 'change_date'))
+    first.append(0)
+    for dup in duplicate_results:
+        occurrences.append(dup['occurrences'])
+        source.append(sid(dup['source_text']))
+        target.append(sid(dup['target_text']))
+        tu_number.extend(dup['tu_numbers'])
+        creation_date.extend(map(sid, dup['creation_dates']))
+        change_date.extend(map(sid, dup['change_dates']))
+        first.append(len(tu_number))
+
+    columns['string_offsets'] = strings.offsets
+    blobs = [(name, col.typecode, len(col), col.itemsize, col.tobytes())
+             for name, col in columns.items()]
+    blobs.append(('strings', 'B', len(strings.blob), 1, bytes(strings.blob)))
+
+    header = {
+        'byteorder': sys.byteorder,
+        'analysis': _analysis(auto_translatable_results, duplicate_results,
+                              missing_target_results, language_pair,
+                              total_valid_tus, tmx_file_path),
+        'categories': list(categories),
+        'issue_types': list(issue_types),
+        'sections': [],
+    }
+    # The offsets depend on the header's length, which depends on the
+    # offsets: lay the sections out after a generous guess, growing it
+    # until the header fits
+    data_start = 0
+    while True:
+        offset = data_start
+        header['sections'] = []
+        for name, typecode, count, itemsize, blob in blobs:
+            header['sections'].append([name, typecode, count, itemsize, offset])
+            offset += -(-len(blob) // ALIGN) * ALIGN
+        head = COLUMNAR_MAGIC + json.dumps(header).encode('utf-8')
+        if len(head) + 1 <= data_start:
+            break
+        data_start = -(-(len(head) + 1 + 64) // ALIGN) * ALIGN
+
+    f.write(head + b' ' * (data_start - len(head) - 1) + b'\n')
+    for name, typecode, count, itemsize, blob in blobs:
+        f.write(blob)
+        f.write(b'\0' * (-len(blob) % ALIGN))
+
+
+class ColumnarFindings:
+    """
+    A columnar findings file, memory-mapped. column(name) is a
+    memoryview of integers over the mapping; string(k) decodes one entry
+    of the string table.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data.readline() != COLUMNAR_MAGIC:
+            self.close()
+            raise Exception(f"Not a columnar findings file: {path}")
+        self.header = json.loads(self.data.readline())
+        if self.header['byteorder'] != sys.byteorder:
+            self.close()
+            raise Exception(f"Findings file was written on a {self.header['byteorder']}-endian machine")
+        self._view = memoryview(self.data)
+        self._columns = {}
+        for name, typecode, count, itemsize, offset in self.header['sections']:
+            if array(typecode).itemsize != itemsize:
+                self.close()
+                raise Exception(f"Findings file column {name} has {itemsize}-byte items, "
+                                f"but '{typecode}' is {array(typecode).itemsize} bytes here")
+            self._columns[name] = self._view[offset:offset + count * itemsize].cast(typecode)
+        self._offsets = self._columns['string_offsets']
+        self._strings = self._columns['strings']
+
+    @property
+    def analysis(self) -> Dict:
+        return self.header['analysis']
+
+    @property
+    def categories(self) -> List[str]:
+        return self.header['categories']
+
+    @property
+    def issue_types(self) -> List[str]:
+        return self.header['issue_types']
+
+    def column(self, name: str) -> memoryview:
+        return self._columns[name]
+
+    def string(self, k: int) -> str:
+        return bytes(self._strings[self._offsets[k]:self._offsets[k + 1]]).decode('utf-8')
+
+    def close(self) -> None:
+        # Views into the mapping must be released before it can be closed
+        for col in getattr(self, '_columns', {}).values():
+            col.release()
+        if hasattr(self, '_view'):
+            self._view.release()
+        self._columns = {}
+        self._offsets = self._strings = None
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,229 @@
+"""
+TMX Editor - Fuzzy duplicate candidate search
+
+MinHash / LSH index used by TMXEditor.find_fuzzy_duplicates() to avoid
+comparing every source segment against every other one. Segments are
+broken into character n-gram shingles, summarized as MinHash signatures
+and bucketed by LSH banding; only segments that share a bucket become
+candidate pairs for the (exact) SequenceMatcher verification, which can
+run in a process pool.
+
+Signatures use one-permutation hashing with rotation densification: each
+shingle is hashed once and lands in one of num_perm bins, and empty bins
+borrow from the next filled bin. That keeps signature cost linear in the
+number of shingles, which matters in pure Python.
+
+Uses only Python standard library.
+"""
+
+import zlib
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class MinHashLSH:
+    """
+    Candidate pair generator: character n-grams -> MinHash -> LSH bands.
+
+    The band layout is derived from the SequenceMatcher threshold. A pair
+    with ratio >= threshold has at most (1 - threshold) of its characters
+    unmatched, and each unmatched character breaks at most `ngram`
+    shingles, which gives a lower bound on the shingle Jaccard similarity
+    of true matches. Bands and rows are chosen so that pairs at that bound
+    still become candidates with high probability.
+    """
+
+    TARGET_RECALL = 0.95
+
+    _MASK64 = (1 << 64) - 1
+    _MIX = 0x9E3779B97F4A7C15  # 64-bit golden ratio multiplier
+    _BORROW_STEP = 1 << 58     # keeps borrowed values distinct per distance
+
+    def __init__(self, threshold: float, num_perm: int = 64, ngram: int = 3):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.ngram = ngram
+        self.bands, self.rows = self._choose_bands(threshold, num_perm, ngram)
+
+    @classmethod
+    def _choose_bands(cls, threshold: float, num_perm: int, ngram: int):
+        """Pick the most selective (bands, rows) that still meets TARGET_RECALL."""
+        unmatched = ngram * (1.0 - threshold)
+        min_jaccard = max((1.0 - unmatched) / (1.0 + unmatched), 0.05)
+
+        best = (num_perm, 1)
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            recall = 1.0 - (1.0 - min_jaccard ** rows) ** bands
+            if recall >= cls.TARGET_RECALL:
+                best = (bands, rows)
+        return best
+
+    def shingles(self, text: str) -> Set[int]:
+        """Hashed character n-grams of text (the whole text if it is shorter)."""
+        n = self.ngram
+        if len(text) <= n:
+            return {zlib.crc32(text.encode('utf-8'))}
+        return {zlib.crc32(text[k:k + n].encode('utf-8'))
+                for k in range(len(text) - n + 1)}
+
+    def signature(self, text: str) -> List[int]:
+        """MinHash signature of text's shingle set (densified one-permutation hashing)."""
+        k = self.num_perm
+        bins = [None] * k
+
+        for h in self.shingles(text):
+            # crc32 is deterministic across runs (unlike hash() on str)
+            h = (h * self._MIX) & self._MASK64
+            h ^= h >> 29
+            b = h % k
+            v = h // k
+            if bins[b] is None or v < bins[b]:
+                bins[b] = v
+
+        # Rotation densification: an empty bin takes the value of the next
+        # filled bin to its right, offset by the distance it borrowed over
+        sig = bins[:]
+        src = None
+        for j in range(2 * k - 1, -1, -1):
+            if bins[j % k] is not None:
+                src = j
+            elif j < k:
+                sig[j] = bins[src % k] + (src - j) * self._BORROW_STEP
+        return sig
+
+    def band_keys(self, text: str) -> List[int]:
+        """One bucket key per LSH band."""
+        sig = self.signature(text)
+        r = self.rows
+        return [hash(tuple(sig[band * r:(band + 1) * r])) for band in range(self.bands)]
+
+    def candidates(self, texts: List[str]) -> Dict[int, List[int]]:
+        """
+        Find candidate pairs among texts, which must be sorted by length.
+
+        Returns {i: [j, ...]} with every j > i, in ascending order, limited
+        to the same length-ratio window the exhaustive search uses.
+        """
+        n = len(texts)
+        lengths = [len(t) for t in texts]
+
+        # Band keys for all texts, one flat array (bands per text)
+        keys = array('q')
+        for text in texts:
+            keys.extend(self.band_keys(text))
+
+        pairs = set()
+        for band in range(self.bands):
+            buckets = defaultdict(list)
+            for i in range(n):
+                buckets[keys[i * self.bands + band]].append(i)
+
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                for pos, i in enumerate(members):
+                    len_i = lengths[i]
+                    for j in members[pos + 1:]:
+                        # Length-ratio pruning (members are in length order)
+                        if len_i > 0 and lengths[j] > len_i / self.threshold:
+                            break
+                        pairs.add(i * n + j)
+
+        result = defaultdict(list)
+        for code in sorted(pairs):
+            i, j = divmod(code, n)
+            result[i].append(j)
+        return dict(result)
+
+
+# ══════════════════════════════════════════════════
+# SequenceMatcher verification (serial and process pool)
+# ══════════════════════════════════════════════════
+
+def iter_fuzzy_matches(texts: List[str], i: int, others: Iterable[int],
+                       threshold: float,
+                       matched: Optional[List[bool]] = None) -> Iterator[Tuple[int, float]]:
+    """
+    Yield (j, ratio) for every j in others whose SequenceMatcher ratio
+    with texts[i] meets threshold. texts must be sorted by length and
+    others ascending; j already flagged in matched is skipped.
+    """
+    text_i = texts[i]
+    len_i = len(text_i)
+
+    for j in others:
+        if matched is not None and matched[j]:
+            continue
+
+        # Length-ratio pruning
+        if len_i > 0 and len(texts[j]) > len_i / threshold:
+            break  # All subsequent are even longer
+
+        # quick_ratio() is a cheap upper bound on ratio()
+        matcher = SequenceMatcher(None, text_i, texts[j])
+        if matcher.quick_ratio() < threshold:
+            continue
+        ratio = matcher.ratio()
+        if ratio >= threshold:
+            yield j, ratio
+
+
+def _verify_shard(texts: List[str], offset: int, stop: int, threshold: float,
+                  candidates: Optional[Dict[int, List[int]]]) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    Worker: all matches for i in [offset, stop). texts is the slice of the
+    full list starting at offset and extending past stop to the end of
+    the length-ratio window of the last i in the shard.
+    """
+    hits = {}
+    for i in range(offset, stop):
+        local_i = i - offset
+        if candidates is not None:
+            others = [j - offset for j in candidates.get(i, ())]
+        else:
+            others = range(local_i + 1, len(texts))
+        found = [(j + offset, ratio)
+                 for j, ratio in iter_fuzzy_matches(texts, local_i, others, threshold)]
+        if found:
+            hits[i] = found
+    return hits
+
+
+def parallel_fuzzy_matches(texts: List[str], threshold: float, workers: int,
+                           candidates: Optional[Dict[int, List[int]]] = None
+                           ) -> Dict[int, List[Tuple[int, float]]]:
+    """
+    Compute every (i, j, ratio) with ratio >= threshold in a process pool.
+
+    texts (sorted by length) are split into shards of consecutive i; each
+    shard also carries the texts up to the end of its last segment's
+    length-ratio window, so shards overlap exactly where pairs can cross
+    a shard boundary. Returns {i: [(j, ratio), ...]} with j ascending;
+    replaying the greedy grouping over it gives the serial result.
+    """
+    n = len(texts)
+    lengths = [len(t) for t in texts]
+    shard_size = max(1, -(-n // (workers * 8)))  # several shards per worker
+
+    hits = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for start in range(0, n, shard_size):
+            stop = min(start + shard_size, n)
+            last_len = lengths[stop - 1]
+            end = n if last_len == 0 else max(stop, bisect_right(lengths, last_len / threshold))
+            shard_candidates = None
+            if candidates is not None:
+                shard_candidates = {i: candidates[i] for i in range(start, stop) if i in candidates}
+            futures.append(pool.submit(_verify_shard, texts[start:end], start, stop,
+                                       threshold, shard_candidates))
+        for future in futures:
+            hits.update(future.result())
+    return hits
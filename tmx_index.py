@@ -0,0 +1,416 @@
+"""
+TMX Editor - Sidecar index
+
+An optional `<file>.tmx.idx` next to a TMX file caches what the editor,
+the TUI and the analyzer extract from it: per-TU byte offsets, dates and
+the normalized duplicate key, and per TUV the language and plain segment
+text. The index is tied to its TMX file by size, mtime and a BLAKE2b
+hash of the content; a stale or unreadable index is ignored.
+
+MappedTMX gives random access to single TUs of a memory-mapped file,
+using the index's byte offsets or a one-off scan for <tu> boundaries
+(iter_tu_spans).
+
+File layout: a magic line, one JSON header line, then the raw sections
+listed in the header with their item size - arrays in native byte
+order, string columns as NUL-separated UTF-8 (XML text can never
+contain NUL). An index written with another byte order or item sizes
+is ignored.
+
+Uses only Python standard library.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import sys
+import xml.etree.ElementTree as ET
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.parsers import expat
+
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'TMXIDX 2\n'
+XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+
+def index_path(tmx_path: str) -> str:
+    """Sidecar index path for a TMX file."""
+    return tmx_path + INDEX_SUFFIX
+
+
+def file_digest(path: str, chunk_size: int = 1 << 20) -> str:
+    """BLAKE2b-128 hex digest of a file's content."""
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+_TU_BOUNDARY = re.compile(rb'<tu[\s/>]|</tu\s*>|<!--.*?-->|<!\[CDATA\[.*?\]\]>', re.DOTALL)
+
+
+def iter_tu_spans(data) -> Iterator[Tuple[int, int]]:
+    """
+    (start, end) byte span of every <tu> in data (bytes or an mmap),
+    from "<tu" to its closing ">". Comments and CDATA are skipped; the
+    encoding must be ASCII-compatible.
+    """
+    open_at = -1
+    for m in _TU_BOUNDARY.finditer(data):
+        token = m.group()
+        if token.startswith(b'</'):
+            if open_at >= 0:
+                yield open_at, m.end()
+                open_at = -1
+        elif token.startswith(b'<tu'):
+            if open_at >= 0:
+                # The previous <tu .../> closed itself
+                yield open_at, data.find(b'>', open_at) + 1
+            open_at = m.start()
+        # Comments and CDATA sections are skipped
+
+    if open_at >= 0:
+        yield open_at, data.find(b'>', open_at) + 1
+
+
+def tuv_lang(tuv: ET.Element) -> str:
+    """A TUV's language attribute as written in the file ('' if missing)."""
+    return tuv.get(XML_LANG) or tuv.get('xml:lang') or tuv.get('lang') or ''
+
+
+# ══════════════════════════════════════════════════
+# Parser with byte offsets
+# ══════════════════════════════════════════════════
+
+class OffsetTreeParser:
+    """
+    Builds the same tree as ET.parse(), and yields every <tu> together
+    with its byte span in the file as soon as it is complete.
+
+    ElementTree's own parser does not expose byte positions, so this
+    drives expat directly and feeds a TreeBuilder the way ET.XMLParser
+    does. The file content is hashed in the same pass; after iteration,
+    `root`, `header` and `digest` are set.
+    """
+
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.root: Optional[ET.Element] = None
+        self.header: Optional[ET.Element] = None
+        self.digest: Optional[str] = None
+        self.bytes_read = 0
+
+        self._builder = ET.TreeBuilder()
+        self._parser = expat.ParserCreate(None, '}')
+        self._parser.buffer_text = True
+        self._parser.ordered_attributes = True
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        self._parser.CharacterDataHandler = self._builder.data
+        self._names: Dict[str, str] = {}
+        self._tu_start = 0
+        self._done: List[Tuple[ET.Element, int, int]] = []
+
+    def _fixname(self, key: str) -> str:
+        name = self._names.get(key)
+        if name is None:
+            name = '{' + key if '}' in key else key
+            self._names[key] = name
+        return name
+
+    def _start(self, tag: str, attr_list: List[str]):
+        tag = self._fixname(tag)
+        attrib = {}
+        for i in range(0, len(attr_list), 2):
+            attrib[self._fixname(attr_list[i])] = attr_list[i + 1]
+        if tag == 'tu':
+            self._tu_start = self._parser.CurrentByteIndex
+        self._builder.start(tag, attrib)
+
+    def _end(self, tag: str):
+        tag = self._fixname(tag)
+        elem = self._builder.end(tag)
+        if tag == 'tu':
+            # Position of "</tu" - or just past "<tu .../>" for an empty element
+            self._done.append((elem, self._tu_start, self._parser.CurrentByteIndex))
+        elif tag == 'header' and self.header is None:
+            self.header = elem
+
+    def __iter__(self) -> Iterator[Tuple[ET.Element, int, int]]:
+        hasher = hashlib.blake2b(digest_size=16)
+        prev = b''
+        base = 0
+
+        with open(self.file_path, 'rb') as f:
+            while True:
+                chunk = f.read(self.CHUNK_SIZE)
+                hasher.update(chunk)
+                try:
+                    self._parser.Parse(chunk, not chunk)
+                except expat.ExpatError as e:
+                    raise ET.ParseError(str(e))
+
+                # Resolve end offsets against the bytes seen so far
+                window = prev + chunk
+                window_base = base - len(prev)
+                for elem, start, pos in self._done:
+                    rel = pos - window_base
+                    if (len(elem) == 0 and elem.text is None
+                            and window[rel - 2:rel] == b'/>'):
+                        end = pos
+                    else:
+                        end = window_base + window.index(b'>', rel) + 1
+                    yield elem, start, end
+                self._done.clear()
+
+                if not chunk:
+                    break
+                base += len(chunk)
+                prev = chunk
+                self.bytes_read = base
+
+        self.root = self._builder.close()
+        self.digest = hasher.hexdigest()
+
+
+# ══════════════════════════════════════════════════
+# Index file
+# ══════════════════════════════════════════════════
+
+class TMXIndex:
+    """
+    Columnar per-TU data for one TMX file.
+
+    TU i spans bytes tu_start[i]:tu_end[i] of the file; its TUVs are
+    tuv_first[i]:tuv_first[i+1] in the TUV columns. `key` is the editor's
+    normalized "source|||target" key (None for TUs with fewer than two
+    TUVs); `text` is the stripped plain text of a TUV's first <seg>
+    (None if it has none).
+    """
+
+    KEYED = 1    # tu_flags: key is set
+    HAS_SEG = 1  # tuv_flags: text is set
+
+    def __init__(self):
+        self.source_lang = 'unknown'
+        self.target_lang = 'unknown'
+        self.header_srclang = ''
+        self.tu_start = array('Q')
+        self.tu_end = array('Q')
+        self.tu_flags = bytearray()
+        self.tagged = array('I')
+        self.tuv_first = array('I', [0])
+        self.tuv_flags = bytearray()
+        self.tu_strings: List[str] = []   # creation date, change date, key per TU
+        self.tuv_strings: List[str] = []  # lang, text per TUV
+
+    def __len__(self) -> int:
+        return len(self.tu_flags)
+
+    # ── Building ──
+
+    def add(self, tu: ET.Element, start: int, end: int, key: Optional[str],
+            tagged_segments: int) -> None:
+        """Append a parsed <tu> with its byte span and duplicate key."""
+        self.tu_start.append(start)
+        self.tu_end.append(end)
+        self.tu_flags.append(self.KEYED if key is not None else 0)
+        self.tagged.append(tagged_segments)
+        self.tu_strings += (tu.get('creationdate', ''), tu.get('changedate', ''), key or '')
+
+        for tuv in tu.findall('tuv'):
+            seg = tuv.find('seg')
+            self.tuv_flags.append(self.HAS_SEG if seg is not None else 0)
+            text = ''.join(seg.itertext()).strip() if seg is not None else ''
+            self.tuv_strings += (tuv_lang(tuv), text)
+        self.tuv_first.append(len(self.tuv_flags))
+
+    # ── Reading ──
+
+    def span(self, i: int) -> Tuple[int, int]:
+        return self.tu_start[i], self.tu_end[i]
+
+    def creation_date(self, i: int) -> str:
+        return self.tu_strings[3 * i]
+
+    def change_date(self, i: int) -> str:
+        return self.tu_strings[3 * i + 1]
+
+    def key(self, i: int) -> Optional[str]:
+        return self.tu_strings[3 * i + 2] if self.tu_flags[i] & self.KEYED else None
+
+    def tuvs(self, i: int) -> List[Tuple[str, Optional[str]]]:
+        """(lang, text) per TUV of TU i; text is None for a TUV without <seg>."""
+        strings = self.tuv_strings
+        flags = self.tuv_flags
+        return [(strings[2 * k], strings[2 * k + 1] if flags[k] & self.HAS_SEG else None)
+                for k in range(self.tuv_first[i], self.tuv_first[i + 1])]
+
+    def tuv_langs(self, limit: int) -> List[str]:
+        """Languages of the first `limit` TUVs in document order."""
+        return self.tuv_strings[0:2 * limit:2]
+
+    # ── Persistence ──
+
+    _ARRAYS = ('tu_start', 'tu_end', 'tagged', 'tuv_first')
+    _BYTES = ('tu_flags', 'tuv_flags')
+    _STRINGS = ('tu_strings', 'tuv_strings')
+
+    def save(self, tmx_path: str, digest: str) -> str:
+        """Write the index next to tmx_path, stamped with its size, mtime and digest."""
+        st = os.stat(tmx_path)
+        sections = []
+        blobs = []
+        for name in self._ARRAYS:
+            col = getattr(self, name)
+            sections.append([name, col.typecode, len(col), col.itemsize])
+            blobs.append(col.tobytes())
+        for name in self._BYTES:
+            col = getattr(self, name)
+            sections.append([name, 'B', len(col), 1])
+            blobs.append(bytes(col))
+        for name in self._STRINGS:
+            blob = '\0'.join(getattr(self, name)).encode('utf-8')
+            sections.append([name, 's', len(blob), 1])
+            blobs.append(blob)
+
+        header = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'digest': digest,
+            'byteorder': sys.byteorder,
+            'source_lang': self.source_lang,
+            'target_lang': self.target_lang,
+            'header_srclang': self.header_srclang,
+            'sections': sections,
+        }
+
+        path = index_path(tmx_path)
+        tmp_path = path + '.part'
+        with open(tmp_path, 'wb') as f:
+            f.write(INDEX_MAGIC)
+            f.write(json.dumps(header).encode('utf-8') + b'\n')
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, tmx_path: str, verify_digest: bool = True) -> Optional['TMXIndex']:
+        """
+        Read the sidecar index of tmx_path. Returns None if there is none,
+        or if it does not match the file's current size, mtime and content.
+        """
+        path = index_path(tmx_path)
+        try:
+            st = os.stat(tmx_path)
+            with open(path, 'rb') as f:
+                if f.readline() != INDEX_MAGIC:
+                    return None
+                header = json.loads(f.readline())
+                if (header['size'] != st.st_size or header['mtime_ns'] != st.st_mtime_ns
+                        or header['byteorder'] != sys.byteorder):
+                    return None
+                if verify_digest and file_digest(tmx_path) != header['digest']:
+                    return None
+
+                index = cls()
+                index.source_lang = header['source_lang']
+                index.target_lang = header['target_lang']
+                index.header_srclang = header['header_srclang']
+                for name, typecode, length, itemsize in header['sections']:
+                    if typecode == 's':
+                        blob = f.read(length).decode('utf-8')
+                        setattr(index, name, blob.split('\0') if blob else [])
+                    elif typecode == 'B':
+                        setattr(index, name, bytearray(f.read(length)))
+                    else:
+                        col = array(typecode)
+                        if col.itemsize != itemsize:
+                            return None  # written where the C type has another width
+                        col.frombytes(f.read(length * col.itemsize))
+                        setattr(index, name, col)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        return index
+
+
+# ══════════════════════════════════════════════════
+# Memory-mapped random access
+# ══════════════════════════════════════════════════
+
+class MappedTMX:
+    """
+    Random access to the TUs of a memory-mapped TMX file.
+
+    Byte offsets come from a valid sidecar index, or from one scan of
+    the mapped bytes for <tu> boundaries (skipping comments and CDATA).
+    tu(i) then parses just that TU with ET.fromstring, so opening a file
+    costs an offset table (16 bytes per TU) rather than a tree.
+
+    The scan needs an ASCII-compatible encoding (UTF-8, Latin-1, ...).
+    """
+
+    def __init__(self, file_path: str, encoding: str = 'utf-8', use_index: bool = True):
+        if encoding.lower().replace('-', '').startswith(('utf16', 'utf32', 'ucs')):
+            raise Exception(f"Byte-offset access is not supported for {encoding} files")
+
+        self.file_path = file_path
+        self.encoding = encoding
+        self._file = open(file_path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise Exception(f"Cannot map empty file: {file_path}")
+
+        index = TMXIndex.load(file_path) if use_index else None
+        if index is not None:
+            self.starts, self.ends = index.tu_start, index.tu_end
+        else:
+            self.starts, self.ends = self._scan()
+
+    def _scan(self) -> Tuple[array, array]:
+        """Find the byte span of every <tu> element."""
+        starts = array('Q')
+        ends = array('Q')
+        for start, end in iter_tu_spans(self._map):
+            starts.append(start)
+            ends.append(end)
+        return starts, ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def raw(self, i: int) -> bytes:
+        """The bytes of TU i, from "<tu" to its closing ">"."""
+        return self._map[self.starts[i]:self.ends[i]]
+
+    def tu(self, i: int) -> ET.Element:
+        """Parse TU i on its own."""
+        raw = self.raw(i)
+        try:
+            if self.encoding in ('utf-8', 'utf8'):
+                return ET.fromstring(raw)
+            return ET.fromstring(raw.decode(self.encoding))
+        except ET.ParseError as e:
+            raise Exception(f"Error parsing TU {i + 1}: {e}")
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,111 @@
+"""
+TMX Editor - Duplicate keys
+
+Two TUs are exact duplicates when their sources and their targets are
+equal after lowercasing and collapsing whitespace. make_key() gives
+that as a "source|||target" string; tables holding many keys store its
+16-byte BLAKE2b digest instead, which is the same size however long
+the segments are.
+
+Uses only Python standard library.
+"""
+
+import hashlib
+from typing import Callable, Dict, Iterator, Optional
+
+DIGEST_SIZE = 16
+
+_MISSING = object()
+
+
+def normalize(text: str) -> str:
+    """Text lowercased, whitespace collapsed."""
+    return ' '.join(text.lower().split())
+
+
+def make_key(source: str, target: str) -> str:
+    """Duplicate key of a source/target pair."""
+    return f"{normalize(source)}|||{normalize(target)}"
+
+
+def digest(text: str) -> bytes:
+    """16-byte BLAKE2b digest of a key (or of a normalized text)."""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=DIGEST_SIZE).digest()
+
+
+class KeyTable:
+    """
+    Dict keyed by duplicate keys, storing their digests instead.
+
+    key_of(value) must give back the key a value was stored under (e.g.
+    by rebuilding it from a row's texts). Every digest match is checked
+    with it against the real key, and a key whose digest is taken by a
+    different key is stored under its full text. Without key_of a digest
+    match is taken as a key match; two distinct keys share a digest with
+    a chance of about 2^-128.
+    """
+    __slots__ = ('_table', '_key_of', '_collisions')
+
+    def __init__(self, key_of: Optional[Callable[[object], str]] = None):
+        self._table: Dict[object, object] = {}
+        self._key_of = key_of
+        self._collisions = 0  # keys stored under their full text
+
+    def _slot(self, key: str) -> object:
+        """Where key lives in the table: its digest, or the key itself."""
+        slot = digest(key)
+        if self._key_of is not None:
+            value = self._table.get(slot, _MISSING)
+            if value is _MISSING:
+                if self._collisions and key in self._table:
+                    return key
+            elif self._key_of(value) != key:
+                return key
+        return slot
+
+    def add(self, key: str, value: object = None) -> bool:
+        """Store value under key unless key is present; True if it was new."""
+        slot = self._slot(key)
+        if slot in self._table:
+            return False
+        self._table[slot] = value
+        if slot is key:
+            self._collisions += 1
+        return True
+
+    def get(self, key: str, default: object = None) -> object:
+        return self._table.get(self._slot(key), default)
+
+    def setdefault(self, key: str, default: object = None) -> object:
+        """Value under key, storing default first if key is not present."""
+        slot = self._slot(key)
+        value = self._table.get(slot, _MISSING)
+        if value is _MISSING:
+            value = self._table[slot] = default
+            if slot is key:
+                self._collisions += 1
+        return value
+
+    def __getitem__(self, key: str) -> object:
+        return self._table[self._slot(key)]
+
+    def __setitem__(self, key: str, value: object) -> None:
+        slot = self._slot(key)
+        if slot is key and key not in self._table:
+            self._collisions += 1
+        self._table[slot] = value
+
+    def __delitem__(self, key: str) -> None:
+        slot = self._slot(key)
+        del self._table[slot]
+        if slot is key:
+            self._collisions -= 1
+
+    def __contains__(self, key: str) -> bool:
+        return self._slot(key) in self._table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def values(self) -> Iterator[object]:
+        return iter(self._table.values())
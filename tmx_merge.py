@@ -0,0 +1,271 @@
+"""
+TMX Editor - External-memory merge
+
+Merges TMX files that together do not fit in memory, with the same
+result as the in-memory `--merge` (TMXEditor.merge_from per file):
+
+1. Every TU is streamed once and numbered in merge order (base file
+   first). Keyed TUs become fixed-size records - source digest,
+   number, pair digest - written to temporary files as sorted runs.
+2. A k-way merge of the runs visits all TUs with the same normalized
+   source together. Every merge decision only involves TUs with that
+   source, so each group is resolved on its own by replaying the
+   skip/replace/keep_both rules file by file; the surviving TU numbers
+   are marked in a one-bit-per-TU map.
+3. The inputs are streamed again and the marked TUs written out in
+   number order, which is the body order of the in-memory merge.
+
+Memory use is the sort buffer (bounded by mem_limit), one TU at a time
+and the bit map.
+
+Uses only Python standard library.
+"""
+
+import contextlib
+import heapq
+import io
+import os
+import tempfile
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from tmx_editor import TMXEditor, MergeIndex
+
+
+RECORD_SIZE = 40      # source digest (16) + TU number (8, big-endian) + pair digest (16)
+RECORD_COST = 96      # approximate bytes per buffered record (bytes object + list slot)
+MAX_FAN_IN = 64       # runs merged at once
+READ_BLOCK = 1 << 16  # bytes read per run at a time
+
+
+def parse_size(text: str) -> int:
+    """A byte count such as '512M', '2G' or '65536'."""
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+    text = text.strip().upper().rstrip('B')
+    factor = units.get(text[-1:], 1)
+    if factor != 1:
+        text = text[:-1]
+    try:
+        value = int(float(text) * factor)
+    except ValueError:
+        raise Exception(f"Invalid size: {text!r}")
+    if value <= 0:
+        raise Exception(f"Invalid size: {text!r}")
+    return value
+
+
+def _open_streaming(path: str) -> TMXEditor:
+    editor = TMXEditor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        editor.load(path, streaming=True)
+    return editor
+
+
+# ══════════════════════════════════════════════════
+# Sorted runs
+# ══════════════════════════════════════════════════
+
+class RunWriter:
+    """Buffers records and spills them to sorted run files in temp_dir."""
+
+    def __init__(self, temp_dir: str, max_records: int):
+        self.temp_dir = temp_dir
+        self.max_records = max_records
+        self.runs: List[str] = []
+        self._buffer: List[bytes] = []
+        self._written = 0
+
+    def add(self, record: bytes) -> None:
+        self._buffer.append(record)
+        if len(self._buffer) >= self.max_records:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        self._buffer.sort()
+        self._write(self._buffer)
+        self._buffer = []
+
+    def _write(self, records) -> None:
+        path = os.path.join(self.temp_dir, f"run{self._written:06d}")
+        self._written += 1
+        with open(path, 'wb') as f:
+            for record in records:
+                f.write(record)
+        self.runs.append(path)
+
+    def merged(self) -> Iterator[bytes]:
+        """All records in sorted order; runs are merged in passes of MAX_FAN_IN."""
+        self.flush()
+        while len(self.runs) > MAX_FAN_IN:
+            batch, self.runs = self.runs[:MAX_FAN_IN], self.runs[MAX_FAN_IN:]
+            self._write(heapq.merge(*[_read_run(path) for path in batch]))
+            for path in batch:
+                os.remove(path)
+        return heapq.merge(*[_read_run(path) for path in self.runs])
+
+
+def _read_run(path: str) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(READ_BLOCK // RECORD_SIZE * RECORD_SIZE)
+            if not block:
+                break
+            for k in range(0, len(block), RECORD_SIZE):
+                yield block[k:k + RECORD_SIZE]
+
+
+# ══════════════════════════════════════════════════
+# Merge decisions
+# ══════════════════════════════════════════════════
+
+def _resolve_group(entries: List[tuple], file_starts: List[int], strategy: str,
+                   totals: Dict[str, int]) -> Iterator[int]:
+    """
+    Replay TMXEditor.merge_entries() for one normalized source.
+
+    entries are (TU number, pair digest) in number order; yields the
+    numbers of the TUs that end up in the merged body.
+    """
+    live = {}         # number -> pair digest, in body order
+    pair_counts = {}
+
+    i = 0
+    n = len(entries)
+    while i < n and entries[i][0] < file_starts[1]:
+        number, pair = entries[i]
+        live[number] = pair
+        pair_counts[pair] = pair_counts.get(pair, 0) + 1
+        i += 1
+
+    while i < n:
+        # One merge_entries() call: the TUs of one incoming file
+        file_end = file_starts[bisect_right(file_starts, entries[i][0])]
+        last_live = next(reversed(live)) if live else None  # MergeIndex.sources
+        new_pairs = set()
+        new_source = None
+        taken = {}
+        doomed = []
+
+        while i < n and entries[i][0] < file_end:
+            number, pair = entries[i]
+            i += 1
+
+            if pair in pair_counts or pair in new_pairs:
+                totals['skipped'] += 1
+                continue
+
+            old_number = new_source
+            old_live = last_live if old_number is None else None
+
+            if old_number is not None or old_live is not None:
+                if strategy == 'skip':
+                    totals['skipped'] += 1
+                    continue
+                elif strategy == 'replace':
+                    if old_number is not None:
+                        del taken[old_number]
+                    else:
+                        doomed.append(old_live)
+                    taken[number] = pair
+                    new_source = number
+                    totals['replaced'] += 1
+                elif strategy == 'keep_both':
+                    taken[number] = pair
+                    totals['added'] += 1
+            else:
+                taken[number] = pair
+                new_pairs.add(pair)
+                new_source = number
+                totals['added'] += 1
+
+        for number in doomed:
+            pair = live.pop(number)
+            count = pair_counts[pair] - 1
+            if count:
+                pair_counts[pair] = count
+            else:
+                del pair_counts[pair]
+        for number, pair in taken.items():
+            live[number] = pair
+            pair_counts[pair] = pair_counts.get(pair, 0) + 1
+
+    yield from live
+
+
+# ══════════════════════════════════════════════════
+# External merge
+# ══════════════════════════════════════════════════
+
+def external_merge(paths: List[str], output_path: str, duplicate_strategy: str = 'skip',
+                   mem_limit: int = 256 << 20, temp_dir: str = None,
+                   progress=print) -> Dict:
+    """
+    Merge paths (the first one is the base) into output_path without
+    holding the merged TUs in memory. Gives the same output as loading
+    the base and calling merge_from() for every other file in order.
+
+    mem_limit bounds the sort buffer; parsing holds one TU at a time
+    and the keep map takes one bit per input TU on top of that.
+    """
+    if len(paths) < 2:
+        raise Exception("Need at least 2 TMX files to merge.")
+
+    max_records = max(1024, mem_limit // RECORD_COST)
+    keep = bytearray()
+    file_starts = []
+    number = 0
+
+    with tempfile.TemporaryDirectory(prefix='tmx_merge_', dir=temp_dir) as tmp:
+        runs = RunWriter(tmp, max_records)
+
+        # Pass 1: number every TU, spill keyed ones as sorted runs
+        for file_index, path in enumerate(paths):
+            progress(f"  Reading: {Path(path).name}")
+            file_starts.append(number)
+            editor = _open_streaming(path)
+            for tu in editor.iter_tus():
+                if number >> 3 >= len(keep):
+                    keep.extend(bytes(1 << 16))
+                record = editor.get_record(tu)
+                if record.key is None:
+                    if file_index == 0:
+                        keep[number >> 3] |= 1 << (number & 7)  # base TUs are never dropped
+                else:
+                    pair, source = MergeIndex.digests(record)
+                    runs.add(source + number.to_bytes(8, 'big') + pair)
+                number += 1
+        file_starts.append(number)
+
+        # Pass 2: resolve each source's TUs from the merged runs
+        progress(f"  Resolving duplicates ({len(runs.runs) or 1} sorted runs)...")
+        totals = {'added': 0, 'skipped': 0, 'replaced': 0}
+        group_source = None
+        group = []
+        for record in runs.merged():
+            source = record[:16]
+            if source != group_source:
+                for kept in _resolve_group(group, file_starts, duplicate_strategy, totals):
+                    keep[kept >> 3] |= 1 << (kept & 7)
+                group_source = source
+                group = []
+            group.append((int.from_bytes(record[16:24], 'big'), record[24:]))
+        for kept in _resolve_group(group, file_starts, duplicate_strategy, totals):
+            keep[kept >> 3] |= 1 << (kept & 7)
+
+    # Pass 3: stream the kept TUs out in merge order
+    progress(f"  Writing: {Path(output_path).name}")
+    base = _open_streaming(paths[0])
+    number = 0
+    with base.open_writer(output_path) as writer:
+        for file_index, path in enumerate(paths):
+            editor = base if file_index == 0 else _open_streaming(path)
+            for tu in editor.iter_tus():
+                if keep[number >> 3] & (1 << (number & 7)):
+                    writer.write_tu(tu)
+                number += 1
+
+    totals['total_after'] = writer.tu_count
+    return totals
@@ -4,17 +4,23 @@ TMX Editor - Retro Terminal User Interface
 Norton Commander / Turbo Pascal inspired TUI for TMX editing.
 Blue background, white text, F-key menus, table view.
 
-Launched via: python3 tmx_editor.py --gui [file.tmx]
+Launched via: python3 tmx_editor.py --gui [--browse] [file.tmx]
 """
 
 import curses
 import curses.textpad
 import os
 import sys
+import textwrap
+import threading
+from array import array
+from bisect import bisect_left
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Iterable
 
-from tmx_editor import TMXEditor
+from tmx_editor import TMXEditor, TURecord, TUChanges
+from tmx_index import MappedTMX
+from tmx_keys import KeyTable
 
 
 # ══════════════════════════════════════════════════
@@ -66,7 +72,7 @@ def _init_colors():
 # ══════════════════════════════════════════════════
 
 class TURow:
-    """A single TU row for display in the table."""
+    """A single TU row for display in the table (decoded from a TUStore)."""
     __slots__ = ('index', 'source', 'target', 'status', 'creation_date')
 
     def __init__(self, index: int, source: str, target: str,
@@ -78,6 +84,279 @@ class TURow:
         self.creation_date = creation_date
 
 
+class TUStore:
+    """
+    Columnar store of the display rows.
+
+    Source and target texts live in one UTF-8 buffer; row i's source is
+    at offsets[3i]:offsets[3i+1] and its target at offsets[3i+1]:offsets[3i+2].
+    Status codes and flags are one byte per row and creation dates are
+    integers (YYYYMMDDhhmmss), so a row costs a few bytes of overhead
+    instead of a Python object and two strings. Rows are decoded into
+    TURow objects only when they are drawn.
+
+    Rows are never moved: removed rows are marked REMOVED and `order`
+    lists the live rows in body order. A duplicate-key index lets
+    append/update/remove recompute only the statuses they affect;
+    call refresh() after a batch of changes.
+    """
+
+    STATUS_NAMES = ('', 'DUP', 'EMPTY', 'TAG', '')
+    NONE, DUP, EMPTY, TAG, REMOVED = range(5)
+
+    # Flag bits
+    TAGGED = 1  # has <seg>s with inline tags
+    KEYED = 2   # valid TU, takes part in duplicate detection
+
+    def __init__(self):
+        self.text = bytearray()
+        self.offsets = array('Q')
+        self.status = bytearray()
+        self.flags = bytearray()
+        self.dates = array('q')
+        self.order = array('L')  # live rows, in body order
+
+        self._key_rows = KeyTable(self._rows_key)  # key -> row, or list of rows
+        self._dirty_keys = set()
+        self._dirty_rows: Dict[int, Optional[str]] = {}  # row -> its key
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @staticmethod
+    def date_to_int(value: str) -> int:
+        """TMX date (e.g. 20240131T120000Z) as an integer, 0 if missing."""
+        digits = ''.join(c for c in value if c.isdigit())[:14]
+        return int(digits) if digits else 0
+
+    @classmethod
+    def _record_flags(cls, record: TURecord) -> int:
+        flags = cls.TAGGED if record.has_tags else 0
+        if record.key is not None:
+            flags |= cls.KEYED
+        return flags
+
+    def _write_texts(self, record: TURecord) -> Tuple[int, int, int]:
+        start = len(self.text)
+        self.text += (record.source or "").encode('utf-8')
+        mid = len(self.text)
+        self.text += (record.target or "").encode('utf-8')
+        return start, mid, len(self.text)
+
+    # ── Row changes ──
+
+    @classmethod
+    def from_records(cls, records: Iterable[TURecord]) -> 'TUStore':
+        """
+        Store with one row per record, in order. Statuses are computed in
+        one pass at the end instead of tracking every key as changed.
+        """
+        store = cls()
+        for record in records:
+            store._index(store._add_row(record), record.key, track=False)
+        for i in range(len(store.status)):
+            store.status[i] = store._compute_status(i, False)
+        for rows in store._key_rows.values():
+            if not isinstance(rows, int):
+                for i in rows:
+                    store.status[i] = store._compute_status(i, True)
+        return store
+
+    def append(self, record: TURecord) -> int:
+        """Add a row for record at the end of the body; returns its row index."""
+        i = self._add_row(record)
+        self._index(i, record.key)
+        self._dirty_rows[i] = record.key
+        return i
+
+    def _add_row(self, record: TURecord) -> int:
+        i = len(self.status)
+        self.offsets.extend(self._write_texts(record))
+        self.status.append(self.NONE)
+        self.flags.append(self._record_flags(record))
+        self.dates.append(self.date_to_int(record.creation_date))
+        self.order.append(i)
+        return i
+
+    def update(self, i: int, record: TURecord):
+        """Replace row i's content with record (old bytes are left unused)."""
+        self._unindex(i, self.key(i))
+        self.offsets[3 * i:3 * i + 3] = array('Q', self._write_texts(record))
+        self.flags[i] = self._record_flags(record)
+        self.dates[i] = self.date_to_int(record.creation_date)
+        self._index(i, record.key)
+        self._dirty_rows[i] = record.key
+
+    def remove_positions(self, positions: List[int]):
+        """Remove the rows at the given (sorted) positions in body order."""
+        if not positions:
+            return
+        order = self.order
+        kept = array('L')
+        prev = 0
+        for pos in positions:
+            i = order[pos]
+            self._unindex(i, self.key(i))
+            self.status[i] = self.REMOVED
+            self._dirty_rows.pop(i, None)
+            kept.extend(order[prev:pos])
+            prev = pos + 1
+        kept.extend(order[prev:])
+        self.order = kept
+
+    def _rows_key(self, rows) -> str:
+        return self.key(rows if isinstance(rows, int) else rows[0])
+
+    def _index(self, i: int, key: Optional[str], track: bool = True):
+        if key is None:
+            return
+        rows = self._key_rows.get(key)
+        if rows is None:
+            self._key_rows[key] = i
+        elif isinstance(rows, int):
+            self._key_rows[key] = [rows, i]
+        else:
+            rows.append(i)
+        if track:
+            self._dirty_keys.add(key)
+
+    def _unindex(self, i: int, key: Optional[str]):
+        if key is None:
+            return
+        rows = self._key_rows[key]
+        if isinstance(rows, int):
+            del self._key_rows[key]
+        else:
+            rows.remove(i)
+            if len(rows) == 1:
+                self._key_rows[key] = rows[0]
+        self._dirty_keys.add(key)
+
+    def _compute_status(self, i: int, dup: bool) -> int:
+        start, mid, end = self.offsets[3 * i:3 * i + 3]
+        if start == mid or mid == end:
+            return self.EMPTY
+        if dup:
+            return self.DUP
+        if self.flags[i] & self.TAGGED:
+            return self.TAG
+        return self.NONE
+
+    def refresh(self):
+        """Recompute the status of every row touched since the last refresh."""
+        for key in self._dirty_keys:
+            rows = self._key_rows.get(key)
+            if rows is None:
+                continue
+            if isinstance(rows, int):
+                self.status[rows] = self._compute_status(rows, False)
+            else:
+                for i in rows:
+                    self.status[i] = self._compute_status(i, True)
+
+        for i, key in self._dirty_rows.items():
+            if key is None or key not in self._dirty_keys:
+                dup = key is not None and not isinstance(self._key_rows.get(key), int)
+                self.status[i] = self._compute_status(i, dup)
+
+        self._dirty_keys.clear()
+        self._dirty_rows.clear()
+
+    # ── Reading ──
+
+    def _decode(self, start: int, end: int, max_chars: Optional[int]) -> str:
+        if max_chars is not None:
+            # A character is at most 4 bytes; a cut character is dropped
+            end = min(end, start + 4 * max_chars)
+            return self.text[start:end].decode('utf-8', 'ignore')[:max_chars]
+        return self.text[start:end].decode('utf-8')
+
+    def source(self, i: int, max_chars: Optional[int] = None) -> str:
+        return self._decode(self.offsets[3 * i], self.offsets[3 * i + 1], max_chars)
+
+    def target(self, i: int, max_chars: Optional[int] = None) -> str:
+        return self._decode(self.offsets[3 * i + 1], self.offsets[3 * i + 2], max_chars)
+
+    def key(self, i: int) -> Optional[str]:
+        """Row i's duplicate key, rebuilt from the stored texts."""
+        if not self.flags[i] & self.KEYED:
+            return None
+        return TURecord.make_key(self.source(i), self.target(i))
+
+    def creation_date(self, i: int) -> str:
+        value = self.dates[i]
+        if not value:
+            return ''
+        digits = str(value)
+        if len(digits) == 14:
+            return f"{digits[:8]}T{digits[8:]}Z"
+        return digits
+
+    def row(self, i: int, max_chars: Optional[int] = None) -> TURow:
+        """Decode row i, optionally truncating the texts."""
+        number = bisect_left(self.order, i) + 1
+        return TURow(number, self.source(i, max_chars), self.target(i, max_chars),
+                     self.STATUS_NAMES[self.status[i]], self.creation_date(i))
+
+    def select(self, status: Optional[int] = None):
+        """Row indexes with the given status code (all live rows if None)."""
+        if status is None:
+            return self.order
+        code = bytes([status])
+        found = array('L')
+        pos = self.status.find(code)
+        while pos != -1:
+            found.append(pos)
+            pos = self.status.find(code, pos + 1)
+        return found
+
+
+class MappedRows:
+    """
+    Display rows of a memory-mapped TMX file (browse mode).
+
+    Only the TU byte offsets are held; a TU is parsed when its row is
+    drawn, and the decoded rows of the last few screens are cached.
+    Duplicate status needs every key, so rows are only marked EMPTY/TAG.
+    Same reading interface as TUStore.
+    """
+
+    CACHE_SIZE = 4096
+
+    def __init__(self, mapped: MappedTMX, editor: TMXEditor):
+        self.mapped = mapped
+        self.editor = editor
+        self.order = range(len(mapped))
+        self._cache: Dict[int, TURow] = {}
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def row(self, i: int, max_chars: Optional[int] = None) -> TURow:
+        """Parse and decode row i (the texts are never truncated)."""
+        row = self._cache.get(i)
+        if row is None:
+            record = self.editor._make_record(self.mapped.tu(i))
+            source = record.source or ''
+            target = record.target or ''
+            if not source or not target:
+                status = TUStore.EMPTY
+            elif record.has_tags:
+                status = TUStore.TAG
+            else:
+                status = TUStore.NONE
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            row = self._cache[i] = TURow(i + 1, source, target,
+                                         TUStore.STATUS_NAMES[status],
+                                         record.creation_date)
+        return row
+
+    def select(self, status: Optional[int] = None):
+        """All rows if status is None; status filters need a full load."""
+        return self.order if status is None else ()
+
+
 # ══════════════════════════════════════════════════
 # Main TUI Application
 # ══════════════════════════════════════════════════
@@ -112,11 +391,12 @@ class TMXTui:
         ],
     }
 
-    def __init__(self, stdscr, file_path: str = None):
+    def __init__(self, stdscr, file_path: str = None, use_index: bool = False,
+                 browse: bool = False):
         self.stdscr = stdscr
         self.editor = TMXEditor()
-        self.rows: List[TURow] = []
-        self.filtered_rows: List[TURow] = []
+        self.rows = TUStore()
+        self.filtered_rows = self.rows.select()  # row indexes in view
         self.scroll_offset = 0
         self.selected_row = 0
         self.modifications_made = False
@@ -125,6 +405,18 @@ class TMXTui:
         self.active_menu = None  # None or menu name
         self.active_menu_item = 0
         self.file_path = file_path
+        self.use_index = use_index  # read/write FILE.tmx.idx sidecars
+        self.browse = browse  # read-only, TUs parsed on demand from a mapped file
+        self.mapped: Optional[MappedTMX] = None
+
+        # Background loading: the worker appends to self.rows under
+        # rows_lock; the main loop draws and handles keys under it too
+        self.rows_lock = threading.RLock()
+        self.loading = False
+        self.load_progress = 0.0
+        # (title, message) shown by the main loop once rows_lock is released,
+        # so the loader is not blocked while the dialog waits for a key
+        self.pending_dialog: Optional[Tuple[str, str]] = None
 
         # Screen dimensions
         self.height = 0
@@ -153,89 +445,171 @@ class TMXTui:
         self.stdscr.timeout(-1)  # Blocking input
         self.height, self.width = self.stdscr.getmaxyx()
 
+    # Rows appended per lock acquisition while loading
+    LOAD_BATCH = 2000
+
     def _load_file(self, path: str):
-        """Load a TMX file and build the display rows."""
+        """Start loading a TMX file on a worker thread; rows appear as they are parsed."""
+        if self.browse:
+            self._open_mapped(path)
+            return
+
+        self.rows = TUStore()
+        self.current_filter = 'all'
+        self._apply_filter()
+        self.file_path = path
+        self.loading = True
+        self.load_progress = 0.0
+        self.status_message = f"Loading {Path(path).name}..."
+
+        worker = threading.Thread(target=self._load_worker, args=(path, self.rows),
+                                  daemon=True)
+        worker.start()
+
+    def _load_worker(self, path: str, rows: TUStore):
+        """Parse the file and stream its TUs into rows (runs on a worker thread)."""
+        from_index = False
+
+        def on_index(records):
+            # A valid sidecar index: every row is available before parsing
+            nonlocal from_index
+            from_index = True
+            with self.rows_lock:
+                for record in records:
+                    rows.append(record)
+                rows.refresh()
+                self.status_message = f"Loading {Path(path).name} (rows from index)..."
+
         try:
-            # Suppress print output from editor.load()
+            batch = []
+            count = 0
+            for tu, progress in self.editor.load_incremental(path, use_index=self.use_index,
+                                                             on_index=on_index):
+                if from_index:
+                    # Rows are already there; only the tree is still being built
+                    count += 1
+                    if count % self.LOAD_BATCH == 0:
+                        self.load_progress = progress
+                    continue
+                batch.append(self.editor.get_record(tu))
+                if len(batch) >= self.LOAD_BATCH:
+                    with self.rows_lock:
+                        for record in batch:
+                            rows.append(record)
+                        rows.refresh()
+                        self.load_progress = progress
+                    batch = []
+
+            with self.rows_lock:
+                for record in batch:
+                    rows.append(record)
+                rows.refresh()
+                self.load_progress = 1.0
+                self._apply_filter(reset=False)
+                self.status_message = f"Loaded {Path(path).name} ({len(rows):,} TUs)"
+        except Exception as e:
+            with self.rows_lock:
+                self.rows = TUStore()
+                self._apply_filter()
+                self.status_message = f"Error: {e}"
+        finally:
+            self.loading = False
+
+    def _open_mapped(self, path: str):
+        """Browse mode: map the file and find its TU offsets; no tree is built."""
+        self.status_message = f"Scanning {Path(path).name}..."
+        self._draw()
+        self.stdscr.refresh()
+
+        try:
+            # Suppress print output
             old_stdout = sys.stdout
             sys.stdout = open(os.devnull, 'w')
             try:
-                self.editor.load(path)
+                # Streaming load: header, encoding and language pair only
+                self.editor.load(path, streaming=True)
             finally:
                 sys.stdout.close()
                 sys.stdout = old_stdout
-
-            self.file_path = path
-            self._rebuild_rows()
-            self.status_message = f"Loaded {Path(path).name} ({len(self.rows):,} TUs)"
+            mapped = MappedTMX(path, self.editor.encoding, use_index=self.use_index)
         except Exception as e:
             self.status_message = f"Error: {e}"
+            return
+
+        if self.mapped is not None:
+            self.mapped.close()
+        self.mapped = mapped
+        self.file_path = path
+        self.rows = MappedRows(mapped, self.editor)
+        self.current_filter = 'all'
+        self._apply_filter()
+        self.status_message = f"Browsing {Path(path).name} ({len(self.rows):,} TUs, read-only)"
+
+    def _require_loaded(self, needs_tree: bool = True) -> bool:
+        """
+        False (with a status message) while a file is still loading, or
+        in browse mode if the operation edits or needs the full tree.
+        """
+        if self.loading:
+            self.status_message = "Still loading - available when the file is fully loaded."
+            return False
+        if self.browse and needs_tree:
+            self.status_message = "Read-only browse mode - reopen without --browse to edit."
+            return False
+        return True
 
     def _rebuild_rows(self):
         """Rebuild display rows from the editor's TMX tree."""
-        self.rows = []
-        body = self.editor._get_body()
-
-        # Build duplicate lookup
-        seen = {}
-        dup_keys = set()
-        all_tus = list(body.findall('tu'))
-
-        for i, tu in enumerate(all_tus):
-            src, tgt = self.editor._get_tu_texts(tu)
-            if src is not None:
-                key = f"{' '.join(src.lower().split())}|||{' '.join((tgt or '').lower().split())}"
-                if key in seen:
-                    dup_keys.add(key)
-                else:
-                    seen[key] = i
-
-        # Build rows
-        for i, tu in enumerate(all_tus):
-            src, tgt = self.editor._get_tu_texts(tu)
-
-            if src is None:
-                src = ""
-            if tgt is None:
-                tgt = ""
-
-            # Determine status
-            status = ''
-            if not src or not tgt:
-                status = 'EMPTY'
-            else:
-                key = f"{' '.join(src.lower().split())}|||{' '.join((tgt or '').lower().split())}"
-                if key in dup_keys:
-                    status = 'DUP'
-
-            # Check for inline tags
-            has_tags = False
-            for seg in tu.iter('seg'):
-                if list(seg):
-                    has_tags = True
-                    break
-            if has_tags and not status:
-                status = 'TAG'
+        self.rows = TUStore.from_records(
+            self.editor.get_record(tu) for tu in self.editor._get_body().findall('tu'))
+        self._apply_filter()
 
-            creation_date = tu.get('creationdate', '')
+    def _apply_changes(self, changes: Optional[TUChanges]):
+        """Apply the TUs an editor operation removed/changed/added to the rows."""
+        if changes is None:
+            self._rebuild_rows()
+            return
 
-            self.rows.append(TURow(i + 1, src, tgt, status, creation_date))
+        rows = self.rows
+        rows.remove_positions(changes.removed)
+        for pos, tu in changes.changed:
+            rows.update(rows.order[pos], self.editor.get_record(tu))
+        for _pos, tu in changes.added:
+            rows.append(self.editor.get_record(tu))
+        rows.refresh()
 
         self._apply_filter()
 
-    def _apply_filter(self):
-        """Apply the current filter to rows."""
+    def _apply_filter(self, reset: bool = True):
+        """Apply the current filter to rows (reset=False keeps the selection)."""
         if self.current_filter == 'all':
-            self.filtered_rows = self.rows[:]
+            self.filtered_rows = self.rows.select()
         elif self.current_filter == 'dup':
-            self.filtered_rows = [r for r in self.rows if r.status == 'DUP']
+            self.filtered_rows = self.rows.select(TUStore.DUP)
         elif self.current_filter == 'empty':
-            self.filtered_rows = [r for r in self.rows if r.status == 'EMPTY']
+            self.filtered_rows = self.rows.select(TUStore.EMPTY)
         elif self.current_filter == 'tagged':
-            self.filtered_rows = [r for r in self.rows if r.status == 'TAG']
+            self.filtered_rows = self.rows.select(TUStore.TAG)
 
-        self.selected_row = 0
-        self.scroll_offset = 0
+        if reset:
+            self.selected_row = 0
+            self.scroll_offset = 0
+        else:
+            self.selected_row = min(self.selected_row, max(0, len(self.filtered_rows) - 1))
+
+    FILTER_LABELS = {'all': 'All', 'dup': 'Duplicates', 'empty': 'Empty', 'tagged': 'Tagged'}
+
+    def _set_filter(self, name: str):
+        """Switch the table to another filter."""
+        if self.browse and name != 'all':
+            self.status_message = "Filters need a full load - reopen without --browse."
+            return
+        self.current_filter = name
+        self._apply_filter()
+        if name == 'all':
+            self.status_message = "Filter: All"
+        else:
+            self.status_message = f"Filter: {self.FILTER_LABELS[name]} ({len(self.filtered_rows):,})"
 
     # ──────────────────────────────────────────────
     # Drawing
@@ -370,7 +744,7 @@ class TMXTui:
                     pass
                 continue
 
-            row = self.filtered_rows[data_idx]
+            row = self.rows.row(self.filtered_rows[data_idx], max(src_w, tgt_w))
             is_selected = (data_idx == self.selected_row)
 
             # Truncate text to column width
@@ -415,13 +789,14 @@ class TMXTui:
         y = self.height - 2
         w = self.width
 
-        # Left side: status message
+        # Left side: status message (load progress while loading)
         left = f" {self.status_message}"
+        if self.loading:
+            left += f" {self.load_progress:.0%} ({len(self.rows):,} TUs)"
 
         # Right side: row info and filter
-        filter_labels = {'all': 'All', 'dup': 'Duplicates', 'empty': 'Empty', 'tagged': 'Tagged'}
         right = (f"Row {self.selected_row + 1}/{len(self.filtered_rows)} "
-                 f"| Filter: {filter_labels.get(self.current_filter, 'All')} "
+                 f"| Filter: {self.FILTER_LABELS.get(self.current_filter, 'All')} "
                  f"| Total: {len(self.rows):,} ")
 
         padding = w - len(left) - len(right)
@@ -578,6 +953,7 @@ class TMXTui:
                                    curses.color_pair(CP_DIALOG_BTN) | curses.A_BOLD)
 
                 self.stdscr.refresh()
+                self.stdscr.timeout(-1)  # the main loop polls while loading
                 self.stdscr.getch()
         except curses.error:
             pass
@@ -765,6 +1141,8 @@ class TMXTui:
 
     def _op_save(self):
         """Save the TMX file."""
+        if not self._require_loaded():
+            return
         if not self.modifications_made:
             self.status_message = "No modifications to save."
             return
@@ -781,10 +1159,12 @@ class TMXTui:
 
     def _op_dedup(self):
         """Remove exact duplicates."""
+        if not self._require_loaded():
+            return
         result = self.editor.remove_exact_duplicates()
         if result['removed_count'] > 0:
             self.modifications_made = True
-            self._rebuild_rows()
+            self._apply_changes(self.editor.last_changes)
             self.status_message = (f"Removed {result['removed_count']:,} duplicates "
                                    f"({result['total_before']:,} -> {result['unique_count']:,})")
         else:
@@ -792,6 +1172,8 @@ class TMXTui:
 
     def _op_fuzzy(self):
         """Find and remove fuzzy duplicates."""
+        if not self._require_loaded():
+            return
         threshold_str = self._input_dialog("Fuzzy Duplicates",
                                            "Similarity threshold (0-100):", "85")
         if not threshold_str:
@@ -819,17 +1201,19 @@ class TMXTui:
         if self._confirm_dialog("Fuzzy Duplicates", msg):
             result = self.editor.remove_fuzzy_duplicates(groups)
             self.modifications_made = True
-            self._rebuild_rows()
+            self._apply_changes(self.editor.last_changes)
             self.status_message = f"Removed {result['removed_count']:,} fuzzy duplicates."
         else:
             self.status_message = f"Found {total} fuzzy duplicates (not removed)."
 
     def _op_remove_empty(self):
         """Remove empty/missing segments."""
+        if not self._require_loaded():
+            return
         result = self.editor.remove_empty_segments()
         if result['removed_count'] > 0:
             self.modifications_made = True
-            self._rebuild_rows()
+            self._apply_changes(self.editor.last_changes)
             self.status_message = (f"Removed {result['removed_count']:,} empty segments "
                                    f"({result['total_before']:,} -> {result['remaining_count']:,})")
         else:
@@ -837,10 +1221,12 @@ class TMXTui:
 
     def _op_strip_tags(self):
         """Strip inline formatting tags."""
+        if not self._require_loaded():
+            return
         result = self.editor.strip_inline_tags()
         if result['segments_modified'] > 0:
             self.modifications_made = True
-            self._rebuild_rows()
+            self._apply_changes(self.editor.last_changes)
             self.status_message = (f"Stripped {result['tags_removed']:,} tags "
                                    f"from {result['segments_modified']:,} segments")
         else:
@@ -848,6 +1234,8 @@ class TMXTui:
 
     def _op_csv_export(self):
         """Export to CSV."""
+        if not self._require_loaded(needs_tree=False):
+            return
         output = self.editor._generate_output_path('_export').replace('.tmx', '.csv')
         result = self._input_dialog("Export CSV", "Output file:", output)
         if result:
@@ -859,6 +1247,8 @@ class TMXTui:
 
     def _op_statistics(self):
         """Show statistics dialog."""
+        if not self._require_loaded(needs_tree=False):
+            return
         stats = self.editor.get_statistics()
         msg = (f"File: {stats['file']}\n"
                f"Languages: {stats['source_lang']} -> {stats['target_lang']}\n"
@@ -871,6 +1261,8 @@ class TMXTui:
 
     def _op_merge(self):
         """Merge another TMX file."""
+        if not self._require_loaded():
+            return
         path = self._file_dialog("Merge TMX File")
         if not path or not os.path.isfile(path):
             self.status_message = "Merge cancelled."
@@ -888,7 +1280,7 @@ class TMXTui:
 
             if result['added'] > 0:
                 self.modifications_made = True
-                self._rebuild_rows()
+                self._apply_changes(self.editor.last_changes)
             self.status_message = (f"Merge: +{result['added']:,} added, "
                                    f"{result['skipped']:,} skipped")
         except Exception as e:
@@ -896,6 +1288,8 @@ class TMXTui:
 
     def _op_open(self):
         """Open a new file."""
+        if not self._require_loaded(needs_tree=False):
+            return
         if self.modifications_made:
             if not self._confirm_dialog("Unsaved Changes",
                                         "Discard unsaved changes?"):
@@ -906,6 +1300,30 @@ class TMXTui:
             self._load_file(path)
             self.modifications_made = False
 
+    def _op_details(self):
+        """Show the selected TU in full."""
+        if not self.filtered_rows:
+            return
+        try:
+            row = self.rows.row(self.filtered_rows[self.selected_row])
+        except Exception as e:
+            self.status_message = f"Error: {e}"
+            return
+
+        wrap_w = max(20, min(self.width - 10, 76))
+        lines = [f"Status: {row.status or '-'}   Created: {row.creation_date or '-'}"]
+        for lang, text in ((self.editor.source_lang, row.source),
+                           (self.editor.target_lang, row.target)):
+            lines.append('')
+            lines.append(f"{lang}:")
+            lines.extend(textwrap.wrap(text, wrap_w, replace_whitespace=True) or ['(empty)'])
+
+        max_lines = max(3, self.height - 6)
+        if len(lines) > max_lines:
+            lines = lines[:max_lines - 1] + ['...']
+        # Called under rows_lock, which a modal dialog must not hold
+        self.pending_dialog = (f"TU {row.index:,}", '\n'.join(lines))
+
     # ──────────────────────────────────────────────
     # Dropdown menu handling
     # ──────────────────────────────────────────────
@@ -938,21 +1356,13 @@ class TMXTui:
         elif label == 'Strip Inline Tags':
             self._op_strip_tags()
         elif label == 'Show All':
-            self.current_filter = 'all'
-            self._apply_filter()
-            self.status_message = "Filter: All"
+            self._set_filter('all')
         elif label == 'Show Duplicates Only':
-            self.current_filter = 'dup'
-            self._apply_filter()
-            self.status_message = f"Filter: Duplicates ({len(self.filtered_rows):,})"
+            self._set_filter('dup')
         elif label == 'Show Empty Only':
-            self.current_filter = 'empty'
-            self._apply_filter()
-            self.status_message = f"Filter: Empty ({len(self.filtered_rows):,})"
+            self._set_filter('empty')
         elif label == 'Show Tagged Only':
-            self.current_filter = 'tagged'
-            self._apply_filter()
-            self.status_message = f"Filter: Tagged ({len(self.filtered_rows):,})"
+            self._set_filter('tagged')
         elif label == 'Merge TMX File...':
             self._op_merge()
         elif label == 'Statistics':
@@ -974,19 +1384,30 @@ class TMXTui:
     def _main_loop(self):
         """Main event loop."""
         while True:
-            self._draw()
+            # Poll while loading so progress and new rows get drawn
+            self.stdscr.timeout(100 if self.loading else -1)
+            with self.rows_lock:
+                self._draw()
 
             try:
                 key = self.stdscr.getch()
             except KeyboardInterrupt:
                 self._try_quit()
                 continue
+            if key == -1:
+                continue
 
             try:
-                self._handle_key(key)
+                with self.rows_lock:
+                    self._handle_key(key)
             except SystemExit:
                 return
 
+            if self.pending_dialog is not None:
+                title, message = self.pending_dialog
+                self.pending_dialog = None
+                self._message_dialog(title, message)
+
     def _handle_key(self, key: int):
         """Handle a keypress."""
 
@@ -1037,6 +1458,8 @@ class TMXTui:
             self.scroll_offset = 0
         elif key == curses.KEY_END:
             self.selected_row = max(0, len(self.filtered_rows) - 1)
+        elif key in (ord('\n'), curses.KEY_ENTER):
+            self._op_details()
 
         # ── F-keys ──
         elif key == curses.KEY_F2:
@@ -1063,21 +1486,13 @@ class TMXTui:
 
         # ── Filter shortcuts ──
         elif key == ord('a') or key == ord('A'):
-            self.current_filter = 'all'
-            self._apply_filter()
-            self.status_message = "Filter: All"
+            self._set_filter('all')
         elif key == ord('d') or key == ord('D'):
-            self.current_filter = 'dup'
-            self._apply_filter()
-            self.status_message = f"Filter: Duplicates ({len(self.filtered_rows):,})"
+            self._set_filter('dup')
         elif key == ord('e') or key == ord('E'):
-            self.current_filter = 'empty'
-            self._apply_filter()
-            self.status_message = f"Filter: Empty ({len(self.filtered_rows):,})"
+            self._set_filter('empty')
         elif key == ord('t') or key == ord('T'):
-            self.current_filter = 'tagged'
-            self._apply_filter()
-            self.status_message = f"Filter: Tagged ({len(self.filtered_rows):,})"
+            self._set_filter('tagged')
 
         # ── Ctrl+T for strip tags ──
         elif key == 20:  # Ctrl+T
@@ -1099,10 +1514,10 @@ class TMXTui:
 # Entry point
 # ══════════════════════════════════════════════════
 
-def run_tui(file_path: str = None):
+def run_tui(file_path: str = None, use_index: bool = False, browse: bool = False):
     """Launch the TUI. Called from tmx_editor.py --gui."""
     def _main(stdscr):
-        app = TMXTui(stdscr, file_path=file_path)
+        app = TMXTui(stdscr, file_path=file_path, use_index=use_index, browse=browse)
         app.run()
 
     try: